@@ -3,6 +3,10 @@ from typing import Dict, Any
 
 # Get the base directory of the game
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BASE_DIR)
+
+# Shared arcade module - the project root is on the path (see main.py)
+from game_registry import validate_files
 
 # Define different themes
 THEMES = {
@@ -63,23 +67,17 @@ class AssetLoader:
     
     def verify_assets_exist(self) -> bool:
         """Verify that all assets for the current theme exist"""
-        missing_assets = []
-        
-        # Check image assets
-        for key, filename in self.assets.items():
-            if key != "scale" and key != "music":
-                image_path = self.get_image_path(key)
-                if not os.path.exists(image_path):
-                    missing_assets.append(f"Image: {filename}")
-        
-        # Check music asset
-        music_path = self.get_music_path()
-        if not os.path.exists(music_path):
-            missing_assets.append(f"Music: {self.assets['music']}")
-        
-        if missing_assets:
+        paths = {self.get_image_path(key): f"Image: {filename}"
+                 for key, filename in self.assets.items() if key != "scale" and key != "music"}
+        paths[self.get_music_path()] = f"Music: {self.assets['music']}"
+
+        # Cached by file mtimes in the game registry, so an unchanged install
+        # isn't stat'ed asset by asset on every start
+        result = validate_files(f"Cycleforest:{self.theme}", list(paths))
+        if not result["ok"]:
             print("Missing assets:")
-            for asset in missing_assets:
-                print(f"- {asset}")
+            for path, label in paths.items():
+                if os.path.relpath(path, PROJECT_ROOT) in result["missing"]:
+                    print(f"- {label}")
             return False
         return True 
\ No newline at end of file
@@ -1,14 +1,48 @@
 import pygame, sys, os, subprocess
-from random import randint, uniform
 from pygame.locals import *
 
+# Run as a script: the shared arcade modules live in the project root
+# (appended, so game modules win). The host and zygote already have it on the path.
+if __name__ == "__main__":
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from frame_profiler import FrameProfiler
+from hud_text import render_text
+from arcade_audio import load_sfx, play_music, play_sfx, pre_init, stop_music
+from render_scale import draw_rect, mouse_pos, open_display, present, rescale, scale_levels
+from quality_governor import QualityGovernor, fps_lever, music_lever
+from arcade_input import input_state
+from arcade_replay import game_session, rng
+from arcade_assets import load_image
+from game_startup import LoadingScreen, init_subsystems, no_progress
+import startup_profile
+
+WINDOW_WIDTH, WINDOW_HEIGHT = 1280, 720
+WINDOW_SIZE = (WINDOW_WIDTH, WINDOW_HEIGHT)
+
+# Deadzone for analog sticks (applied by the input state) and movement speed
+DEADZONE = input_state.deadzone
+SHIP_SPEED = 800  # Higher speed for smoother controller movement
+
+# Meteor timer (allocated once so repeated runs don't use up event types)
+METEOR_TIMER = pygame.event.custom_type()
+
+# Frame-phase timings (F3 overlay, F4 CSV dump)
+profiler = FrameProfiler("GameShooter")
+# Steps quality down when frames run over budget or the Pi gets hot
+governor = QualityGovernor(profiler, target_fps=120)
+
+# load_assets() progress steps: four images, sounds and fonts
+LOAD_STEPS = 6
+
 class AssetManager:
-    def __init__(self):
-        self.current_dir = os.path.dirname(__file__)
+    def __init__(self, progress=no_progress):
+        self.progress = progress
+        self.current_dir = os.path.dirname(os.path.abspath(__file__))
         self.graphics = {}
         self.sounds = {}
         self.fonts = {}
-        
+        self.masks = {}
+
         # Define asset paths
         self.asset_paths = {
             'graphics': {
@@ -19,247 +53,306 @@ class AssetManager:
             },
             'sounds': {
                 'laser': "sounds/laser.ogg",
-                'explosion': "sounds/explosion.wav",
-                'background_music': "sounds/music.wav"
+                'explosion': "sounds/explosion.wav"
             },
+            # Streamed from disk rather than decoded into a Sound
+            'music': "sounds/music.wav",
             'fonts': {
                 'main': "graphics/subatomic.ttf"
             }
         }
-        
+
         self.load_all_assets()
-    
+
     def get_path(self, file_path):
         return os.path.join(self.current_dir, file_path)
-    
+
     def load_all_assets(self):
-        # Load graphics
+        # Load graphics (the background has no transparency, so convert() instead of convert_alpha())
         for key, path in self.asset_paths['graphics'].items():
-            full_path = self.get_path(path)
-            self.graphics[key] = pygame.image.load(full_path).convert_alpha()
-            
-        # Special case for background to use convert() instead of convert_alpha()
-        self.graphics['background'] = pygame.image.load(
-            self.get_path(self.asset_paths['graphics']['background'])
-        ).convert()
-        
-        # Load sounds
+            self.graphics[key] = load_image(self.get_path(path), alpha=(key != 'background'))
+            self.progress(key)
+
+        # Collision masks only depend on the images
+        self.masks['ship'] = pygame.mask.from_surface(self.graphics['ship'])
+        self.masks['meteor'] = pygame.mask.from_surface(self.graphics['meteor'])
+
+        # Load sound effects - a missing sound is skipped rather than stopping the game
         for key, path in self.asset_paths['sounds'].items():
-            full_path = self.get_path(path)
-            self.sounds[key] = pygame.mixer.Sound(full_path)
-            
+            self.sounds[key] = load_sfx(self.get_path(path))
+        self.music_path = self.get_path(self.asset_paths['music'])
+        self.progress('sounds')
+
         # Load fonts
         for key, path in self.asset_paths['fonts'].items():
             full_path = self.get_path(path)
             self.fonts[key] = pygame.font.Font(full_path, 50)
+        self.progress('fonts')
 
-def laser_update(laser_list, speed=300):
-    for rect in laser_list[:]:  # Iterate over a copy to safely remove items
-        rect.y -= speed * dt
-        if rect.bottom < 0:
-            laser_list.remove(rect)
-
-def meteor_update(meteor_list, speed=200):
-    for meteor_tuple in meteor_list[:]:  # Iterate over a copy to safely remove items
-        direction = meteor_tuple[1]
-        meteor_rect = meteor_tuple[0]
-        meteor_rect.center += direction * speed * dt
-        if meteor_rect.top > WINDOW_HEIGHT:
-            meteor_list.remove(meteor_tuple)            
-
-def display_score():
-    score_text = f'Survival Score: {pygame.time.get_ticks() // 1000}'
-    text_surf = assets.fonts['main'].render(score_text, True, (255,255,255))
-    text_rect = text_surf.get_rect(midbottom=(WINDOW_WIDTH/2, WINDOW_HEIGHT-80))
-    display_surface.blit(text_surf, text_rect)
-    pygame.draw.rect(display_surface, (255,255,255), text_rect.inflate(30,30), width=8, border_radius=5)
-
-def laser_cooldown(can_shoot, duration=0):
-    if not can_shoot:
-        current_time = pygame.time.get_ticks()
-        if current_time - shoot_time > duration:
-            can_shoot = True
-    return can_shoot        
-
-# Game init 
-pygame.init()
-WINDOW_WIDTH, WINDOW_HEIGHT = 1280, 720
-display_surface = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption('Meteor Shooter')
-clock = pygame.time.Clock()
+    def play(self, key, **kwargs):
+        play_sfx(self.sounds.get(key), **kwargs)
 
-# Initialize asset manager
-assets = AssetManager()
+def load_assets(progress=no_progress):
+    """
+    Decode all graphics, sounds and fonts (needs a display mode for convert)
+    progress(label) is called after each of the LOAD_STEPS steps.
+    """
+    return AssetManager(progress)
 
-# Controller setup
-pygame.joystick.init()
-joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-for joystick in joysticks:
-    joystick.init()
+class MeteorShooterGame:
+    """One play session - all game state lives here so run() can be called again"""
 
-# Deadzone for analog sticks and movement speed
-DEADZONE = 0.2
-SHIP_SPEED = 800  # Higher speed for smoother controller movement
+    def __init__(self, display_surface, assets):
+        self.display_surface = display_surface
+        self.assets = assets
+        self.clock = pygame.time.Clock()
+        self.fps = 120
 
-# Game objects setup
-ship_rect = assets.graphics['ship'].get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2))
-laser_list = []
-meteor_list = []
-
-# Laser cooldown
-can_shoot = True
-shoot_time = None
-
-# Start background music
-assets.sounds['background_music'].play(loops=-1)
-
-# Meteor timer
-meteor_timer = pygame.event.custom_type()
-pygame.time.set_timer(meteor_timer, 500)
-
-# Game state
-game_active = True
-
-while True:
-    # Event loop
-    for event in pygame.event.get():    
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
-                pygame.quit()
-        
-        # Controller connection/disconnection handling
-        if event.type == JOYDEVICEADDED:
-            joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-            for joystick in joysticks:
-                joystick.init()
-        elif event.type == JOYDEVICEREMOVED:
-            joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
-        
-        # Controller button press (for shooting)
-        if event.type == JOYBUTTONDOWN and can_shoot and game_active:
-            # Check common shoot buttons (A/X on Xbox-style, Cross/Circle on PlayStation)
-            if event.button in (0, 1, 2, 3):  # Adjust based on your controller
-                laser_rect = assets.graphics['laser'].get_rect(midbottom=ship_rect.midtop)
-                laser_list.append(laser_rect)
-                can_shoot = False
-                shoot_time = pygame.time.get_ticks()
-                assets.sounds['laser'].play()
-        
-        # Keyboard shooting (spacebar)
-        if event.type == KEYDOWN and can_shoot and game_active:
-            if event.key == K_SPACE:
-                laser_rect = assets.graphics['laser'].get_rect(midbottom=ship_rect.midtop)
-                laser_list.append(laser_rect)
-                can_shoot = False
-                shoot_time = pygame.time.get_ticks()
-                assets.sounds['laser'].play()
-        
-        if event.type == meteor_timer and game_active:
-            x_pos = randint(-100, WINDOW_WIDTH + 100)
-            y_pos = randint(-100, -50)
-            meteor_rect = assets.graphics['meteor'].get_rect(center=(x_pos, y_pos))
-            direction = pygame.math.Vector2(uniform(-0.5, 0.5), 1)
-            meteor_list.append((meteor_rect, direction))
-
-    # Delta time for frame-rate independent movement
-    dt = clock.tick(120) / 1000
-
-    if game_active:
-        # Controller movement
-        if joysticks:
-            joystick = joysticks[0]  # Use first controller
-            
-            # Left stick movement with deadzone
-            axis_x = joystick.get_axis(0)
-            axis_y = joystick.get_axis(1)
-            
-            # Apply deadzone and normalize
-            if abs(axis_x) < DEADZONE:
-                axis_x = 0
-            else:
-                axis_x = (abs(axis_x) - DEADZONE) * (axis_x / abs(axis_x))
-            
-            if abs(axis_y) < DEADZONE:
-                axis_y = 0
-            else:
-                axis_y = (abs(axis_y) - DEADZONE) * (axis_y / abs(axis_y))
-            
-            # Move ship based on controller input
-            ship_rect.x += int(axis_x * SHIP_SPEED * dt)
-            ship_rect.y += int(axis_y * SHIP_SPEED * dt)
-        
-        # Mouse movement (only if no controller connected)
-        if not joysticks:
-            ship_rect.center = pygame.mouse.get_pos()
-        
-        # Keep ship on screen
-        ship_rect.clamp_ip(pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT))
-        
-        # Shooting (mouse or controller button held)
-        if (pygame.mouse.get_pressed()[0] or (joysticks and joystick.get_button(0))) and can_shoot:
-            laser_rect = assets.graphics['laser'].get_rect(midbottom=ship_rect.midtop)
-            laser_list.append(laser_rect)
-            can_shoot = False
-            shoot_time = pygame.time.get_ticks()
-            assets.sounds['laser'].play()
-        
-        # Update game elements
-        laser_update(laser_list)
-        meteor_update(meteor_list)
-        can_shoot = laser_cooldown(can_shoot, 400)
-        
-        # Meteor-ship collisions
-        ship_mask = pygame.mask.from_surface(assets.graphics['ship'])
-        meteor_mask = pygame.mask.from_surface(assets.graphics['meteor'])
-        for meteor_tuple in meteor_list[:]:
+        # Game objects setup
+        self.ship_rect = assets.graphics['ship'].get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2))
+        self.laser_list = []
+        self.meteor_list = []
+
+        # Laser cooldown
+        self.can_shoot = True
+        self.shoot_time = None
+
+        # Game state
+        self.game_active = True
+        self.start_ticks = pygame.time.get_ticks()
+        self.dt = 0
+
+    def survival_score(self):
+        return (pygame.time.get_ticks() - self.start_ticks) // 1000
+
+    def laser_update(self, speed=300):
+        for rect in self.laser_list[:]:  # Iterate over a copy to safely remove items
+            rect.y -= speed * self.dt
+            if rect.bottom < 0:
+                self.laser_list.remove(rect)
+
+    def meteor_update(self, speed=200):
+        for meteor_tuple in self.meteor_list[:]:  # Iterate over a copy to safely remove items
+            direction = meteor_tuple[1]
             meteor_rect = meteor_tuple[0]
-            if ship_rect.colliderect(meteor_rect): #This line is still useful for optimization
-                offset_x = meteor_rect.left - ship_rect.left
-                offset_y = meteor_rect.top - ship_rect.top
-                overlap = ship_mask.overlap(meteor_mask, (offset_x, offset_y))
-                if overlap:
-                    assets.sounds['explosion'].play()
-                    game_active = False  # Game over instead of immediate exit
-                    break #Exit the loop after a collision is detected
-        
-        # Laser-meteor collisions
-        for laser_rect in laser_list[:]:
-            for meteor_tuple in meteor_list[:]:
-                if laser_rect.colliderect(meteor_tuple[0]):
-                    meteor_list.remove(meteor_tuple)
-                    laser_list.remove(laser_rect)
-                    assets.sounds['explosion'].play()
-                    break
-
-    # Drawing
-    display_surface.blit(assets.graphics['background'], (0, 0))
-    
-    if game_active:
-        for rect in laser_list:
-            display_surface.blit(assets.graphics['laser'], rect)
-        
-        for meteor_tuple in meteor_list:
-            display_surface.blit(assets.graphics['meteor'], meteor_tuple[0])
-        
-        display_surface.blit(assets.graphics['ship'], ship_rect)
-        display_score()
-    else:
-        # Game over screen
-        game_over_text = assets.fonts['main'].render("GAME OVER", True, (255, 255, 255))
-        final_score_text = assets.fonts['main'].render(f"Final Score: {pygame.time.get_ticks() // 1000}", True, (255, 255, 255))
-        display_surface.blit(game_over_text, (WINDOW_WIDTH//2 - game_over_text.get_width()//2, WINDOW_HEIGHT//2 - 50))
-        display_surface.blit(final_score_text, (WINDOW_WIDTH//2 - final_score_text.get_width()//2, WINDOW_HEIGHT//2 + 10))
-        pygame.display.update()
-        
-        # Wait a few seconds before returning to main menu
-        pygame.time.wait(3000)
-        pygame.quit()
+            meteor_rect.center += direction * speed * self.dt
+            if meteor_rect.top > WINDOW_HEIGHT:
+                self.meteor_list.remove(meteor_tuple)
+
+    def display_score(self):
+        score_text = f'Survival Score: {self.survival_score()}'
+        text_surf = render_text(self.assets.fonts['main'], score_text, (255,255,255))
+        text_rect = text_surf.get_rect(midbottom=(WINDOW_WIDTH/2, WINDOW_HEIGHT-80))
+        self.display_surface.blit(text_surf, text_rect)
+        draw_rect(self.display_surface, (255,255,255), text_rect.inflate(30,30), width=8, border_radius=5)
+
+    def laser_cooldown(self, duration=0):
+        if not self.can_shoot:
+            current_time = pygame.time.get_ticks()
+            if current_time - self.shoot_time > duration:
+                self.can_shoot = True
+
+    def shoot(self):
+        laser_rect = self.assets.graphics['laser'].get_rect(midbottom=self.ship_rect.midtop)
+        self.laser_list.append(laser_rect)
+        self.can_shoot = False
+        self.shoot_time = pygame.time.get_ticks()
+        self.assets.play('laser')
+
+    def register_levers(self):
+        """Quality levers for the governor, cheapest to give up first"""
+        governor.reset()
+        governor.register("meteor_interval", (500, 700, 1000),
+                          lambda interval: pygame.time.set_timer(METEOR_TIMER, interval))
+        governor.register("render_scale", scale_levels(),
+                          lambda scale: setattr(self, "display_surface", rescale(self.display_surface, scale)))
+        fps_lever(governor, (120, 90, 60), lambda fps: setattr(self, "fps", fps))
+        music_lever(governor)
+
+    def run(self):
+        """Play until game over or quit; returns the result"""
+        # Start background music
+        play_music(self.assets.music_path)
+        profiler.restart()
+        input_state.reset()
+        # Also starts the meteor timer
+        self.register_levers()
+
+        try:
+            reason = self.loop()
+        finally:
+            pygame.time.set_timer(METEOR_TIMER, 0)
+            stop_music()
+            pygame.mixer.stop()
+
+        return {"game": "GameShooter", "score": self.survival_score(), "reason": reason}
+
+    def loop(self):
+        assets = self.assets
+
+        while True:
+            profiler.start_frame()
+            input_state.begin_frame()
+            governor.update()
+            # The governor may have switched the render scale
+            display_surface = self.display_surface
+
+            # Event loop
+            for event in pygame.event.get():
+                if profiler.handle_event(event) or input_state.handle_event(event):
+                    continue
+                if event.type == pygame.QUIT:
+                    return "quit"
+
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        return "exit"
+
+                # Controller button press (for shooting)
+                if event.type == JOYBUTTONDOWN and self.can_shoot and self.game_active:
+                    # Check common shoot buttons (A/X on Xbox-style, Cross/Circle on PlayStation)
+                    if event.button in (0, 1, 2, 3):  # Adjust based on your controller
+                        self.shoot()
+
+                # Keyboard shooting (spacebar)
+                if event.type == KEYDOWN and self.can_shoot and self.game_active:
+                    if event.key == K_SPACE:
+                        self.shoot()
+
+                if event.type == METEOR_TIMER and self.game_active:
+                    x_pos = rng.randint(-100, WINDOW_WIDTH + 100)
+                    y_pos = rng.randint(-100, -50)
+                    meteor_rect = assets.graphics['meteor'].get_rect(center=(x_pos, y_pos))
+                    direction = pygame.math.Vector2(rng.uniform(-0.5, 0.5), 1)
+                    self.meteor_list.append((meteor_rect, direction))
+
+            profiler.mark("events")
+
+            # Delta time for frame-rate independent movement
+            self.dt = self.clock.tick(self.fps) / 1000
+            profiler.mark("wait")
+            dt = self.dt
+            ship_rect = self.ship_rect
+
+            if self.game_active:
+                # Controller movement
+                has_controller = input_state.has_controller
+                if has_controller:
+                    # Left stick (already 0 inside the deadzone)
+                    axis_x = input_state.axis(0)
+                    axis_y = input_state.axis(1)
+
+                    # Start from 0 at the edge of the deadzone
+                    if axis_x:
+                        axis_x = (abs(axis_x) - DEADZONE) * (axis_x / abs(axis_x))
+                    if axis_y:
+                        axis_y = (abs(axis_y) - DEADZONE) * (axis_y / abs(axis_y))
+
+                    # Move ship based on controller input
+                    ship_rect.x += int(axis_x * SHIP_SPEED * dt)
+                    ship_rect.y += int(axis_y * SHIP_SPEED * dt)
+
+                # Mouse movement (only if no controller connected)
+                if not has_controller:
+                    ship_rect.center = mouse_pos(input_state.mouse)
+
+                # Keep ship on screen
+                ship_rect.clamp_ip(pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT))
+
+                # Shooting (mouse or controller button held)
+                if (input_state.mouse_button(1) or input_state.button(0)) and self.can_shoot:
+                    self.shoot()
+
+                # Update game elements
+                self.laser_update()
+                self.meteor_update()
+                self.laser_cooldown(400)
+                profiler.mark("update")
+
+                # Meteor-ship collisions
+                ship_mask = assets.masks['ship']
+                meteor_mask = assets.masks['meteor']
+                for meteor_tuple in self.meteor_list[:]:
+                    meteor_rect = meteor_tuple[0]
+                    if ship_rect.colliderect(meteor_rect): #This line is still useful for optimization
+                        offset_x = meteor_rect.left - ship_rect.left
+                        offset_y = meteor_rect.top - ship_rect.top
+                        overlap = ship_mask.overlap(meteor_mask, (offset_x, offset_y))
+                        if overlap:
+                            assets.play('explosion')
+                            self.game_active = False  # Game over instead of immediate exit
+                            break #Exit the loop after a collision is detected
+
+                # Laser-meteor collisions
+                for laser_rect in self.laser_list[:]:
+                    for meteor_tuple in self.meteor_list[:]:
+                        if laser_rect.colliderect(meteor_tuple[0]):
+                            self.meteor_list.remove(meteor_tuple)
+                            self.laser_list.remove(laser_rect)
+                            assets.play('explosion')
+                            break
+                profiler.mark("collision")
+
+            # Drawing
+            display_surface.blit(assets.graphics['background'], (0, 0))
+
+            if self.game_active:
+                for rect in self.laser_list:
+                    display_surface.blit(assets.graphics['laser'], rect)
+
+                for meteor_tuple in self.meteor_list:
+                    display_surface.blit(assets.graphics['meteor'], meteor_tuple[0])
+
+                display_surface.blit(assets.graphics['ship'], ship_rect)
+                self.display_score()
+            else:
+                # Game over screen
+                game_over_text = assets.fonts['main'].render("GAME OVER", True, (255, 255, 255))
+                final_score_text = assets.fonts['main'].render(f"Final Score: {self.survival_score()}", True, (255, 255, 255))
+                display_surface.blit(game_over_text, (WINDOW_WIDTH//2 - game_over_text.get_width()//2, WINDOW_HEIGHT//2 - 50))
+                display_surface.blit(final_score_text, (WINDOW_WIDTH//2 - final_score_text.get_width()//2, WINDOW_HEIGHT//2 + 10))
+                present(display_surface)
+
+                # Wait a few seconds before returning to main menu
+                pygame.time.wait(3000)
+                return "game_over"
+
+            profiler.draw(display_surface)
+            profiler.mark("draw")
+            present(display_surface)
+            profiler.mark("display")
+
+def run(screen, assets, **options):
+    """
+    Play one game on an already-open display
+    Args:
+        screen: Display surface of WINDOW_SIZE
+        assets: Result of load_assets() (can be reused across runs)
+        options: seed, record or replay (see arcade_replay.game_session)
+    Returns:
+        dict: game, score and reason ("game_over", "exit" or "quit")
+    """
+    with game_session("GameShooter", options):
+        return MeteorShooterGame(screen, assets).run()
+
+def main():
+    """Run the game standalone and return to the main menu on game over"""
+    startup_profile.begin_trace("GameShooter")
+    # Game init: display and fonts now, the mixer (small buffer for prompt
+    # sound effects) opens with the first sound
+    pre_init()
+    init_subsystems()
+    display_surface = open_display(WINDOW_SIZE)
+    pygame.display.set_caption('Meteor Shooter')
+    loading = LoadingScreen(display_surface, 'Meteor Shooter', LOAD_STEPS)
+
+    result = run(display_surface, load_assets(loading.step))
+    pygame.quit()
+
+    if result["reason"] == "game_over":
         # Return to main menu by launching app.py
-        subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.dirname(__file__)), "app.py")])
-        sys.exit()
+        subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")])
+    sys.exit()
 
-    pygame.display.update()
+if __name__ == "__main__":
+    main()
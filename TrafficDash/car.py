@@ -1,23 +1,27 @@
 import pygame
 from os import walk
-from random import choice
 from utils import get_asset_path
+from arcade_replay import rng
+from arcade_assets import load_image
+
+def import_car_images():
+	"""Load every car image once instead of on each spawn"""
+	cars_path = get_asset_path('TrafficDash', 'graphics', 'cars')
+	car_images = []
+	for _, _, files in walk(cars_path):
+		car_images = [f for f in files if f.endswith('.png')]
+	return [
+		load_image(get_asset_path('TrafficDash', 'graphics', 'cars', car_name))
+		for car_name in sorted(car_images)
+	]
 
 class Car(pygame.sprite.Sprite):
-	def __init__(self,pos,groups):
+	def __init__(self,pos,groups,images=None):
 		super().__init__(groups)
 		self.name = 'car'
 
-		# Get list of available car images
-		cars_path = get_asset_path('TrafficDash', 'graphics', 'cars')
-		car_images = []
-		for _, _, files in walk(cars_path):
-			car_images = [f for f in files if f.endswith('.png')]
-		
 		# Choose a random car image
-		car_name = choice(car_images)
-		car_image_path = get_asset_path('TrafficDash', 'graphics', 'cars', car_name)
-		self.image = pygame.image.load(car_image_path).convert_alpha()
+		self.image = rng.choice(images if images else import_car_images())
 		self.rect = self.image.get_rect(center = pos)
 
 		# float based movement
@@ -1,20 +1,46 @@
-import pygame, sys, time
+import pygame, sys, os, subprocess
+# Run as a script: the shared arcade modules live in the project root
+# (appended, so game modules win). The host and zygote already have it on the path.
+if __name__ == "__main__":
+	sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from settings import *
-from player import Player
-from car import Car
-from waterbottle import WaterBottle
-from random import choice, randint
+from player import Player, import_animations
+from car import Car, import_car_images
+from waterbottle import WaterBottle, import_bottle_image
 from sprite import SimpleSprite, LongSprite
 from utils import get_asset_path
 
+from frame_profiler import FrameProfiler
+from hud_text import panel, render_text
+from arcade_audio import load_sfx, play_music, play_sfx, pre_init, stop_music
+from render_scale import open_display, present, rescale, scale_levels
+from quality_governor import QualityGovernor, music_lever
+from arcade_input import input_state
+from arcade_replay import game_session, rng
+from arcade_assets import load_image
+from game_startup import LoadingScreen, init_subsystems, no_progress
+import startup_profile
+
+WINDOW_SIZE = (WINDOW_WIDTH, WINDOW_HEIGHT)
+
+# frame-phase timings (F3 overlay, F4 CSV dump)
+profiler = FrameProfiler("TrafficDash")
+# steps quality down when frames run over budget or the Pi gets hot
+governor = QualityGovernor(profiler, target_fps=60)
+
+# timers (allocated once so repeated runs don't use up event types)
+CAR_TIMER = pygame.event.custom_type()
+BOTTLE_TIMER = pygame.event.custom_type()
+
 class AllSprites(pygame.sprite.Group):
-	def __init__(self):
+	def __init__(self, bg, fg):
 		super().__init__()
 		self.offset = pygame.math.Vector2()
-		self.bg = pygame.image.load(get_asset_path("TrafficDash", "graphics", "main", "map.png")).convert()
-		self.fg = pygame.image.load(get_asset_path("TrafficDash", "graphics", "main", "overlay.png")).convert_alpha()
+		self.bg = bg
+		self.fg = fg
+		self.draw_overlay = True
 
-	def customize_draw(self):
+	def customize_draw(self, display_surface, player):
 		# change the offset vector
 		self.offset.x = player.rect.centerx - WINDOW_WIDTH / 2
 		self.offset.y = player.rect.centery - WINDOW_HEIGHT / 2
@@ -26,75 +52,47 @@ class AllSprites(pygame.sprite.Group):
 			offset_pos = sprite.rect.topleft - self.offset
 			display_surface.blit(sprite.image, offset_pos)
 
-		display_surface.blit(self.fg,-self.offset)	
+		if self.draw_overlay:
+			display_surface.blit(self.fg,-self.offset)	
 
-def quit_game():
-	pygame.quit()
-	sys.exit()
+# load_assets() progress steps: map, overlay, player, cars, bottle, sound, objects
+LOAD_STEPS = 7
 
-# basic setup
-pygame.init()
-display_surface = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption('Water Bottle Collector')
-clock = pygame.time.Clock()
-
-# groups
-all_sprites = AllSprites()
-obstacle_sprites = pygame.sprite.Group()
-collectible_sprites = pygame.sprite.Group()
-
-# sprites
-player = Player((2062,3274), all_sprites, obstacle_sprites)
-
-# timer
-car_timer = pygame.event.custom_type()
-bottle_timer = pygame.event.custom_type()
-pygame.time.set_timer(car_timer, 120)
-pygame.time.set_timer(bottle_timer, 3000)  # Spawn water bottle every 3 seconds
-pos_list = []
-
-# score
-score = 0
-font = pygame.font.Font(None, 50)
-collect_sound = pygame.mixer.Sound(get_asset_path("TrafficDash", "audio", "collected.wav"))
-
-# music
-music = pygame.mixer.Sound(get_asset_path("TrafficDash", "audio", "music.mp3"))
-music.play(loops = -1)
-
-def spawn_water_bottle():
-	# Only spawn if we have less than 20 bottles
-	if len(collectible_sprites) >= 20:
-		return None
-		
-	# Spawn within player's restricted area
-	x = randint(640, 2560)  # Player's x boundaries
-	y = randint(1180, 3500)  # Player's y boundaries
-	
-	# Check if position is too close to other bottles (minimum distance of 100 pixels)
-	for bottle in collectible_sprites:
-		if abs(bottle.rect.centerx - x) < 100 and abs(bottle.rect.centery - y) < 100:
-			return None
-			
-	return WaterBottle((x, y), [all_sprites, collectible_sprites])
-
-def display_score():
-	score_text = f'Water Bottles: {score}'
-	score_surf = font.render(score_text, True, "white")
-	score_rect = score_surf.get_rect(topleft=(10, 10))
-	
-	# Create background rectangle with padding
-	bg_rect = score_rect.inflate(20, 20)
-	bg_rect.topleft = (5, 5)
-	
-	# Draw background with alpha
-	bg_surf = pygame.Surface(bg_rect.size)
-	bg_surf.fill('black')
-	bg_surf.set_alpha(128)  # Semi-transparent background
-	
-	# Draw background and text
-	display_surface.blit(bg_surf, bg_rect)
-	display_surface.blit(score_surf, score_rect)
+def load_assets(progress=no_progress):
+	"""
+	Load every image and sound once (needs a display mode for convert)
+	progress(label) is called after each of the LOAD_STEPS steps.
+	"""
+	assets = {
+		'simple': {},
+		'long': {},
+		'font': pygame.font.Font(None, 50),
+		# streamed from disk - decoded as a Sound the track takes tens of MB
+		'music': get_asset_path("TrafficDash", "audio", "music.mp3"),
+	}
+	# the map and overlay are 3200x3840 - cached decoded, they skip PNG decoding
+	assets['bg'] = load_image(get_asset_path("TrafficDash", "graphics", "main", "map.png"), alpha=False)
+	progress('map')
+	assets['fg'] = load_image(get_asset_path("TrafficDash", "graphics", "main", "overlay.png"))
+	progress('overlay')
+	assets['player'] = import_animations()
+	progress('player')
+	assets['cars'] = import_car_images()
+	progress('cars')
+	assets['bottle'] = import_bottle_image()
+	progress('bottle')
+	assets['collect_sound'] = load_sfx(get_asset_path("TrafficDash", "audio", "collected.wav"))
+	progress('sound')
+	# simple
+	for file_name in SIMPLE_OBJECTS:
+		path = get_asset_path("TrafficDash", "graphics", "objects", "simple", f"{file_name}.png")
+		assets['simple'][file_name] = load_image(path)
+	# long
+	for file_name in LONG_OBJECTS:
+		path = get_asset_path("TrafficDash", "graphics", "objects", "long", f"{file_name}.png")
+		assets['long'][file_name] = load_image(path)
+	progress('objects')
+	return assets
 
 def check_bottle_collision(player, bottle):
 	# First do a quick check with rects
@@ -106,67 +104,201 @@ def check_bottle_collision(player, bottle):
 			return True
 	return False
 
-# sprite setup 
-# simple
-for file_name, pos_list in SIMPLE_OBJECTS.items():
-	path = get_asset_path("TrafficDash", "graphics", "objects", "simple", f"{file_name}.png")
-	surf = pygame.image.load(path).convert_alpha()
-	for pos in pos_list:
-		SimpleSprite(surf, pos, [all_sprites,obstacle_sprites])
-# long
-for file_name, pos_list in LONG_OBJECTS.items():
-	path = get_asset_path("TrafficDash", "graphics", "objects", "long", f"{file_name}.png")
-	surf = pygame.image.load(path).convert_alpha()
-	for pos in pos_list:
-		LongSprite(surf, pos, [all_sprites,obstacle_sprites])
-
-# Spawn initial water bottles (up to 20)
-for _ in range(20):
-	spawn_water_bottle()
-
-try:
-	# game loop
-	while True:
-		# event loop
-		for event in pygame.event.get():
-			if event.type == pygame.QUIT:
-				quit_game()
-			if event.type == car_timer:
-				random_pos = choice(CAR_START_POSITIONS)
-				if random_pos not in pos_list:
-					pos_list.append(random_pos)
-					pos = (random_pos[0],random_pos[1] + randint(-8,8))
-					Car(pos,[all_sprites,obstacle_sprites])
-				if len(pos_list) > 5:
-					del pos_list[0]
-			if event.type == bottle_timer and len(collectible_sprites) < 20:
-				spawn_water_bottle()
-
-		# delta time
-		dt = clock.tick() / 1000
-
-		# draw background
-		display_surface.fill('black')
-
-		# Check for collisions with water bottles
-		for bottle in collectible_sprites:
-			if check_bottle_collision(player, bottle):
-				bottle.kill()
-				score += 1
-				collect_sound.play()
-				# Spawn a new bottle to maintain the number of bottles
-				spawn_water_bottle()
-
-		# update and draw game
-		all_sprites.update(dt)
-		all_sprites.customize_draw()
-		display_score()
-
-		# draw the frame
-		pygame.display.update()
-
-except Exception as e:
-	print(f"Game crashed: {e}")
-finally:
-	quit_game()
-	
+class TrafficDashGame:
+	"""One play session - all game state lives here so run() can be called again"""
+
+	def __init__(self, display_surface, assets):
+		self.display_surface = display_surface
+		self.assets = assets
+		self.clock = pygame.time.Clock()
+		self.max_bottles = 20
+
+		# groups
+		self.all_sprites = AllSprites(assets['bg'], assets['fg'])
+		self.obstacle_sprites = pygame.sprite.Group()
+		self.collectible_sprites = pygame.sprite.Group()
+
+		# sprites
+		self.player = Player((2062,3274), self.all_sprites, self.obstacle_sprites, assets['player'])
+		self.pos_list = []
+
+		# score
+		self.score = 0
+
+		# sprite setup 
+		# simple
+		for file_name, pos_list in SIMPLE_OBJECTS.items():
+			surf = assets['simple'][file_name]
+			for pos in pos_list:
+				SimpleSprite(surf, pos, [self.all_sprites,self.obstacle_sprites])
+		# long
+		for file_name, pos_list in LONG_OBJECTS.items():
+			surf = assets['long'][file_name]
+			for pos in pos_list:
+				LongSprite(surf, pos, [self.all_sprites,self.obstacle_sprites])
+
+		# Spawn initial water bottles (up to 20)
+		for _ in range(self.max_bottles):
+			self.spawn_water_bottle()
+
+	def spawn_water_bottle(self):
+		# Only spawn if we have less than max_bottles bottles
+		if len(self.collectible_sprites) >= self.max_bottles:
+			return None
+			
+		# Spawn within player's restricted area
+		x = rng.randint(640, 2560)  # Player's x boundaries
+		y = rng.randint(1180, 3500)  # Player's y boundaries
+		
+		# Check if position is too close to other bottles (minimum distance of 100 pixels)
+		for bottle in self.collectible_sprites:
+			if abs(bottle.rect.centerx - x) < 100 and abs(bottle.rect.centery - y) < 100:
+				return None
+				
+		return WaterBottle((x, y), [self.all_sprites, self.collectible_sprites], self.assets['bottle'])
+
+	def display_score(self):
+		score_text = f'Water Bottles: {self.score}'
+		score_surf = render_text(self.assets['font'], score_text, "white")
+		score_rect = score_surf.get_rect(topleft=(10, 10))
+		
+		# Create background rectangle with padding
+		bg_rect = score_rect.inflate(20, 20)
+		bg_rect.topleft = (5, 5)
+		
+		# Semi-transparent background (cached per size)
+		bg_surf = panel(bg_rect.size, 'black', 128)
+		
+		# Draw background and text
+		self.display_surface.blit(bg_surf, bg_rect)
+		self.display_surface.blit(score_surf, score_rect)
+
+	def register_levers(self):
+		"""Quality levers for the governor, cheapest to give up first"""
+		governor.reset()
+		governor.register("overlay", (True, False), lambda enabled: setattr(self.all_sprites, "draw_overlay", enabled))
+		governor.register("max_bottles", (20, 12, 6), lambda count: setattr(self, "max_bottles", count))
+		governor.register("render_scale", scale_levels(),
+			lambda scale: setattr(self, "display_surface", rescale(self.display_surface, scale)))
+		music_lever(governor)
+
+	def run(self):
+		"""Play until hit by a car or quit; returns the result"""
+		pygame.time.set_timer(CAR_TIMER, 120)
+		pygame.time.set_timer(BOTTLE_TIMER, 3000)  # Spawn water bottle every 3 seconds
+
+		# music
+		play_music(self.assets['music'])
+		profiler.restart()
+		input_state.reset()
+		self.register_levers()
+
+		try:
+			reason = self.loop()
+		finally:
+			pygame.time.set_timer(CAR_TIMER, 0)
+			pygame.time.set_timer(BOTTLE_TIMER, 0)
+			stop_music()
+			pygame.mixer.stop()
+
+		return {"game": "TrafficDash", "score": self.score, "reason": reason}
+
+	def loop(self):
+		# game loop
+		while True:
+			profiler.start_frame()
+			input_state.begin_frame()
+			governor.update()
+
+			# event loop
+			for event in pygame.event.get():
+				if profiler.handle_event(event) or input_state.handle_event(event):
+					continue
+				if event.type == pygame.QUIT:
+					return "quit"
+				if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+					return "exit"
+				if event.type == CAR_TIMER:
+					random_pos = rng.choice(CAR_START_POSITIONS)
+					if random_pos not in self.pos_list:
+						self.pos_list.append(random_pos)
+						pos = (random_pos[0],random_pos[1] + rng.randint(-8,8))
+						Car(pos,[self.all_sprites,self.obstacle_sprites],self.assets['cars'])
+					if len(self.pos_list) > 5:
+						del self.pos_list[0]
+				if event.type == BOTTLE_TIMER and len(self.collectible_sprites) < self.max_bottles:
+					self.spawn_water_bottle()
+
+			profiler.mark("events")
+
+			# delta time
+			dt = self.clock.tick() / 1000
+			profiler.mark("wait")
+
+			# draw background
+			self.display_surface.fill('black')
+			profiler.mark("draw")
+
+			# Check for collisions with water bottles
+			for bottle in self.collectible_sprites:
+				if check_bottle_collision(self.player, bottle):
+					bottle.kill()
+					self.score += 1
+					play_sfx(self.assets['collect_sound'])
+					# Spawn a new bottle to maintain the number of bottles
+					self.spawn_water_bottle()
+			profiler.mark("collision")
+
+			# update and draw game
+			self.all_sprites.update(dt)
+			if self.player.crashed:
+				return "game_over"
+			profiler.mark("update")
+			self.all_sprites.customize_draw(self.display_surface, self.player)
+			self.display_score()
+			profiler.draw(self.display_surface)
+			profiler.mark("draw")
+
+			# draw the frame
+			present(self.display_surface)
+			profiler.mark("display")
+
+def run(screen, assets, **options):
+	"""
+	Play one game on an already-open display
+	Args:
+		screen: Display surface of WINDOW_SIZE
+		assets: Result of load_assets() (can be reused across runs)
+		options: seed, record or replay (see arcade_replay.game_session)
+	Returns:
+		dict: game, score and reason ("game_over", "exit" or "quit")
+	"""
+	with game_session("TrafficDash", options):
+		return TrafficDashGame(screen, assets).run()
+
+def main():
+	"""Run the game standalone and return to the main menu when hit by a car"""
+	startup_profile.begin_trace("TrafficDash")
+	# basic setup: display and fonts now, the mixer (small buffer for prompt
+	# sound effects) opens with the first sound
+	pre_init()
+	init_subsystems()
+	display_surface = open_display(WINDOW_SIZE)
+	pygame.display.set_caption('Water Bottle Collector')
+
+	result = None
+	try:
+		loading = LoadingScreen(display_surface, 'Water Bottle Collector', LOAD_STEPS)
+		result = run(display_surface, load_assets(loading.step))
+	except Exception as e:
+		print(f"Game crashed: {e}")
+	finally:
+		pygame.quit()
+
+	if result and result["reason"] == "game_over":
+		# Return to main menu
+		subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")])
+	sys.exit()
+
+if __name__ == "__main__":
+	main()
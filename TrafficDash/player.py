@@ -1,15 +1,34 @@
-import pygame, sys
+import pygame
 from os import walk
 from utils import get_asset_path
-import subprocess
-import os
+from arcade_input import input_state
+from arcade_assets import load_image
+
+def import_animations():
+	"""Load the player animation frames, keyed by direction"""
+	animations = {}
+	player_path = get_asset_path('TrafficDash', 'graphics', 'player')
+	
+	# Get all animation folders
+	for _, folders, _ in walk(player_path):
+		for folder in folders:
+			animations[folder] = []
+			
+			# Get all images in the animation folder
+			folder_path = get_asset_path('TrafficDash', 'graphics', 'player', folder)
+			for _, _, files in walk(folder_path):
+				for file in sorted(files):  # Sort files to ensure consistent order
+					if file.endswith('.png'):
+						image_path = get_asset_path('TrafficDash', 'graphics', 'player', folder, file)
+						animations[folder].append(load_image(image_path))
+	return animations
 
 class Player(pygame.sprite.Sprite):
-	def __init__(self, pos, groups, collision_sprites):
+	def __init__(self, pos, groups, collision_sprites, animations=None):
 		super().__init__(groups)
 
-		# image
-		self.import_assets()
+		# image (frames can be shared between rounds)
+		self.animations = animations if animations is not None else import_animations()
 		self.frame_index = 0
 		self.status = 'down'
 		self.image = self.animations[self.status][self.frame_index]
@@ -23,31 +42,16 @@ class Player(pygame.sprite.Sprite):
 
 		# collisions
 		self.collision_sprites = collision_sprites
+		self.crashed = False
 		self.hitbox = self.rect.inflate(0,-self.rect.height / 2)
 
-		# controller setup
-		pygame.joystick.init()
-		self.joysticks = []
-		try:
-			for i in range(pygame.joystick.get_count()):
-				joystick = pygame.joystick.Joystick(i)
-				joystick.init()
-				self.joysticks.append(joystick)
-		except pygame.error:
-			pass  # No joysticks connected
-
-		# deadzone for analog stick
-		self.deadzone = 0.2
-
 	def collision(self, direction):
 		if direction == 'horizontal':
 			for sprite in self.collision_sprites.sprites():
 				if sprite.hitbox.colliderect(self.hitbox):
 					if hasattr(sprite, 'name') and sprite.name == 'car':
-						pygame.quit()
-						# Return to main menu
-						subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.dirname(__file__)), "app.py")])
-						sys.exit()
+						# Hit by a car - the game loop ends the round
+						self.crashed = True
 					if self.direction.x > 0: # moving right
 						self.hitbox.right = sprite.hitbox.left
 						self.rect.centerx = self.hitbox.centerx
@@ -60,10 +64,8 @@ class Player(pygame.sprite.Sprite):
 			for sprite in self.collision_sprites.sprites():
 				if sprite.hitbox.colliderect(self.hitbox):
 					if hasattr(sprite, 'name') and sprite.name == 'car':
-						pygame.quit()
-						# Return to main menu
-						subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.dirname(__file__)), "app.py")])
-						sys.exit()
+						# Hit by a car - the game loop ends the round
+						self.crashed = True
 					if self.direction.y > 0: # moving down
 						self.hitbox.bottom = sprite.hitbox.top
 						self.rect.centery = self.hitbox.centery
@@ -73,24 +75,6 @@ class Player(pygame.sprite.Sprite):
 						self.rect.centery = self.hitbox.centery
 						self.pos.y = self.hitbox.centery
 
-	def import_assets(self):
-		self.animations = {}
-		player_path = get_asset_path('TrafficDash', 'graphics', 'player')
-		
-		# Get all animation folders
-		for _, folders, _ in walk(player_path):
-			for folder in folders:
-				self.animations[folder] = []
-				
-				# Get all images in the animation folder
-				folder_path = get_asset_path('TrafficDash', 'graphics', 'player', folder)
-				for _, _, files in walk(folder_path):
-					for file in sorted(files):  # Sort files to ensure consistent order
-						if file.endswith('.png'):
-							image_path = get_asset_path('TrafficDash', 'graphics', 'player', folder, file)
-							surf = pygame.image.load(image_path).convert_alpha()
-							self.animations[folder].append(surf)
-
 	def move(self, dt):
 
 		# to normalized a vector
@@ -110,61 +94,50 @@ class Player(pygame.sprite.Sprite):
 		self.collision('vertical')
 
 	def input(self):
-		keys = pygame.key.get_pressed()
-		
 		# Initialize movement to 0
 		self.direction.x = 0
 		self.direction.y = 0
 		
 		# Keyboard input
-		if keys[pygame.K_RIGHT]:
+		if input_state.key(pygame.K_RIGHT):
 			self.direction.x = 1
 			self.status = 'right'
-		elif keys[pygame.K_LEFT]:
+		elif input_state.key(pygame.K_LEFT):
 			self.direction.x = -1
 			self.status = 'left'
 			
-		if keys[pygame.K_UP]:
+		if input_state.key(pygame.K_UP):
 			self.direction.y = -1
 			self.status = 'up'
-		elif keys[pygame.K_DOWN]:
+		elif input_state.key(pygame.K_DOWN):
 			self.direction.y = 1
 			self.status = 'down'
 
-		# Controller input - only process if joysticks are available
-		if self.joysticks:  # Only process joystick input if we have joysticks
-			for joystick in self.joysticks:
-				try:
-					# Left analog stick
-					x_axis = joystick.get_axis(0)
-					y_axis = joystick.get_axis(1)
-					
-					# Apply deadzone
-					if abs(x_axis) > self.deadzone:
-						self.direction.x = x_axis
-						self.status = 'right' if x_axis > 0 else 'left'
-					
-					if abs(y_axis) > self.deadzone:
-						self.direction.y = y_axis
-						self.status = 'down' if y_axis > 0 else 'up'
-
-					# D-pad support
-					hat = joystick.get_hat(0)
-					if hat[0] > 0:
-						self.direction.x = 1
-						self.status = 'right'
-					elif hat[0] < 0:
-						self.direction.x = -1
-						self.status = 'left'
-						
-					if hat[1] > 0:
-						self.direction.y = 1
-						self.status = 'up'
-					elif hat[1] < 0:
-						self.direction.y = -1
-						self.status = 'down'
-				except pygame.error:
-					continue  # Skip this joystick if there's an error
+		# Controller input (axes are already 0 inside the deadzone)
+		x_axis = input_state.axis(0)
+		y_axis = input_state.axis(1)
+		if x_axis:
+			self.direction.x = x_axis
+			self.status = 'right' if x_axis > 0 else 'left'
+		if y_axis:
+			self.direction.y = y_axis
+			self.status = 'down' if y_axis > 0 else 'up'
+
+		# D-pad support
+		hat = input_state.hat(0)
+		if hat[0] > 0:
+			self.direction.x = 1
+			self.status = 'right'
+		elif hat[0] < 0:
+			self.direction.x = -1
+			self.status = 'left'
+			
+		if hat[1] > 0:
+			self.direction.y = 1
+			self.status = 'up'
+		elif hat[1] < 0:
+			self.direction.y = -1
+			self.status = 'down'
 
 	def animate(self, dt):
 		current_animations = self.animations[self.status]
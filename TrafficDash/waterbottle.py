@@ -1,13 +1,16 @@
 import pygame
 from utils import get_asset_path
+from arcade_assets import load_image
+
+def import_bottle_image():
+    """Load and process the water bottle image with transparency"""
+    # Scale to approximately the size of the green object
+    return load_image(get_asset_path("TrafficDash", "graphics", "bottle", "Waterbottle.png"), size=(64, 64))
 
 class WaterBottle(pygame.sprite.Sprite):
-    def __init__(self, pos, groups):
+    def __init__(self, pos, groups, image=None):
         super().__init__(groups)
-        # Load and process the water bottle image with transparency
-        original_image = pygame.image.load(get_asset_path("TrafficDash", "graphics", "bottle", "Waterbottle.png")).convert_alpha()
-        # Scale to approximately the size of the green object
-        self.image = pygame.transform.scale(original_image, (64, 64))
+        self.image = image if image is not None else import_bottle_image()
         self.rect = self.image.get_rect(center=pos)
         # Create a mask for precise collision detection
         self.mask = pygame.mask.from_surface(self.image)
@@ -1,9 +1,32 @@
 from PySide6.QtWidgets import QApplication, QWidget, QPushButton, QVBoxLayout, QLabel
-from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve
+from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QObject, Signal
 import subprocess
 import sys
 import os
 
+from arcade_events import DEPOSIT_SOCKET, PRESENCE_SOCKET, EventSubscriber, service_available
+from ultrasonic_detector import ensure_daemon_running
+from arcade_supervisor import is_supervised, notify_supervisor
+
+class EventListener(QObject):
+    """Forwards one type of arcade event from a detector socket to the Qt thread"""
+    received = Signal(dict)
+    
+    def __init__(self, socket_path, event_type):
+        super().__init__()
+        self.event_type = event_type
+        self.subscriber = EventSubscriber(socket_path, self.on_event)
+    
+    def on_event(self, event):
+        if event.get("type") == self.event_type:
+            self.received.emit(event)
+    
+    def start(self):
+        self.subscriber.start()
+    
+    def stop(self):
+        self.subscriber.stop()
+
 class StartWindow(QWidget):
     def __init__(self):
         super().__init__()
@@ -87,14 +110,53 @@ class StartWindow(QWidget):
         layout.addWidget(self.add_token_button)
         self.setLayout(layout)
         
+        # Bottle deposits from the headless YOLO service start the game directly
+        self.deposit_listener = EventListener(DEPOSIT_SOCKET, "deposit")
+        self.deposit_listener.received.connect(self.on_bottle_deposited)
+        self.deposit_listener.start()
+        
+        # Presence events from the ultrasonic daemon, once a token is requested
+        self.token_armed = False
+        self.presence_listener = EventListener(PRESENCE_SOCKET, "presence")
+        self.presence_listener.received.connect(self.on_presence)
+        self.presence_listener.start()
+        if service_available(DEPOSIT_SOCKET):
+            self.instructions.setText("Insert a bottle into the deposit slot to start playing!")
+            self.add_token_button.hide()
+        
         # Set window flags for fullscreen
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
         self.showFullScreen()
         
     def start_token_detection(self):
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        subprocess.Popen([sys.executable, os.path.join(current_dir, "ultrasonic_detector.py")])
+        # The detector daemon keeps running between sessions - only start it if needed
+        ensure_daemon_running()
+        self.token_armed = True
+        self.add_token_button.setEnabled(False)
+        self.instructions.setText("Place an object near the ultrasonic sensor to start playing!")
+    
+    def on_presence(self, event):
+        """The ultrasonic daemon saw an object - open the game launcher"""
+        if self.token_armed:
+            self.launch_launcher()
+    
+    def on_bottle_deposited(self, event):
+        """A bottle was detected by the deposit service - open the game launcher"""
+        self.launch_launcher()
+    
+    def launch_launcher(self):
+        if is_supervised():
+            # The supervisor owns the launcher process
+            notify_supervisor("token")
+        else:
+            current_dir = os.path.dirname(os.path.abspath(__file__))
+            subprocess.Popen([sys.executable, os.path.join(current_dir, "main.py")])
         self.close()
+    
+    def closeEvent(self, event):
+        self.deposit_listener.stop()
+        self.presence_listener.stop()
+        event.accept()
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
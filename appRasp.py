@@ -1,9 +1,16 @@
 import tkinter as tk
 from tkinter import messagebox
+import queue
 import subprocess
 import sys
 import os
 
+from arcade_events import PRESENCE_SOCKET, EventSubscriber
+from ultrasonic_detector import ensure_daemon_running
+from game_zygote import ensure_zygote_running, launch_game
+from arcade_supervisor import is_supervised, notify_supervisor
+from game_registry import load_games
+
 # Removed camera imports - using ultrasonic sensor instead
 
 class ArcadeApp:
@@ -18,47 +25,60 @@ class ArcadeApp:
                          fg="#4ecca3", bg="#16213e", pady=20)
         label.pack(pady=10)
 
-        # Game buttons
-        btn1 = tk.Button(root, text="🚀 Play Asteroid Game", font=("Segoe UI", 18, "bold"),
-                         bg="#0f3460", fg="white", command=self.launch_game1)
-        btn1.pack(pady=10, ipadx=10, ipady=10)
-
-        btn2 = tk.Button(root, text="🌲 Play Cycle Forest", font=("Segoe UI", 18, "bold"),
-                         bg="#0f3460", fg="white", command=self.launch_game2)
-        btn2.pack(pady=10, ipadx=10, ipady=10)
-
-        btn3 = tk.Button(root, text="🚗 Play Traffic Dash", font=("Segoe UI", 18, "bold"),
-                         bg="#0f3460", fg="white", command=self.launch_game3)
-        btn3.pack(pady=10, ipadx=10, ipady=10)
+        # One button per game in the games.json manifest
+        for game in load_games():
+            btn = tk.Button(root, text=f"{game['icon']} Play {game['name']}", font=("Segoe UI", 18, "bold"),
+                            bg="#0f3460", fg="white", command=lambda key=game["key"]: self.start_game(key))
+            btn.pack(pady=10, ipadx=10, ipady=10)
 
         # Ultrasonic sensor button
         sensor_btn = tk.Button(root, text="🔊 Start Ultrasonic Detection", font=("Segoe UI", 18, "bold"),
                               bg="#4ecca3", fg="#1a1a2e", command=self.start_ultrasonic_detection)
         sensor_btn.pack(pady=20, ipadx=10, ipady=10)
 
-    def launch_game1(self):
-        subprocess.Popen([sys.executable, os.path.join(os.getcwd(), "GameShooter", "asteriodShooter.py")])
-        self.root.destroy()
-        sys.exit(0)  # Ensure complete exit
+        # Presence events from the ultrasonic daemon arrive on a background
+        # thread; they are handed to Tk through a queue polled with after()
+        self.presence_events = queue.Queue()
+        self.presence_subscriber = None
 
-    def launch_game2(self):
-        subprocess.Popen([sys.executable, os.path.join(os.getcwd(), "Cycleforest", "main.py")])
-        self.root.destroy()
-        sys.exit(0)  # Ensure complete exit
+        # Warm up the game zygote while the player is choosing
+        ensure_zygote_running()
 
-    def launch_game3(self):
-        subprocess.Popen([sys.executable, os.path.join(os.getcwd(), "TrafficDash", "main.py")])
+    def start_game(self, key):
+        launch_game(key)
         self.root.destroy()
         sys.exit(0)  # Ensure complete exit
 
     def start_ultrasonic_detection(self):
         """Start the ultrasonic sensor detection system"""
         try:
-            subprocess.Popen([sys.executable, os.path.join(os.getcwd(), "ultrasonic_detector.py")])
+            # Reuse the running detector daemon instead of spawning another one
+            ensure_daemon_running()
+            if not self.presence_subscriber:
+                self.presence_subscriber = EventSubscriber(PRESENCE_SOCKET, self.presence_events.put).start()
+                self.root.after(100, self.poll_presence)
             messagebox.showinfo("Ultrasonic Detection", "Ultrasonic sensor detection started!\nPlace an object within 30cm to trigger games.")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to start ultrasonic detection: {e}")
 
+    def poll_presence(self):
+        """Open the game launcher when the daemon reports an object"""
+        try:
+            while True:
+                event = self.presence_events.get_nowait()
+                if event.get("type") == "presence":
+                    self.presence_subscriber.stop()
+                    if is_supervised():
+                        # The supervisor owns the launcher process
+                        notify_supervisor("token")
+                    else:
+                        subprocess.Popen([sys.executable, os.path.join(os.getcwd(), "main.py")])
+                    self.root.destroy()
+                    return
+        except queue.Empty:
+            pass
+        self.root.after(100, self.poll_presence)
+
 if __name__ == "__main__":
     root = tk.Tk()
     app = ArcadeApp(root)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Shared image loading with an on-disk cache of decoded pixels
+The first load of an image decodes it as usual and writes the pixels
+(after any scaling) to a cache file: a small header followed by raw
+RGB/BGRA rows. Later loads memory-map that file and hand it to
+pygame.image.frombuffer(), so PNG decoding and scaling are skipped and
+only the copy into the display format remains. Entries are checked
+against the source file's mtime and size.
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+
+import pygame
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Empty or "off" disables the disk cache
+CACHE_DIR = os.environ.get("ARCADE_ASSET_CACHE", os.path.expanduser("~/.cache/arcade_assets"))
+# Raw entries are large (the TrafficDash map is 36 MB) and fast when in the
+# page cache; on slow storage, zlib-compressed entries read less but can't be mapped
+COMPRESS = os.environ.get("ARCADE_ASSET_CACHE_COMPRESS") == "1"
+COMPRESS_MIN_BYTES = 1024 * 1024
+
+MAGIC = b"ARCS"
+VERSION = 1
+# magic, version, compressed, width, height, source mtime_ns, source size, pixel format
+HEADER = struct.Struct("<4sHHIIqq4s")
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".gif"}
+
+_mapped = {}   # cache file -> (mmap, header values), kept open by preload()
+_stats = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+
+def cache_enabled():
+    return bool(CACHE_DIR) and CACHE_DIR != "off"
+
+
+def source_prefix(path):
+    return hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:16]
+
+
+def cache_entries(path):
+    """Existing cache entries of one source image"""
+    if not cache_enabled() or not os.path.isdir(CACHE_DIR):
+        return []
+    prefix = source_prefix(path) + "_"
+    return [os.path.join(CACHE_DIR, name) for name in os.listdir(CACHE_DIR)
+            if name.startswith(prefix) and name.endswith(".surf")]
+
+
+def cache_file(path, alpha, size):
+    """Cache entry for one source image, pixel kind and (scaled) size"""
+    kind = "a" if alpha else "o"
+    scaled = f"{size[0]}x{size[1]}" if size else "native"
+    return os.path.join(CACHE_DIR, f"{source_prefix(path)}_{kind}_{scaled}.surf")
+
+
+def read_entry(entry, source_stat):
+    """Display-format Surface from a cache entry, or None if it is missing or stale"""
+    mapped = _mapped.get(entry)
+    if mapped is not None:
+        image = surface_from(*mapped, source_stat)
+        if image is not None:
+            return image
+        # Rewritten since preload() mapped it: the mapping still shows the
+        # old file, so drop it and read the entry on disk from now on
+        del _mapped[entry]
+        mapped[0].close()
+
+    try:
+        with open(entry, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None  # Missing (or empty) entry
+    try:
+        header = HEADER.unpack_from(buffer, 0) if len(buffer) >= HEADER.size else None
+        return surface_from(buffer, header, source_stat)
+    finally:
+        buffer.close()
+
+
+def surface_from(buffer, header, source_stat):
+    """Convert a mapped entry's pixels, or None if the header doesn't match the source"""
+    if header is None:
+        return None
+    magic, version, compressed, width, height, mtime_ns, size, fmt = header
+    if (magic != MAGIC or version != VERSION
+            or mtime_ns != source_stat.st_mtime_ns or size != source_stat.st_size):
+        return None
+    fmt = fmt.decode().strip()
+    view = memoryview(buffer)[HEADER.size:]
+    pixels = zlib.decompress(view) if compressed else view
+    try:
+        surface = pygame.image.frombuffer(pixels, (width, height), fmt)
+        # Copies the pixels, so the mapping can be closed afterwards
+        image = surface.convert_alpha() if fmt == "BGRA" else surface.convert()
+        del surface
+    finally:
+        del pixels
+        view.release()
+    return image
+
+
+def write_entry(entry, image, alpha, source_stat):
+    """Store a surface's pixels; failures only cost the next start a decode"""
+    fmt = "BGRA" if alpha else "RGB"
+    pixels = pygame.image.tobytes(image, fmt)
+    compressed = COMPRESS and len(pixels) >= COMPRESS_MIN_BYTES
+    if compressed:
+        pixels = zlib.compress(pixels, 1)
+    header = HEADER.pack(MAGIC, VERSION, int(compressed), image.get_width(), image.get_height(),
+                         source_stat.st_mtime_ns, source_stat.st_size, fmt.ljust(4).encode())
+    temp = f"{entry}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(temp, "wb") as f:
+            f.write(header)
+            f.write(pixels)
+        os.replace(temp, entry)
+        _stats["writes"] += 1
+    except OSError as e:
+        _stats["errors"] += 1
+        if _stats["errors"] == 1:
+            print(f"⚠ Could not write asset cache: {e}")
+        try:
+            os.unlink(temp)
+        except OSError:
+            pass
+
+
+def load_image(path, alpha=True, size=None):
+    """
+    Load an image in display format, from the cache when it is current
+    Args:
+        path: Image file
+        alpha: convert_alpha() (True) or convert() (False)
+        size: Scale to this (width, height) - cached after scaling
+    Needs a display mode to be set, like convert().
+    """
+    size = tuple(size) if size else None
+    if not cache_enabled():
+        return decode(path, alpha, size)
+
+    source_stat = os.stat(path)
+    entry = cache_file(path, alpha, size)
+    image = read_entry(entry, source_stat)
+    if image is not None:
+        _stats["hits"] += 1
+        return image
+
+    _stats["misses"] += 1
+    image = decode(path, alpha, size)
+    write_entry(entry, image, alpha, source_stat)
+    return image
+
+
+def decode(path, alpha, size):
+    image = pygame.image.load(path)
+    image = image.convert_alpha() if alpha else image.convert()
+    if size and image.get_size() != size:
+        image = pygame.transform.scale(image, size)
+    return image
+
+
+def preload(path):
+    """
+    Map every cache entry of a source image and keep the mappings open
+    Used by the zygote before forking: the children read the pixels from
+    the same page-cache pages. Returns the number of entries mapped.
+    """
+    count = 0
+    for entry in cache_entries(path):
+        if entry in _mapped:
+            continue
+        try:
+            with open(entry, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            continue
+        if len(buffer) < HEADER.size:
+            buffer.close()
+            continue
+        _mapped[entry] = (buffer, HEADER.unpack_from(buffer, 0))
+        count += 1
+    return count
+
+
+def stats():
+    return {**_stats, "mapped": len(_mapped)}
+
+
+def cache_size():
+    """Number of entries and total bytes in the cache directory"""
+    if not cache_enabled() or not os.path.isdir(CACHE_DIR):
+        return 0, 0
+    entries = [entry for entry in os.scandir(CACHE_DIR) if entry.name.endswith(".surf")]
+    return len(entries), sum(entry.stat().st_size for entry in entries)
+
+
+def clear():
+    """Delete every cache entry"""
+    removed = 0
+    if cache_enabled() and os.path.isdir(CACHE_DIR):
+        for entry in os.scandir(CACHE_DIR):
+            if entry.name.endswith(".surf"):
+                os.unlink(entry.path)
+                removed += 1
+    return removed
+
+
+def build():
+    """Fill the cache by loading every game's assets once (headless)"""
+    from game_host import GAMES, load_game_module
+    from render_scale import open_display
+
+    pygame.init()
+    for game in GAMES:
+        module = load_game_module(game)
+        open_display(module.WINDOW_SIZE, 1.0)
+        start = time.perf_counter()
+        module.load_assets()
+        print(f"✓ {game['name']}: {time.perf_counter() - start:.2f} s")
+    pygame.quit()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Decoded-image cache for the arcade games")
+    parser.add_argument("--build", action="store_true", help="Decode every game's images into the cache")
+    parser.add_argument("--clear", action="store_true", help="Delete the cache")
+    args = parser.parse_args()
+
+    if not cache_enabled():
+        print("⚠ The asset cache is disabled (ARCADE_ASSET_CACHE)")
+        return
+    if args.clear:
+        print(f"✓ Removed {clear()} cache entries from {CACHE_DIR}")
+    if args.build:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        if BASE_DIR not in sys.path:
+            sys.path.insert(0, BASE_DIR)
+        build()
+        print(f"Cache: {stats()['writes']} written, {stats()['hits']} already current")
+    count, total = cache_size()
+    print(f"{CACHE_DIR}: {count} entries, {total / (1024 * 1024):.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Shared audio setup for the arcade games
+Pre-initializes the mixer with a small buffer so sound effects play
+promptly, streams background music through pygame.mixer.music instead of
+decoding whole tracks into RAM, and keeps short effects in a bounded cache
+"""
+
+import os
+from collections import OrderedDict
+
+import pygame
+
+FREQUENCY = 44100
+SAMPLE_SIZE = -16
+CHANNELS = 2
+# Samples per mix callback: 512 is ~12 ms at 44.1 kHz (pygame's default of 4096 is ~93 ms)
+BUFFER = int(os.environ.get("ARCADE_AUDIO_BUFFER", "512"))
+MIXER_CHANNELS = 16
+SFX_CACHE_MB = 16
+
+_pre_initialized = False
+
+
+def pre_init(frequency=FREQUENCY, buffer=BUFFER):
+    """Set the mixer parameters; must run before pygame.init()"""
+    global _pre_initialized
+    if not _pre_initialized:
+        pygame.mixer.pre_init(frequency, SAMPLE_SIZE, CHANNELS, buffer)
+        _pre_initialized = True
+
+
+def init():
+    """
+    Make sure the mixer is running
+    Returns:
+        bool: False if there is no usable audio device
+    """
+    pre_init()
+    if not pygame.mixer.get_init():
+        try:
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"⚠ Audio unavailable: {e}")
+            return False
+        pygame.mixer.set_num_channels(MIXER_CHANNELS)
+    return True
+
+
+class SoundCache:
+    """Decoded sound effects, least recently used dropped past max_bytes"""
+
+    def __init__(self, max_bytes=SFX_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.sounds = OrderedDict()  # path -> (Sound, bytes)
+        self.size = 0
+
+    def load(self, path):
+        """Decoded Sound for a file, or None if it can't be loaded"""
+        path = os.path.abspath(path)
+        entry = self.sounds.get(path)
+        if entry is not None:
+            self.sounds.move_to_end(path)
+            return entry[0]
+
+        if not init():
+            return None
+        try:
+            sound = pygame.mixer.Sound(path)
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"⚠ Could not load sound {os.path.basename(path)}: {e}")
+            return None
+
+        frequency, size, channels = pygame.mixer.get_init()
+        nbytes = int(sound.get_length() * frequency * channels * abs(size) // 8)
+        self.sounds[path] = (sound, nbytes)
+        self.size += nbytes
+        while self.size > self.max_bytes and len(self.sounds) > 1:
+            _, (_, evicted) = self.sounds.popitem(last=False)
+            self.size -= evicted
+        return sound
+
+    def clear(self):
+        self.sounds.clear()
+        self.size = 0
+
+
+# Shared by every game running in the process
+sfx_cache = SoundCache()
+
+
+def load_sfx(path):
+    return sfx_cache.load(path)
+
+
+def play_sfx(sound, **kwargs):
+    """Play a sound from load_sfx(); a missing sound is silently skipped"""
+    if sound is not None:
+        return sound.play(**kwargs)
+    return None
+
+
+def play_music(path, loops=-1, volume=None):
+    """
+    Stream a music file from disk (only a small decode buffer is kept in RAM)
+    Returns:
+        bool: True if the music started
+    """
+    if not init():
+        return False
+    try:
+        pygame.mixer.music.load(path)
+    except (pygame.error, FileNotFoundError) as e:
+        print(f"⚠ Could not load music {os.path.basename(path)}: {e}")
+        return False
+    if volume is not None:
+        pygame.mixer.music.set_volume(volume)
+    pygame.mixer.music.play(loops)
+    return True
+
+
+def stop_music():
+    if pygame.mixer.get_init():
+        pygame.mixer.music.stop()
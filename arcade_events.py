@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Local event bus for the arcade
+Detectors publish newline-delimited JSON events on a Unix domain socket and
+the launchers subscribe to them instead of being spawned by the detectors
+"""
+
+import fcntl
+import json
+import os
+import select
+import socket
+import threading
+import time
+
+# Socket the YOLO deposit service publishes on
+DEPOSIT_SOCKET = os.environ.get("ARCADE_DEPOSIT_SOCKET", "/tmp/arcade_deposit.sock")
+
+# Socket the ultrasonic detector daemon publishes presence events on
+PRESENCE_SOCKET = os.environ.get("ARCADE_PRESENCE_SOCKET", "/tmp/arcade_presence.sock")
+
+# Socket the game zygote takes launch requests on
+ZYGOTE_SOCKET = os.environ.get("ARCADE_ZYGOTE_SOCKET", "/tmp/arcade_zygote.sock")
+
+# Socket the arcade supervisor takes state changes on and publishes them
+SUPERVISOR_SOCKET = os.environ.get("ARCADE_SUPERVISOR_SOCKET", "/tmp/arcade_supervisor.sock")
+
+# Unsent bytes kept for a subscriber that reads slowly before it is dropped
+MAX_PENDING = 1024 * 1024  # A telemetry snapshot reply is over 100 KB
+
+
+class EventPublisher:
+    """
+    Unix socket server that broadcasts events to every connected subscriber
+
+    Publishing never blocks the caller: what a socket doesn't take at once
+    is queued and written by the server thread when the socket is writable,
+    and subscribers that stop reading are dropped instead of stalling the
+    detection loop. Sends go through the lock, so lines never interleave.
+    """
+
+    def __init__(self, socket_path, on_request=None):
+        self.socket_path = socket_path
+        self.on_request = on_request  # Optional handler for lines sent by clients
+        self.server = None
+        self.clients = []
+        self.pending = {}  # client -> bytes not yet written
+        self.lock = threading.Lock()
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        """Bind the socket and start accepting subscribers"""
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.socket_path)
+        self.server.listen(8)
+        self.running = True
+
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+        print(f"✓ Publishing events on {self.socket_path}")
+
+    def _serve(self):
+        buffers = {}
+        while self.running:
+            with self.lock:
+                readable = [self.server] + self.clients
+                writable = list(self.pending)
+            try:
+                ready, ready_to_write, _ = select.select(readable, writable, [], 0.5)
+            except (OSError, ValueError):
+                continue
+
+            for sock in ready_to_write:
+                self._flush(sock)
+
+            for sock in ready:
+                if sock is self.server:
+                    try:
+                        client, _ = self.server.accept()
+                    except OSError:
+                        continue
+                    client.setblocking(False)
+                    with self.lock:
+                        self.clients.append(client)
+                    buffers[client] = b""
+                    continue
+
+                # Subscribers may send requests (one JSON object per line)
+                try:
+                    data = sock.recv(4096)
+                except OSError:
+                    data = b""
+                if not data:
+                    buffers.pop(sock, None)
+                    self._drop(sock)
+                    continue
+
+                buffers[sock] = buffers.get(sock, b"") + data
+                while b"\n" in buffers[sock]:
+                    line, buffers[sock] = buffers[sock].split(b"\n", 1)
+                    self._handle_request(sock, line)
+
+    def _handle_request(self, sock, line):
+        if not self.on_request:
+            return
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return
+        if not isinstance(request, dict):
+            return
+        try:
+            reply = self.on_request(request)
+        except Exception as e:
+            # A bad request must not take the server thread down
+            print(f"⚠ Request {request.get('cmd')!r} failed: {e}")
+            return
+        if reply is not None:
+            self._send(sock, {"type": "reply", **reply})
+
+    def publish(self, event_type, **data):
+        """Broadcast an event to all subscribers"""
+        event = {"type": event_type, "time": time.time(), **data}
+        with self.lock:
+            clients = list(self.clients)
+        for client in clients:
+            self._send(client, event)
+        return event
+
+    def _send(self, client, message):
+        payload = (json.dumps(message) + "\n").encode()
+        with self.lock:
+            if client not in self.clients:
+                return
+            pending = self.pending.get(client)
+            if pending is not None:
+                # Earlier bytes are still queued: keep the order
+                pending += payload
+                ok = len(pending) <= MAX_PENDING
+            else:
+                ok = self._write(client, payload)
+        if not ok:
+            self._drop(client)
+
+    def _flush(self, client):
+        with self.lock:
+            pending = self.pending.pop(client, None)
+            ok = pending is None or self._write(client, bytes(pending))
+        if not ok:
+            self._drop(client)
+
+    def _write(self, client, payload):
+        """Write what the socket takes and queue the rest (call with the lock held)"""
+        try:
+            sent = client.send(payload)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            return False
+        if sent < len(payload):
+            self.pending[client] = bytearray(payload[sent:])
+        return True
+
+    def _drop(self, client):
+        with self.lock:
+            self.pending.pop(client, None)
+            if client in self.clients:
+                self.clients.remove(client)
+        try:
+            client.close()
+        except OSError:
+            pass
+
+    def subscriber_count(self):
+        with self.lock:
+            return len(self.clients)
+
+    def close(self):
+        """Stop the server and remove the socket file"""
+        self.running = False
+        with self.lock:
+            clients, self.clients = self.clients, []
+            self.pending.clear()
+        for client in clients:
+            try:
+                client.close()
+            except OSError:
+                pass
+        if self.server:
+            self.server.close()
+            self.server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class EventSubscriber:
+    """
+    Background subscriber that calls a callback for every event received
+
+    Reconnects automatically, so launchers can start before the detector.
+    The callback runs on the subscriber thread - GUI code should hand it
+    over to its own thread (e.g. with a Qt signal).
+    """
+
+    def __init__(self, socket_path, callback, reconnect_delay=2.0):
+        self.socket_path = socket_path
+        self.callback = callback
+        self.reconnect_delay = reconnect_delay
+        self.running = False
+        self.sock = None
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._listen, daemon=True)
+        self.thread.start()
+        return self
+
+    def _listen(self):
+        while self.running:
+            try:
+                self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.sock.connect(self.socket_path)
+                for event in read_events(self.sock):
+                    if not self.running:
+                        break
+                    self.callback(event)
+            except OSError:
+                pass
+            finally:
+                if self.sock:
+                    self.sock.close()
+                    self.sock = None
+
+            if self.running:
+                time.sleep(self.reconnect_delay)
+
+    def stop(self):
+        self.running = False
+        if self.sock:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+def read_events(sock):
+    """Yield decoded JSON events from a connected socket until it closes"""
+    buffer = b""
+    while True:
+        data = sock.recv(4096)
+        if not data:
+            return
+        buffer += data
+        while b"\n" in buffer:
+            line, buffer = buffer.split(b"\n", 1)
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def service_available(socket_path):
+    """True if a publisher is listening on the socket"""
+    if not os.path.exists(socket_path):
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(0.5)
+            sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+
+
+def request(socket_path, message, timeout=2.0):
+    """Send a request to a publisher and return its first reply (or None)"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            sock.sendall((json.dumps(message) + "\n").encode())
+            for event in read_events(sock):
+                if event.get("type") == "reply":
+                    return event
+    except OSError:
+        return None
+    return None
+
+
+def acquire_instance_lock(path):
+    """
+    Take a single-instance lock (flock on path)
+    Returns the open lock file, holding our PID - keep it open for the
+    lock's lifetime - or None if another process holds it.
+    """
+    lock_file = open(path, "a+")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    lock_file.seek(0)
+    lock_file.truncate()
+    lock_file.write(str(os.getpid()))
+    lock_file.flush()
+    return lock_file
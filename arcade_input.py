@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Event-driven input state shared by the arcade games
+Keyboard, mouse and joystick events are folded into one cached state as
+the game loop reads them, with the stick deadzone applied once, so games
+query held keys, axes and buttons without polling devices every frame.
+Controllers are opened and closed from JOYDEVICEADDED/REMOVED events
+instead of re-enumerating every joystick. Input events are timestamped
+to measure how long they take to reach the screen.
+"""
+
+import time
+
+import pygame
+
+from frame_profiler import PhaseStats
+
+DEADZONE = 0.2
+LATENCY_SAMPLES = 240
+
+# Events that count as player input for the latency measurement
+ACTION_EVENTS = (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.JOYBUTTONDOWN, pygame.JOYHATMOTION)
+
+
+class InputState:
+    """Held keys, mouse and controller state, updated from events"""
+
+    def __init__(self, deadzone=DEADZONE):
+        self.deadzone = deadzone
+        self.virtual = False     # Replaying a recording: controllers aren't opened
+        self.joysticks = {}      # instance_id -> Joystick
+        self.keys = set()
+        self.mouse = (0, 0)
+        self.mouse_buttons = set()
+        self.axes = {}           # (instance_id, axis) -> value, 0.0 inside the deadzone
+        self.hats = {}           # (instance_id, hat) -> (x, y)
+        self.buttons = set()     # (instance_id, button) held
+        self.pressed = set()     # Buttons pressed this frame, across controllers
+        self.event_time = None   # When the frame's first action event was read
+        self.last_event_time = None
+        self.latency = PhaseStats(LATENCY_SAMPLES)
+
+    def reset(self):
+        """Start a run: drop held input and open the controllers already plugged in"""
+        self.keys.clear()
+        self.mouse_buttons.clear()
+        self.axes.clear()
+        self.hats.clear()
+        self.buttons.clear()
+        self.pressed.clear()
+        self.event_time = None
+        self.mouse = pygame.mouse.get_pos()
+        if not pygame.joystick.get_init():
+            pygame.joystick.init()
+        for index in range(pygame.joystick.get_count()):
+            self.open_joystick(index)
+
+    def open_joystick(self, index):
+        if self.virtual:
+            self.joysticks[index] = None
+            return None
+        try:
+            joystick = pygame.joystick.Joystick(index)
+            joystick.init()
+        except pygame.error as e:
+            print(f"⚠ Could not open controller {index}: {e}")
+            return None
+        if joystick.get_instance_id() not in self.joysticks:
+            self.joysticks[joystick.get_instance_id()] = joystick
+            print(f"✓ Controller connected: {joystick.get_name()}")
+        return joystick
+
+    def close_joystick(self, instance_id):
+        known = self.joysticks.pop(instance_id, None) is not None
+        self.axes = {key: value for key, value in self.axes.items() if key[0] != instance_id}
+        self.hats = {key: value for key, value in self.hats.items() if key[0] != instance_id}
+        self.buttons = {key for key in self.buttons if key[0] != instance_id}
+        if known:
+            print("⚠ Controller disconnected")
+
+    def begin_frame(self):
+        """
+        Call at the top of each frame, before reading events
+        The previous frame has been presented by now, so this closes the
+        latency sample of the input it handled.
+        """
+        if self.event_time is not None:
+            self.latency.add((time.perf_counter() - self.event_time) * 1000)
+            self.event_time = None
+        self.pressed.clear()
+
+    def handle_event(self, event):
+        """
+        Fold one event into the state
+        Returns:
+            bool: True for controller hot-plug events, which need no further handling
+        """
+        event_type = event.type
+        if event_type in ACTION_EVENTS:
+            now = time.perf_counter()
+            self.last_event_time = now
+            if self.event_time is None:
+                self.event_time = now
+
+        if event_type == pygame.KEYDOWN:
+            self.keys.add(event.key)
+        elif event_type == pygame.KEYUP:
+            self.keys.discard(event.key)
+        elif event_type == pygame.MOUSEMOTION:
+            self.mouse = event.pos
+        elif event_type == pygame.MOUSEBUTTONDOWN:
+            self.mouse_buttons.add(event.button)
+        elif event_type == pygame.MOUSEBUTTONUP:
+            self.mouse_buttons.discard(event.button)
+        elif event_type == pygame.JOYAXISMOTION:
+            value = event.value if abs(event.value) > self.deadzone else 0.0
+            self.axes[(event.instance_id, event.axis)] = value
+        elif event_type == pygame.JOYHATMOTION:
+            self.hats[(event.instance_id, event.hat)] = event.value
+        elif event_type == pygame.JOYBUTTONDOWN:
+            self.buttons.add((event.instance_id, event.button))
+            self.pressed.add(event.button)
+        elif event_type == pygame.JOYBUTTONUP:
+            self.buttons.discard((event.instance_id, event.button))
+        elif event_type == pygame.JOYDEVICEADDED:
+            self.open_joystick(event.device_index)
+            return True
+        elif event_type == pygame.JOYDEVICEREMOVED:
+            self.close_joystick(event.instance_id)
+            return True
+        elif event_type == pygame.WINDOWFOCUSLOST:
+            # Key-up events are lost while another window has focus
+            self.keys.clear()
+            self.mouse_buttons.clear()
+        return False
+
+    @property
+    def has_controller(self):
+        return bool(self.joysticks)
+
+    def key(self, key):
+        return key in self.keys
+
+    def mouse_button(self, button=1):
+        return button in self.mouse_buttons
+
+    def axis(self, axis):
+        """Strongest value of an axis across controllers (0.0 inside the deadzone)"""
+        value = 0.0
+        for (_, index), current in self.axes.items():
+            if index == axis and abs(current) > abs(value):
+                value = current
+        return value
+
+    def hat(self, hat=0):
+        """First non-centred hat position across controllers"""
+        for (_, index), value in self.hats.items():
+            if index == hat and value != (0, 0):
+                return value
+        return (0, 0)
+
+    def button(self, button):
+        """Whether a button is held on any controller"""
+        return any(index == button for _, index in self.buttons)
+
+    def button_pressed(self, button):
+        """Whether a button went down on any controller this frame"""
+        return button in self.pressed
+
+    def latency_summary(self):
+        """Event read to next frame start, i.e. to presentation (ms)"""
+        return {"mean": round(self.latency.mean, 3), "p95": round(self.latency.percentile(0.95), 3),
+                "samples": len(self.latency.samples)}
+
+
+# Shared by every game running in the process
+input_state = InputState()
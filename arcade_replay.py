@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Input recording and deterministic replay for the arcade games
+A recording logs everything a game run takes from the outside world, in
+the order the game asks for it: the events it reads (input, timers, quit),
+what Clock.tick() and get_ticks() return, and the controller count and
+mouse position at the start. With the RNG seed from the file header,
+replaying that log makes the game play out exactly as it did, as fast as
+the machine allows, so a session recorded on a cabinet can be profiled on
+a dev box.
+
+Recording: ARCADE_RECORD=<directory> (or run(..., record=path))
+Replay:    python arcade_replay.py <file> [--profile out.prof]
+"""
+
+import argparse
+import gzip
+import os
+import random
+import struct
+import sys
+import time
+from contextlib import contextmanager
+
+import pygame
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MAGIC = b"ARCR"
+VERSION = 1
+RECORD_DIR = os.environ.get("ARCADE_RECORD")
+MAX_RECORDINGS = 20  # Oldest recordings in RECORD_DIR are deleted past this
+
+# Shared by the games for everything random, so a seed reproduces a run
+rng = random.Random()
+
+HEADER = struct.Struct("<4sHQd")  # magic, version, seed, start time
+U8 = struct.Struct("<B")
+U16 = struct.Struct("<H")
+U32 = struct.Struct("<I")
+F64 = struct.Struct("<d")
+POS = struct.Struct("<hh")
+
+# Record tags, one per logged call (LEVEL: a quality governor lever change)
+EVENTS, TICK, TICKS, JOYSTICKS, MOUSE, LEVEL = b"E", b"T", b"G", b"C", b"M", b"Q"
+
+# The Recorder or Replayer of the run in progress
+active = None
+
+# Per event type: payload layout and attribute names
+EVENT_FIELDS = {
+    pygame.KEYDOWN: (struct.Struct("<iH"), ("key", "mod")),
+    pygame.KEYUP: (struct.Struct("<iH"), ("key", "mod")),
+    pygame.MOUSEMOTION: (POS, ("pos",)),
+    pygame.MOUSEBUTTONDOWN: (struct.Struct("<Bhh"), ("button", "pos")),
+    pygame.MOUSEBUTTONUP: (struct.Struct("<Bhh"), ("button", "pos")),
+    pygame.JOYAXISMOTION: (struct.Struct("<hBf"), ("instance_id", "axis", "value")),
+    pygame.JOYHATMOTION: (struct.Struct("<hBbb"), ("instance_id", "hat", "value")),
+    pygame.JOYBUTTONDOWN: (struct.Struct("<hB"), ("instance_id", "button")),
+    pygame.JOYBUTTONUP: (struct.Struct("<hB"), ("instance_id", "button")),
+    pygame.JOYDEVICEADDED: (struct.Struct("<h"), ("device_index",)),
+    pygame.JOYDEVICEREMOVED: (struct.Struct("<h"), ("instance_id",)),
+}
+# Events without a payload that still matter to the games (timers are >= USEREVENT)
+BARE_EVENTS = {pygame.QUIT, pygame.WINDOWFOCUSLOST}
+
+
+class ReplayDesync(Exception):
+    """The game asked for something other than what the recording has next"""
+
+
+def encode_event(event):
+    fields = EVENT_FIELDS.get(event.type)
+    if fields is None:
+        return U32.pack(event.type)
+    layout, names = fields
+    values = []
+    for name in names:
+        value = getattr(event, name)
+        values.extend(value if isinstance(value, tuple) else (value,))
+    return U32.pack(event.type) + layout.pack(*values)
+
+
+def recorded(event):
+    return event.type in EVENT_FIELDS or event.type in BARE_EVENTS or event.type >= pygame.USEREVENT
+
+
+class Recorder:
+    """Logs the game's calls into pygame for one run"""
+
+    replaying = False
+
+    def __init__(self, path, game, seed):
+        self.path = path
+        self.file = gzip.open(path, "wb")
+        name = game.encode()
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, time.time()) + U8.pack(len(name)) + name)
+        self.originals = {}
+        self.frames = 0
+
+    def install(self):
+        recorder = self
+        original_get = pygame.event.get
+        original_ticks = pygame.time.get_ticks
+        original_clock = pygame.time.Clock
+
+        class RecordingClock:
+            def __init__(self):
+                self.clock = original_clock()
+
+            def tick(self, framerate=0):
+                ms = self.clock.tick(framerate)
+                recorder.write(TICK, F64.pack(ms))
+                recorder.frames += 1
+                return ms
+
+            def get_fps(self):
+                return self.clock.get_fps()
+
+        def get(*args, **kwargs):
+            events = original_get(*args, **kwargs)
+            payload = [encode_event(event) for event in events if recorded(event)]
+            recorder.write(EVENTS, U16.pack(len(payload)) + b"".join(payload))
+            return events
+
+        def get_ticks():
+            ticks = original_ticks()
+            recorder.write(TICKS, U32.pack(ticks))
+            return ticks
+
+        self.patch(pygame.event, "get", get)
+        self.patch(pygame.time, "get_ticks", get_ticks)
+        self.patch(pygame.time, "Clock", RecordingClock)
+        self.write(JOYSTICKS, U16.pack(pygame.joystick.get_count()))
+        self.write(MOUSE, POS.pack(*pygame.mouse.get_pos()))
+
+    def patch(self, module, name, value):
+        self.originals[(module, name)] = getattr(module, name)
+        setattr(module, name, value)
+
+    def write(self, tag, payload):
+        self.file.write(tag + payload)
+
+    def level(self, name, level):
+        """Log a governor lever level and return it"""
+        name = name.encode()
+        self.write(LEVEL, U8.pack(len(name)) + name + U8.pack(level))
+        return level
+
+    def close(self):
+        for (module, name), value in self.originals.items():
+            setattr(module, name, value)
+        self.originals = {}
+        self.file.close()
+
+
+class Replayer:
+    """Feeds a recording back to the game in place of pygame's clock and event queue"""
+
+    replaying = True
+
+    def __init__(self, path):
+        self.path = path
+        with gzip.open(path, "rb") as f:
+            self.data = f.read()
+        magic, version, self.seed, self.started = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not an arcade recording (version {VERSION})")
+        offset = HEADER.size
+        length = self.data[offset]
+        self.game = self.data[offset + 1:offset + 1 + length].decode()
+        self.offset = offset + 1 + length
+        self.originals = {}
+        self.frames = 0
+        self.last_tick = 0.0
+        self.last_ticks = 0
+
+    @property
+    def finished(self):
+        return self.offset >= len(self.data)
+
+    def next(self, tag):
+        """Payload offset of the next record, which must have this tag (None at the end)"""
+        if self.finished:
+            return None
+        found = self.data[self.offset:self.offset + 1]
+        if found != tag:
+            raise ReplayDesync(f"frame {self.frames}: game asked for {tag!r}, recording has {found!r}")
+        self.offset += 1
+        return self.offset
+
+    def read_events(self):
+        start = self.next(EVENTS)
+        if start is None:
+            return [pygame.event.Event(pygame.QUIT)]
+        count, = U16.unpack_from(self.data, start)
+        offset = start + U16.size
+        events = []
+        for _ in range(count):
+            event_type, = U32.unpack_from(self.data, offset)
+            offset += U32.size
+            fields = EVENT_FIELDS.get(event_type)
+            if fields is None:
+                events.append(pygame.event.Event(event_type))
+                continue
+            layout, names = fields
+            values = layout.unpack_from(self.data, offset)
+            offset += layout.size
+            attributes = {}
+            index = 0
+            for name in names:
+                if name in ("pos", "value") and event_type != pygame.JOYAXISMOTION:
+                    attributes[name] = values[index:index + 2]
+                    index += 2
+                else:
+                    attributes[name] = values[index]
+                    index += 1
+            if event_type in (pygame.KEYDOWN, pygame.KEYUP):
+                attributes.update(scancode=0, unicode="")
+            events.append(pygame.event.Event(event_type, attributes))
+        self.offset = offset
+        return events
+
+    def level(self, name, level):
+        """The lever level the recording has at this point"""
+        start = self.next(LEVEL)
+        if start is None:
+            return level
+        length = self.data[start]
+        recorded_name = self.data[start + 1:start + 1 + length].decode()
+        if recorded_name != name:
+            raise ReplayDesync(f"frame {self.frames}: lever {name}, recording has {recorded_name}")
+        self.offset = start + 1 + length + U8.size
+        return self.data[start + 1 + length]
+
+    def pending_levels(self):
+        """Lever changes the governor made at this point of the recording"""
+        changes = []
+        while self.data[self.offset:self.offset + 1] == LEVEL:
+            length = self.data[self.offset + 1]
+            name = self.data[self.offset + 2:self.offset + 2 + length].decode()
+            changes.append((name, self.level(name, 0)))
+        return changes
+
+    def count_frames(self):
+        """Frames in the recording (walks every record)"""
+        offset, frames = self.offset, 0
+        sizes = {TICK: F64.size, TICKS: U32.size, JOYSTICKS: U16.size, MOUSE: POS.size}
+        while offset < len(self.data):
+            tag = self.data[offset:offset + 1]
+            offset += 1
+            if tag == TICK:
+                frames += 1
+            if tag in sizes:
+                offset += sizes[tag]
+            elif tag == LEVEL:
+                offset += 1 + self.data[offset] + U8.size
+            elif tag == EVENTS:
+                count, = U16.unpack_from(self.data, offset)
+                offset += U16.size
+                for _ in range(count):
+                    event_type, = U32.unpack_from(self.data, offset)
+                    fields = EVENT_FIELDS.get(event_type)
+                    offset += U32.size + (fields[0].size if fields else 0)
+            else:
+                raise ValueError(f"corrupt recording at byte {offset - 1}")
+        return frames
+
+    def read(self, tag, layout, default):
+        start = self.next(tag)
+        if start is None:
+            return default
+        self.offset = start + layout.size
+        return layout.unpack_from(self.data, start)
+
+    def install(self):
+        replayer = self
+
+        class ReplayClock:
+            def tick(self, framerate=0):
+                replayer.last_tick, = replayer.read(TICK, F64, (replayer.last_tick,))
+                replayer.frames += 1
+                return replayer.last_tick
+
+            def get_fps(self):
+                return 1000 / replayer.last_tick if replayer.last_tick else 0.0
+
+        def get_ticks():
+            replayer.last_ticks, = replayer.read(TICKS, U32, (replayer.last_ticks,))
+            return replayer.last_ticks
+
+        self.patch(pygame.event, "get", lambda *args, **kwargs: self.read_events())
+        self.patch(pygame.time, "get_ticks", get_ticks)
+        self.patch(pygame.time, "Clock", ReplayClock)
+        # Timer events are in the recording; nothing waits for real time
+        self.patch(pygame.time, "set_timer", lambda *args, **kwargs: None)
+        self.patch(pygame.time, "wait", lambda ms: 0)
+        self.patch(pygame.time, "delay", lambda ms: 0)
+
+        count, = self.read(JOYSTICKS, U16, (0,))
+        mouse = self.read(MOUSE, POS, (0, 0))
+        self.patch(pygame.joystick, "get_count", lambda: count)
+        self.patch(pygame.mouse, "get_pos", lambda: mouse)
+
+    def patch(self, module, name, value):
+        self.originals[(module, name)] = getattr(module, name)
+        setattr(module, name, value)
+
+    def close(self):
+        for (module, name), value in self.originals.items():
+            setattr(module, name, value)
+        self.originals = {}
+
+
+def recording_path(game, directory=None):
+    """New recording file for a game in the recordings directory, pruning old ones"""
+    directory = directory or RECORD_DIR
+    os.makedirs(directory, exist_ok=True)
+    existing = sorted((entry for entry in os.scandir(directory) if entry.name.endswith(".arcrec")),
+                      key=lambda entry: entry.stat().st_mtime)
+    for entry in existing[:max(0, len(existing) - MAX_RECORDINGS + 1)]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+    stem = os.path.join(directory, f"{game}_{time.strftime('%Y%m%d_%H%M%S')}")
+    path, number = f"{stem}.arcrec", 1
+    while os.path.exists(path):
+        number += 1
+        path = f"{stem}_{number}.arcrec"
+    return path
+
+
+@contextmanager
+def game_session(game, options):
+    """
+    Wrap one game run: seed the shared RNG and record or replay it
+    Options (all optional): seed, record (file path), replay (file path or
+    Replayer). ARCADE_RECORD turns recording on for every run.
+    """
+    global active
+    replay = options.get("replay")
+    if isinstance(replay, str):
+        replay = Replayer(replay)
+    if replay is not None:
+        if replay.game != game:
+            raise ValueError(f"recording is for {replay.game}, not {game}")
+        rng.seed(replay.seed)
+        from arcade_input import input_state
+        input_state.virtual = True
+        replay.install()
+        active = replay
+        try:
+            yield replay
+        finally:
+            active = None
+            replay.close()
+            input_state.virtual = False
+        return
+
+    seed = options.get("seed")
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(63)
+    rng.seed(seed)
+
+    path = options.get("record") or (recording_path(game) if RECORD_DIR else None)
+    if path is None:
+        yield None
+        return
+    try:
+        recorder = Recorder(path, game, seed)
+    except OSError as e:
+        print(f"⚠ Could not start recording: {e}")
+        yield None
+        return
+    recorder.install()
+    active = recorder
+    try:
+        yield recorder
+    finally:
+        active = None
+        recorder.close()
+        print(f"✓ Recorded {recorder.frames} frames to: {path}")
+
+
+def sync_level(name, level):
+    """
+    A governor lever level, made reproducible
+    While recording the level is logged; while replaying the recorded one
+    is returned instead.
+    """
+    return active.level(name, level) if active is not None else level
+
+
+def replay_file(path, profile=None, render_scale=None):
+    """Run a recording through its game (in this process) and return the result"""
+    from arcade_audio import pre_init
+    from game_host import find_game, load_game_module
+    from render_scale import open_display
+
+    replay = Replayer(path)
+    game = find_game(replay.game)
+    if game is None:
+        raise ValueError(f"unknown game in recording: {replay.game}")
+    module = load_game_module(game)
+    pre_init()
+    pygame.init()
+    screen = open_display(module.WINDOW_SIZE, render_scale)
+    assets = module.load_assets()
+
+    start = time.perf_counter()
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        result = profiler.runcall(module.run, screen, assets, replay=replay)
+        profiler.dump_stats(profile)
+        print(f"✓ Profile written to: {profile}")
+    else:
+        result = module.run(screen, assets, replay=replay)
+    elapsed = time.perf_counter() - start
+    pygame.quit()
+
+    print(f"✓ Replayed {replay.frames} frames of {replay.game} in {elapsed:.2f} s "
+          f"({replay.frames / elapsed if elapsed else 0:.0f} FPS)")
+    if not replay.finished:
+        print("⚠ The game ended before the recording did - the replay diverged")
+    return result
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Replay a recorded arcade game session")
+    parser.add_argument("recording", help="Recording file (.arcrec)")
+    parser.add_argument("--profile", default=None, help="Write cProfile stats to this file")
+    parser.add_argument("--render-scale", type=float, default=None, help="Render scale for the replay")
+    parser.add_argument("--headless", action="store_true", help="Use SDL's dummy video and audio drivers")
+    parser.add_argument("--info", action="store_true", help="Only print the recording's header")
+    args = parser.parse_args()
+
+    if args.info:
+        replay = Replayer(args.recording)
+        recorded_at = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(replay.started))
+        print(f"{replay.game} | seed {replay.seed} | recorded {recorded_at} | "
+              f"{replay.count_frames()} frames | {os.path.getsize(args.recording) / 1024:.1f} KB")
+        return
+
+    if args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+    if BASE_DIR not in sys.path:
+        sys.path.insert(0, BASE_DIR)
+    try:
+        result = replay_file(args.recording, args.profile, args.render_scale)
+    except ReplayDesync as e:
+        print(f"❌ Replay diverged: {e}")
+        sys.exit(1)
+    print(f"Result: {result.get('reason')} (score {result.get('score')})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""
+Arcade supervisor
+Owns every arcade process (detector, game zygote, start screen, launcher
+and games) and moves between them with an explicit state machine:
+
+    attract -> token_detected -> menu -> in_game -> game_over -> attract
+
+Crashed components are restarted with exponential backoff, children run
+under memory and CPU limits, and the time spent in each state is recorded.
+"""
+
+import argparse
+import collections
+import json
+import os
+import queue
+import signal
+import subprocess
+import sys
+import time
+
+from arcade_events import (SUPERVISOR_SOCKET, ZYGOTE_SOCKET, EventPublisher, acquire_instance_lock,
+                           request, service_available)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOCK_FILE = os.environ.get("ARCADE_SUPERVISOR_LOCK", "/tmp/arcade_supervisor.lock")
+STATS_FILE = os.environ.get("ARCADE_SUPERVISOR_STATS", "/tmp/arcade_supervisor_stats.json")
+
+# Set for every supervised child. Programs that would otherwise start the
+# next program themselves notify the supervisor instead.
+SUPERVISED_ENV = "ARCADE_SUPERVISED"
+
+# States
+ATTRACT = "attract"
+TOKEN_DETECTED = "token_detected"
+MENU = "menu"
+IN_GAME = "in_game"
+GAME_OVER = "game_over"
+STATES = [ATTRACT, TOKEN_DETECTED, MENU, IN_GAME, GAME_OVER]
+
+# Restart backoff
+BACKOFF_START = 1.0
+BACKOFF_MAX = 60.0
+STABLE_AFTER = 60.0  # Seconds a component must run before its failures are forgotten
+MAX_MENU_FAILURES = 3  # Give up on the launcher and go back to the start screen
+
+TICK = 0.25
+STOP_TIMEOUT = 3.0
+MENU_TIMEOUT = 120  # Seconds before an unused launcher returns to the start screen
+MEMORY_CHECK_INTERVAL = 2.0
+
+
+
+def split_cpus():
+    """
+    CPUs for the detectors and for the games and menus
+    The detectors get the first half of the cores and the UI the rest
+    (0-1 and 2-3 on a Pi 4), so YOLO inference can't take the cores the
+    game loop runs on. With a single core there is nothing to split.
+    """
+    try:
+        cpus = sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return None, None
+    if len(cpus) < 2:
+        return None, None
+    half = len(cpus) // 2
+    return cpus[:half], cpus[half:]
+
+
+DETECTOR_CPUS, UI_CPUS = split_cpus()
+
+# Per-child limits. memory_mb is enforced on the proportional set size (the
+# child is restarted when it grows past it), so pages a game shares with the
+# zygote are only counted once. cpus (CPU affinity) caps each child at its
+# half of the cores; nice keeps the deposit detector behind the others there.
+LIMITS = {
+    "detector": {"memory_mb": 128, "nice": 0, "cpus": DETECTOR_CPUS},
+    "deposit": {"memory_mb": 1024, "nice": 10, "cpus": DETECTOR_CPUS},
+    "zygote": {"memory_mb": 512, "nice": 0, "cpus": UI_CPUS},
+    "attract": {"memory_mb": 400, "nice": 0, "cpus": UI_CPUS},
+    "menu": {"memory_mb": 400, "nice": 0, "cpus": UI_CPUS},
+    "game": {"memory_mb": 600, "nice": 0, "cpus": UI_CPUS},
+}
+
+
+def is_supervised():
+    """True when this process was started by the supervisor"""
+    return os.environ.get(SUPERVISED_ENV) == "1"
+
+
+def notify_supervisor(cmd, **data):
+    """Report a state change ("token", "launch") to the supervisor; returns its reply"""
+    return request(SUPERVISOR_SOCKET, {"cmd": cmd, **data})
+
+
+def apply_limits(pid, limits):
+    """Apply the CPU limits to a running process"""
+    if not limits:
+        return
+    if "nice" in limits:
+        try:
+            os.setpriority(os.PRIO_PROCESS, pid, limits["nice"])
+        except OSError:
+            pass  # Raising priority needs root
+    if limits.get("cpus"):
+        try:
+            os.sched_setaffinity(pid, limits["cpus"])
+        except (OSError, AttributeError) as e:
+            print(f"⚠ Could not set the CPU affinity of pid {pid}: {e}")
+
+
+def process_alive(pid):
+    # Unreaped zombies still count - the parent has not collected the exit code yet
+    return os.path.exists(f"/proc/{pid}")
+
+
+def rss_mb(pid):
+    """Resident set size of a process in MB, or None if it is gone"""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def pss_mb(pid):
+    """
+    Proportional set size of a process in MB, or None if it is gone
+    Shared pages are split between the processes mapping them, so a child
+    forked from the zygote isn't charged for the copy-on-write pages it
+    still shares. Falls back to the RSS on kernels without smaps_rollup.
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return rss_mb(pid)
+
+
+class Component:
+    """A supervised child process, restarted with backoff when it dies"""
+
+    def __init__(self, name, command, limits=None):
+        self.name = name
+        self.command = command
+        self.limits = limits or {}
+        self.process = None
+        self.pid = None
+        self.exit_code_lookup = None
+        self.started_at = None
+        self.next_start = 0.0
+        self.failures = 0
+        self.restarts = 0
+        self.last_exit = None
+
+    @property
+    def running(self):
+        return self.pid is not None
+
+    def start(self, now):
+        env = dict(os.environ, **{SUPERVISED_ENV: "1"})
+        self.process = subprocess.Popen(self.command, cwd=BASE_DIR, env=env)
+        self.pid = self.process.pid
+        self.exit_code_lookup = None
+        self.started_at = now
+        apply_limits(self.pid, self.limits)
+        print(f"✓ Started {self.name} (pid {self.pid})")
+
+    def adopt(self, pid, now, exit_code_lookup=None):
+        """Track a process that is not our child (a game forked by the zygote)"""
+        self.process = None
+        self.pid = pid
+        self.exit_code_lookup = exit_code_lookup
+        self.started_at = now
+        apply_limits(pid, self.limits)
+        print(f"✓ Tracking {self.name} (pid {pid})")
+
+    def poll(self):
+        """Return the exit code once the process has ended (None while running)"""
+        if self.pid is None:
+            return None
+        if self.process:
+            code = self.process.poll()
+        elif process_alive(self.pid):
+            code = None
+        else:
+            code = self.exit_code_lookup(self.pid) if self.exit_code_lookup else None
+            code = 0 if code is None else code
+
+        if code is not None:
+            self.pid = None
+            self.process = None
+            self.last_exit = code
+        return code
+
+    def stop(self):
+        """Terminate the process, killing it if it doesn't exit in time"""
+        if self.pid is None:
+            return
+        pid = self.pid
+        try:
+            os.kill(pid, signal.SIGTERM)
+            deadline = time.monotonic() + STOP_TIMEOUT
+            while time.monotonic() < deadline and self.poll() is None:
+                time.sleep(0.05)
+            if self.pid is not None:
+                os.kill(pid, signal.SIGKILL)
+                if self.process:
+                    self.process.wait()
+        except (ProcessLookupError, ChildProcessError):
+            pass
+        self.pid = None
+        self.process = None
+
+    def schedule_restart(self, now):
+        """Pick the next start time after a failure; returns the delay"""
+        if self.started_at is not None and now - self.started_at > STABLE_AFTER:
+            self.failures = 0
+        delay = min(BACKOFF_MAX, BACKOFF_START * 2 ** self.failures)
+        self.failures += 1
+        self.restarts += 1
+        self.next_start = now + delay
+        return delay
+
+    def over_memory(self):
+        limit = self.limits.get("memory_mb")
+        if not limit or self.pid is None:
+            return None
+        pss = pss_mb(self.pid)
+        return pss if pss is not None and pss > limit else None
+
+    def status(self):
+        rss = rss_mb(self.pid) if self.pid else None
+        pss = pss_mb(self.pid) if self.pid else None
+        return {
+            "pid": self.pid,
+            "restarts": self.restarts,
+            "last_exit": self.last_exit,
+            "rss_mb": round(rss, 1) if rss is not None else None,
+            "pss_mb": round(pss, 1) if pss is not None else None,
+        }
+
+
+class Supervisor:
+    """State machine that owns the arcade's processes"""
+
+    def __init__(self, attract="app.py", menu="main.py", detector=True, deposit=False,
+                 zygote=True, menu_timeout=MENU_TIMEOUT):
+        python = sys.executable
+        self.services = []
+        if detector:
+            self.services.append(Component("detector", [python, os.path.join(BASE_DIR, "ultrasonic_detector.py"), "--daemon"],
+                                           LIMITS["detector"]))
+        if deposit:
+            self.services.append(Component("deposit", [python, os.path.join(BASE_DIR, "yolo_raspberry_pi.py"), "--headless"],
+                                           LIMITS["deposit"]))
+        self.zygote = None
+        if zygote:
+            self.zygote = Component("zygote", [python, os.path.join(BASE_DIR, "game_zygote.py")], LIMITS["zygote"])
+            self.services.append(self.zygote)
+
+        self.attract = Component("attract", [python, os.path.join(BASE_DIR, attract)], LIMITS["attract"])
+        self.menu = Component("menu", [python, os.path.join(BASE_DIR, menu)], LIMITS["menu"])
+        self.game = None
+        self.menu_timeout = menu_timeout
+
+        self.state = None
+        self.state_entered = None
+        self.state_stats = {state: {"count": 0, "total_s": 0.0, "max_s": 0.0} for state in STATES}
+        self.history = collections.deque(maxlen=200)
+        self.games_played = 0
+        self.game_crashes = 0
+        self.memory_kills = 0
+        self.last_memory_check = 0.0
+
+        self.commands = queue.Queue()
+        self.publisher = EventPublisher(SUPERVISOR_SOCKET, on_request=self.on_request)
+        self.running = False
+
+    def on_request(self, message):
+        """Runs on the publisher thread - hand commands to the main loop"""
+        if message.get("cmd") in ("token", "launch"):
+            self.commands.put(message)
+            return {"ok": True, "state": self.state}
+        return self.status()
+
+    def set_state(self, state, **info):
+        now = time.monotonic()
+        if self.state is not None:
+            duration = now - self.state_entered
+            stats = self.state_stats[self.state]
+            stats["count"] += 1
+            stats["total_s"] += duration
+            stats["max_s"] = max(stats["max_s"], duration)
+            self.history.append({"state": self.state, "duration_s": round(duration, 3),
+                                 "left_at": time.time()})
+            print(f"{self.state} -> {state} ({duration:.2f} s)")
+        self.state = state
+        self.state_entered = now
+        self.publisher.publish("state", state=state, **info)
+
+    def enter_attract(self, now):
+        self.set_state(ATTRACT)
+        self.attract.failures = 0
+        self.attract.start(now)
+
+    def run(self):
+        self.running = True
+        self.publisher.start()
+        now = time.monotonic()
+        for service in self.services:
+            service.start(now)
+        self.enter_attract(now)
+
+        while self.running:
+            try:
+                command = self.commands.get(timeout=TICK)
+            except queue.Empty:
+                command = None
+            now = time.monotonic()
+
+            if command:
+                self.handle_command(command, now)
+            self.check_services(now)
+            self.check_state(now)
+            if now - self.last_memory_check > MEMORY_CHECK_INTERVAL:
+                self.last_memory_check = now
+                self.check_memory()
+
+    def handle_command(self, command, now):
+        cmd = command.get("cmd")
+        if cmd == "token" and self.state == ATTRACT:
+            self.set_state(TOKEN_DETECTED, source=command.get("source"))
+            self.attract.stop()
+            self.set_state(MENU)
+            self.menu.failures = 0
+            self.menu.start(now)
+        elif cmd == "launch" and self.state in (ATTRACT, MENU) and command.get("game"):
+            self.attract.stop()
+            self.menu.stop()
+            self.set_state(IN_GAME, game=command["game"])
+            self.start_game(command["game"], now)
+        else:
+            print(f"⚠ Ignoring {cmd} in state {self.state}")
+
+    def start_game(self, key, now):
+        self.game = Component(f"game:{key}", [sys.executable, os.path.join(BASE_DIR, "game_host.py"),
+                                              "--game", key, "--no-menu"], LIMITS["game"])
+        # Fork from the warm zygote when it is up, otherwise start a game host
+        if self.zygote and service_available(ZYGOTE_SOCKET):
+            reply = request(ZYGOTE_SOCKET, {"cmd": "launch", "game": key, "supervised": True})
+            if reply and reply.get("ok"):
+                self.game.adopt(reply["pid"], now, self.zygote_exit_code)
+        if not self.game.running:
+            self.game.start(now)
+
+    def zygote_exit_code(self, pid):
+        reply = request(ZYGOTE_SOCKET, {"cmd": "status"})
+        if not reply:
+            return None
+        return reply.get("exited", {}).get(str(pid))
+
+    def check_services(self, now):
+        for service in self.services:
+            code = service.poll()
+            if code is not None:
+                delay = service.schedule_restart(now)
+                print(f"❌ {service.name} exited with {code}, restarting in {delay:.0f} s")
+            if not service.running and now >= service.next_start:
+                service.start(now)
+
+    def check_state(self, now):
+        if self.state == ATTRACT:
+            code = self.attract.poll()
+            if code:
+                delay = self.attract.schedule_restart(now)
+                print(f"❌ Start screen exited with {code}, restarting in {delay:.0f} s")
+            if not self.attract.running and now >= self.attract.next_start:
+                self.attract.start(now)
+
+        elif self.state == MENU:
+            code = self.menu.poll()
+            if code == 0:
+                # Launcher closed without picking a game
+                self.enter_attract(now)
+                return
+            if code is not None:
+                delay = self.menu.schedule_restart(now)
+                print(f"❌ Launcher exited with {code}, restarting in {delay:.0f} s")
+                if self.menu.failures >= MAX_MENU_FAILURES:
+                    self.enter_attract(now)
+                    return
+            if self.menu_timeout and now - self.state_entered > self.menu_timeout:
+                print("Launcher idle - returning to start screen")
+                self.menu.stop()
+                self.enter_attract(now)
+                return
+            if not self.menu.running and now >= self.menu.next_start:
+                self.menu.start(now)
+
+        elif self.state == IN_GAME:
+            code = self.game.poll()
+            if code is None:
+                return
+            self.games_played += 1
+            if code != 0:
+                self.game_crashes += 1
+                print(f"❌ {self.game.name} exited with {code}")
+            self.set_state(GAME_OVER, game=self.game.name, exit_code=code)
+            self.write_stats()
+            self.enter_attract(now)
+
+    def check_memory(self):
+        for component in self.services + [self.attract, self.menu, self.game]:
+            if component is None:
+                continue
+            pss = component.over_memory()
+            if pss is not None:
+                self.memory_kills += 1
+                print(f"⚠ {component.name} uses {pss:.0f} MB "
+                      f"(limit {component.limits['memory_mb']} MB) - stopping it")
+                # Counted as a crash (exit code -SIGTERM) and restarted by the checks above
+                try:
+                    os.kill(component.pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+
+    def status(self):
+        return {
+            "pid": os.getpid(),
+            "state": self.state,
+            "state_s": round(time.monotonic() - self.state_entered, 3) if self.state_entered else None,
+            "games_played": self.games_played,
+            "game_crashes": self.game_crashes,
+            "memory_kills": self.memory_kills,
+            "state_stats": {state: {"count": s["count"], "total_s": round(s["total_s"], 3),
+                                    "max_s": round(s["max_s"], 3)}
+                            for state, s in self.state_stats.items()},
+            "components": {c.name: c.status() for c in self.services + [self.attract, self.menu, self.game] if c},
+            "history": list(self.history)[-20:],
+        }
+
+    def write_stats(self, path=STATS_FILE):
+        try:
+            with open(path, "w") as f:
+                json.dump(self.status(), f, indent=2)
+        except OSError as e:
+            print(f"⚠ Could not write stats: {e}")
+
+    def stop(self, *args):
+        self.running = False
+
+    def shutdown(self):
+        for component in [self.game, self.menu, self.attract] + self.services[::-1]:
+            if component:
+                component.stop()
+        self.write_stats()
+        self.publisher.close()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Supervise the arcade detector, launchers and games")
+    parser.add_argument("--attract", default="app.py", help="Start screen script (app.py or appRasp.py)")
+    parser.add_argument("--menu", default="main.py", help="Game launcher script (main.py or main_simple.py)")
+    parser.add_argument("--no-detector", action="store_true", help="Don't run the ultrasonic detector daemon")
+    parser.add_argument("--deposit", action="store_true", help="Also run the headless YOLO deposit service")
+    parser.add_argument("--no-zygote", action="store_true", help="Start games as fresh processes")
+    parser.add_argument("--menu-timeout", type=float, default=MENU_TIMEOUT,
+                        help="Seconds before an unused launcher returns to the start screen (0 = never)")
+    parser.add_argument("--status", action="store_true", help="Print the running supervisor's status")
+    args = parser.parse_args()
+
+    if args.status:
+        reply = request(SUPERVISOR_SOCKET, {"cmd": "status"})
+        print(json.dumps(reply, indent=2) if reply else "❌ Supervisor is not running")
+        return
+
+    lock = acquire_instance_lock(LOCK_FILE)
+    if lock is None:
+        print("Arcade supervisor already running")
+        return
+
+    supervisor = Supervisor(attract=args.attract, menu=args.menu, detector=not args.no_detector,
+                            deposit=args.deposit, zygote=not args.no_zygote,
+                            menu_timeout=args.menu_timeout)
+    signal.signal(signal.SIGTERM, supervisor.stop)
+    signal.signal(signal.SIGINT, supervisor.stop)
+
+    print("Starting arcade supervisor...")
+    try:
+        supervisor.run()
+    finally:
+        supervisor.shutdown()
+        lock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Audio latency and memory benchmark
+For each mixer buffer size, measures sound-effect trigger-to-mix latency:
+the time from Sound.play() until the mix callback has mixed the clip. The
+clip is shorter than one block, so its Channel goes idle in the first
+callback that picks it up. Music start latency (music.play() until
+get_pos() moves, including decoder start-up) is reported separately.
+Also compares decoding the background music into a Sound with streaming it.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import pygame
+
+from arcade_supervisor import rss_mb
+from game_registry import find_game, game_dir
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_BUFFERS = [256, 512, 1024, 2048, 4096]
+TRIGGER_CLIP = os.path.join(BASE_DIR, "TrafficDash", "audio", "collected.wav")
+MUSIC_FILES = [
+    ("TrafficDash", "audio/music.mp3"),
+    ("Cycleforest", "music/time_for_adventure.mp3"),
+]
+FREQUENCY = 44100
+PROBE_SAMPLES = 32  # Length of the sound-effect probe - well under any mix block
+
+
+def summarize(values):
+    """Mean/p50/p95/max of a list of millisecond timings"""
+    ordered = sorted(values)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "mean": round(statistics.fmean(ordered), 3),
+        "p50": round(statistics.median(ordered), 3),
+        "p95": round(ordered[p95_index], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def wait_until(done, start, limit=1.0):
+    """Poll until done() is true; returns the milliseconds since start"""
+    while not done() and time.perf_counter() - start < limit:
+        time.sleep(0.0002)
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_latency(buffer, triggers, clip=TRIGGER_CLIP):
+    """Sound-effect trigger-to-mix latency, play() call cost and music start latency for one buffer size"""
+    pygame.mixer.init(FREQUENCY, -16, 2, buffer)
+    try:
+        pygame.mixer.music.load(clip)
+        # A click shorter than one block: mixed (and its channel freed) in one callback
+        probe = pygame.mixer.Sound(buffer=b"\x00\x10" * 2 * PROBE_SAMPLES)
+        sfx_latencies = []
+        play_costs = []
+        music_latencies = []
+        for i in range(triggers):
+            start = time.perf_counter()
+            channel = probe.play()
+            play_costs.append((time.perf_counter() - start) * 1000)
+            if channel:
+                sfx_latencies.append(wait_until(lambda: not channel.get_busy(), start))
+
+            # Land the next trigger at a random point in the mix period
+            time.sleep(0.005 + (i % 7) * buffer / FREQUENCY / 7)
+
+            start = time.perf_counter()
+            pygame.mixer.music.play()
+            music_latencies.append(wait_until(lambda: pygame.mixer.music.get_pos() > 0, start))
+            pygame.mixer.music.stop()
+            time.sleep(0.005 + (i % 5) * buffer / FREQUENCY / 5)
+        return {
+            "buffer": buffer,
+            "buffer_period_ms": round(buffer / FREQUENCY * 1000, 2),
+            "sfx_latency_ms": summarize(sfx_latencies) if sfx_latencies else None,
+            "play_call_ms": summarize(play_costs),
+            "music_start_ms": summarize(music_latencies),
+        }
+    finally:
+        pygame.mixer.quit()
+
+
+def measure_music(game_key, relative_path):
+    """RSS and load time of music decoded as a Sound versus streamed"""
+    path = os.path.join(game_dir(find_game(game_key)), relative_path)
+    pygame.mixer.init(FREQUENCY, -16, 2, 512)
+    try:
+        before = rss_mb(os.getpid())
+        start = time.perf_counter()
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.play()
+        stream_time = time.perf_counter() - start
+        stream_mb = rss_mb(os.getpid()) - before
+        pygame.mixer.music.stop()
+
+        before = rss_mb(os.getpid())
+        start = time.perf_counter()
+        sound = pygame.mixer.Sound(path)
+        decode_time = time.perf_counter() - start
+        decoded_mb = rss_mb(os.getpid()) - before
+        length = sound.get_length()
+        del sound
+    finally:
+        pygame.mixer.quit()
+
+    return {
+        "file": f"{game_key}/{relative_path}",
+        "length_s": round(length, 1),
+        # RSS deltas can hide reused allocator memory; pcm_mb is the decoded size itself
+        "decoded": {"load_s": round(decode_time, 3), "rss_mb": round(decoded_mb, 1),
+                    "pcm_mb": round(length * FREQUENCY * 2 * 2 / (1024 * 1024), 1)},
+        "streamed": {"load_s": round(stream_time, 3), "rss_mb": round(stream_mb, 1)},
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Audio latency and memory benchmark")
+    parser.add_argument("--buffers", type=int, nargs="+", default=DEFAULT_BUFFERS,
+                        help="Mixer buffer sizes (samples) to test")
+    parser.add_argument("--triggers", type=int, default=50, help="Triggers per buffer size")
+    parser.add_argument("--report", default="audio_benchmark.json", help="JSON report path")
+    args = parser.parse_args()
+
+    driver = os.environ.get("SDL_AUDIODRIVER", "")
+    if driver == "dummy":
+        print("⚠ SDL_AUDIODRIVER=dummy does not pace the mixer - latency numbers are not meaningful")
+
+    latency = []
+    for buffer in args.buffers:
+        try:
+            result = measure_latency(buffer, args.triggers)
+        except pygame.error as e:
+            print(f"❌ Could not open the mixer with buffer {buffer}: {e}")
+            sys.exit(1)
+        latency.append(result)
+        sfx = result["sfx_latency_ms"] or {"mean": None, "p95": None}
+        print(f"Buffer {buffer:>5} ({result['buffer_period_ms']:>5} ms): "
+              f"effect mean/p95 {sfx['mean']} / {sfx['p95']} ms | "
+              f"play() {result['play_call_ms']['mean']} ms | "
+              f"music start {result['music_start_ms']['mean']} ms")
+
+    music = []
+    for game_key, relative_path in MUSIC_FILES:
+        result = measure_music(game_key, relative_path)
+        music.append(result)
+        print(f"{result['file']} ({result['length_s']} s): "
+              f"Sound {result['decoded']['pcm_mb']} MB PCM in {result['decoded']['load_s']} s | "
+              f"streamed {result['streamed']['rss_mb']} MB in {result['streamed']['load_s']} s")
+
+    report = {
+        "latency": latency,
+        "music": music,
+        "audio_driver": driver or "default",
+        "platform": {
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "python": platform.python_version(),
+        },
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✓ Report written to: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
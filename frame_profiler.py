@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Frame-phase profiler shared by the arcade games
+A game loop calls start_frame() at the top of each frame and mark(phase)
+after each phase (events, update, collision, draw, display...). The
+profiler keeps a rolling histogram per phase, draws an optional overlay
+(F3) and dumps the recent per-frame trace to CSV (F4).
+"""
+
+import bisect
+import csv
+import os
+import time
+from collections import deque
+
+import pygame
+
+import startup_profile
+
+OVERLAY_KEY = pygame.K_F3
+DUMP_KEY = pygame.K_F4
+WINDOW_FRAMES = 240        # Frames in the rolling statistics
+TRACE_FRAMES = 3600        # Frames kept for the CSV dump
+OVERLAY_REFRESH = 15       # Frames between overlay re-renders
+BUCKETS_MS = (0.5, 1, 2, 4, 8, 16, 33)  # Histogram upper bounds; the last bucket is open
+PROFILE_DIR = os.environ.get("ARCADE_PROFILE_DIR", "/tmp")
+
+
+class PhaseStats:
+    """Rolling samples and histogram for one phase"""
+
+    def __init__(self, window=WINDOW_FRAMES):
+        self.samples = deque(maxlen=window)
+        self.histogram = [0] * (len(BUCKETS_MS) + 1)
+        self.total = 0.0
+
+    def add(self, ms):
+        if len(self.samples) == self.samples.maxlen:
+            old = self.samples[0]
+            self.total -= old
+            self.histogram[bisect.bisect_left(BUCKETS_MS, old)] -= 1
+        self.samples.append(ms)
+        self.total += ms
+        self.histogram[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+
+    @property
+    def mean(self):
+        return self.total / len(self.samples) if self.samples else 0.0
+
+    def percentile(self, p):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))]
+
+
+class FrameProfiler:
+    """Per-phase frame timings for one game"""
+
+    def __init__(self, name, window=WINDOW_FRAMES, trace_frames=TRACE_FRAMES):
+        self.name = name
+        self.window = window
+        self.overlay = os.environ.get("ARCADE_PROFILE_OVERLAY") == "1"
+        self.frame = 0
+        self.run_frames = 0    # Frames finished since restart()
+        self.frame_start = None
+        self.last_mark = None
+        self.current = {}
+        self.frames = PhaseStats(window)
+        self.phases = {}
+        self.trace = deque(maxlen=trace_frames)
+        self.font = None
+        self.overlay_surface = None
+        self.overlay_frame = None
+
+    def restart(self):
+        """Start timing afresh, e.g. when a new run begins (keeps the statistics)"""
+        self.frame_start = None
+        self.run_frames = 0
+        self.current = {}
+
+    def start_frame(self):
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.finish_frame(now)
+        self.frame_start = self.last_mark = now
+
+    def mark(self, phase):
+        """Attribute the time since the previous mark to a phase"""
+        now = time.perf_counter()
+        if self.last_mark is not None:
+            self.current[phase] = self.current.get(phase, 0.0) + (now - self.last_mark) * 1000
+        self.last_mark = now
+
+    def finish_frame(self, now):
+        frame_ms = (now - self.frame_start) * 1000
+        self.frames.add(frame_ms)
+        for phase, ms in self.current.items():
+            stats = self.phases.get(phase)
+            if stats is None:
+                stats = self.phases[phase] = PhaseStats(self.window)
+            stats.add(ms)
+        self.trace.append((self.frame, frame_ms, self.current))
+        self.current = {}
+        if self.run_frames == 0:
+            # The run's first frame is on screen: ends the startup trace, if any
+            startup_profile.finish_trace()
+        self.run_frames += 1
+        self.frame += 1
+
+    def handle_event(self, event):
+        """Handle the overlay and dump hotkeys; returns True if the event was used"""
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == OVERLAY_KEY:
+            self.overlay = not self.overlay
+            self.overlay_frame = None
+            return True
+        if event.key == DUMP_KEY:
+            self.dump_csv()
+            return True
+        return False
+
+    def draw(self, surface):
+        """Draw the overlay if it is enabled (re-rendered every few frames)"""
+        if not self.overlay:
+            return
+        if self.overlay_frame is None or self.frame - self.overlay_frame >= OVERLAY_REFRESH:
+            self.overlay_surface = self.render_overlay()
+            self.overlay_frame = self.frame
+        surface.blit(self.overlay_surface, (8, 8))
+
+    def render_overlay(self):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 22)
+
+        frame_ms = self.frames.mean
+        lines = [f"{self.name}  {1000 / frame_ms if frame_ms else 0:.0f} FPS  {frame_ms:.2f} ms"]
+        for phase, stats in self.phases.items():
+            lines.append(f"{phase:<10} {stats.mean:6.2f} ms  p95 {stats.percentile(0.95):6.2f}")
+
+        rendered = [self.font.render(line, True, (255, 255, 255)) for line in lines]
+        width = max(text.get_width() for text in rendered) + 12
+        height = sum(text.get_height() for text in rendered) + 10
+        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 170))
+        y = 5
+        for text in rendered:
+            overlay.blit(text, (6, y))
+            y += text.get_height()
+        return overlay
+
+    def summary(self):
+        """Mean/p95 and histogram per phase over the rolling window"""
+        phases = {"frame": self.frames, **self.phases}
+        return {
+            phase: {
+                "mean": round(stats.mean, 3),
+                "p95": round(stats.percentile(0.95), 3),
+                "histogram": dict(zip([f"<{b}" for b in BUCKETS_MS] + [f">={BUCKETS_MS[-1]}"], stats.histogram)),
+            }
+            for phase, stats in phases.items()
+        }
+
+    def dump_csv(self, path=None):
+        """Write the recent per-frame phase timings to a CSV file"""
+        if path is None:
+            path = os.path.join(PROFILE_DIR, f"arcade_profile_{self.name}_{time.strftime('%Y%m%d_%H%M%S')}.csv")
+        phases = list(self.phases)
+        try:
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame", "frame_ms"] + [f"{phase}_ms" for phase in phases])
+                for frame, frame_ms, times in self.trace:
+                    writer.writerow([frame, f"{frame_ms:.3f}"] + [f"{times.get(phase, 0.0):.3f}" for phase in phases])
+        except OSError as e:
+            print(f"❌ Could not write profile: {e}")
+            return None
+        print(f"✓ Frame profile written to: {path}")
+        return path
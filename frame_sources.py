@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Frame sources for the YOLO detector
+Pi Camera, OpenCV camera, video file or a folder of images behind one interface
+"""
+
+import os
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# Try to import picamera2 for Pi Camera Module v2
+try:
+    from picamera2 import Picamera2
+    PICAMERA2_AVAILABLE = True
+except ImportError:
+    PICAMERA2_AVAILABLE = False
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+
+class FrameSource:
+    """Base class - open(), read() and close() a stream of BGR frames"""
+
+    name = "source"
+    live = False  # Live sources never run out of frames
+
+    # Size of the frames handed to the model by read_pair(); None keeps the
+    # full frame. scale maps inference coordinates back to the full frame.
+    inference_size = None
+    scale = (1.0, 1.0)
+    _inference_buffer = None
+
+    def open(self):
+        return True
+
+    def read(self):
+        """Return the next frame, or None if no frame is available"""
+        raise NotImplementedError
+
+    def read_pair(self, need_main=True):
+        """
+        Return (inference_frame, main_frame) for the next capture
+        main_frame is None unless need_main is set (display or snapshots).
+        The inference frame is a reused buffer - copy it to keep it.
+        """
+        frame = self.read()
+        if frame is None:
+            return None, None
+        return self.downscale(frame), (frame if need_main else None)
+
+    def downscale(self, frame):
+        """Resize a full frame to inference_size into a preallocated buffer"""
+        if not self.inference_size:
+            self.scale = (1.0, 1.0)
+            return frame
+
+        width, height = self.inference_size
+        self.scale = (frame.shape[1] / width, frame.shape[0] / height)
+        buffer = self._get_inference_buffer(frame.shape[2:], frame.dtype)
+        cv2.resize(frame, (width, height), dst=buffer, interpolation=cv2.INTER_AREA)
+        return buffer
+
+    def _get_inference_buffer(self, channels, dtype):
+        width, height = self.inference_size
+        shape = (height, width) + tuple(channels)
+        if (self._inference_buffer is None or self._inference_buffer.shape != shape
+                or self._inference_buffer.dtype != dtype):
+            self._inference_buffer = np.empty(shape, dtype=dtype)
+        return self._inference_buffer
+
+    def close(self):
+        pass
+
+    def __iter__(self):
+        while True:
+            frame = self.read()
+            if frame is None:
+                return
+            yield frame
+
+
+class PiCamera2Source(FrameSource):
+    """Pi Camera Module via picamera2
+
+    With an inference_size the camera ISP produces a second low-resolution
+    "lores" stream, so the model input costs no CPU-side resize and the full
+    frame is only copied out when it is actually needed.
+    """
+
+    name = "picamera2"
+    live = True
+
+    def __init__(self, resolution=(640, 480), fps=30, inference_size=None):
+        self.resolution = resolution
+        self.fps = fps
+        self.inference_size = inference_size
+        self.camera = None
+
+    def open(self):
+        try:
+            self.camera = Picamera2()
+
+            # Configure for optimal performance
+            frame_duration = int(1_000_000 / self.fps)
+            streams = {"main": {"size": self.resolution, "format": "RGB888"}}
+            if self.inference_size:
+                streams["lores"] = {"size": self.inference_size, "format": "YUV420"}
+            config = self.camera.create_preview_configuration(
+                **streams,
+                controls={"FrameDurationLimits": (frame_duration, frame_duration)}
+            )
+            self.camera.configure(config)
+            self.camera.start()
+
+            print("✓ PiCamera2 initialized")
+            return True
+
+        except Exception as e:
+            print(f"❌ PiCamera2 error: {e}")
+            self.camera = None
+            return False
+
+    def read(self):
+        if not self.camera:
+            return None
+        try:
+            return self.camera.capture_array()
+        except Exception as e:
+            print(f"PiCamera2 capture error: {e}")
+            return None
+
+    def read_pair(self, need_main=True):
+        if not self.inference_size:
+            return super().read_pair(need_main)
+        if not self.camera:
+            return None, None
+
+        try:
+            if need_main:
+                (main, lores), _ = self.camera.capture_arrays(["main", "lores"])
+            else:
+                main, lores = None, self.camera.capture_array("lores")
+        except Exception as e:
+            print(f"PiCamera2 capture error: {e}")
+            return None, None
+
+        # lores is planar YUV420 - convert straight into the reused BGR buffer
+        # (keep the width a multiple of 64 so the stride has no padding)
+        width, height = self.inference_size
+        self.scale = (self.resolution[0] / width, self.resolution[1] / height)
+        buffer = self._get_inference_buffer((3,), np.uint8)
+        cv2.cvtColor(lores[:height * 3 // 2, :width], cv2.COLOR_YUV2BGR_I420, dst=buffer)
+        return buffer, main
+
+    def close(self):
+        if self.camera:
+            try:
+                self.camera.stop()
+                self.camera.close()
+            except:
+                pass
+            self.camera = None
+
+
+class OpenCVCameraSource(FrameSource):
+    """USB/V4L2 camera via cv2.VideoCapture"""
+
+    name = "opencv"
+    live = True
+
+    def __init__(self, index=0, resolution=(640, 480), fps=30, inference_size=None):
+        self.index = index
+        self.resolution = resolution
+        self.fps = fps
+        self.inference_size = inference_size
+        self.camera = None
+
+    def open(self):
+        try:
+            self.camera = cv2.VideoCapture(self.index)
+
+            # Set camera properties
+            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.resolution[0])
+            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.resolution[1])
+            self.camera.set(cv2.CAP_PROP_FPS, self.fps)
+
+            if not self.camera.isOpened():
+                raise Exception("Failed to open camera")
+
+            print("✓ OpenCV camera initialized")
+            return True
+
+        except Exception as e:
+            print(f"❌ OpenCV camera error: {e}")
+            self.camera = None
+            return False
+
+    def read(self):
+        if not self.camera:
+            return None
+        try:
+            ret, frame = self.camera.read()
+            return frame if ret else None
+        except Exception as e:
+            print(f"OpenCV capture error: {e}")
+            return None
+
+    def close(self):
+        if self.camera:
+            try:
+                self.camera.release()
+            except:
+                pass
+            self.camera = None
+
+
+class VideoFileSource(FrameSource):
+    """Frames decoded from a video file, optionally looped"""
+
+    name = "video"
+
+    def __init__(self, path, loop=False, inference_size=None):
+        self.path = str(path)
+        self.loop = loop
+        self.inference_size = inference_size
+        self.capture = None
+
+    def open(self):
+        self.capture = cv2.VideoCapture(self.path)
+        if not self.capture.isOpened():
+            print(f"❌ Cannot open video: {self.path}")
+            self.capture = None
+            return False
+        print(f"✓ Video source opened: {self.path}")
+        return True
+
+    def read(self):
+        if not self.capture:
+            return None
+        ret, frame = self.capture.read()
+        if not ret and self.loop:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.capture.read()
+        return frame if ret else None
+
+    def close(self):
+        if self.capture:
+            self.capture.release()
+            self.capture = None
+
+
+class ImageFolderSource(FrameSource):
+    """Images from a directory, in sorted filename order"""
+
+    name = "images"
+
+    def __init__(self, path, loop=False, inference_size=None):
+        self.path = Path(path)
+        self.loop = loop
+        self.inference_size = inference_size
+        self.files = []
+        self.index = 0
+
+    def open(self):
+        self.files = sorted(
+            p for p in self.path.iterdir()
+            if p.suffix.lower() in IMAGE_EXTENSIONS
+        )
+        self.index = 0
+        if not self.files:
+            print(f"❌ No images found in: {self.path}")
+            return False
+        print(f"✓ Image folder opened: {self.path} ({len(self.files)} images)")
+        return True
+
+    def read(self):
+        while self.files:
+            if self.index >= len(self.files):
+                if not self.loop:
+                    return None
+                self.index = 0
+            path = self.files[self.index]
+            self.index += 1
+            frame = cv2.imread(str(path))
+            if frame is not None:
+                return frame
+            print(f"⚠ Skipping unreadable image: {path}")
+        return None
+
+
+def open_frame_source(spec=None, resolution=(640, 480), loop=False, inference_size=None):
+    """
+    Create and open a frame source from a spec
+    Args:
+        spec: None/"camera" for the Pi Camera (or OpenCV fallback), a camera
+              index, a video file path or a directory of images
+        resolution: Capture resolution for live cameras
+        loop: Restart file-based sources when they run out
+        inference_size: (width, height) of the frames read_pair() hands to
+                        the model, or None to use the full frame
+    Returns:
+        FrameSource: The opened source, or None if it could not be opened
+    """
+    if spec is None or spec == "camera":
+        if PICAMERA2_AVAILABLE:
+            source = PiCamera2Source(resolution, inference_size=inference_size)
+            if source.open():
+                return source
+            print("Falling back to OpenCV...")
+        source = OpenCVCameraSource(0, resolution, inference_size=inference_size)
+    elif isinstance(spec, int) or str(spec).isdigit():
+        source = OpenCVCameraSource(int(spec), resolution, inference_size=inference_size)
+    elif os.path.isdir(spec):
+        source = ImageFolderSource(spec, loop=loop, inference_size=inference_size)
+    else:
+        source = VideoFileSource(spec, loop=loop, inference_size=inference_size)
+
+    return source if source.open() else None
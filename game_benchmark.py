@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Headless benchmark for the arcade games
+Runs each game on SDL's dummy video/audio drivers with scripted input and a
+virtual clock: frames run uncapped, but the games see a fixed frame step so
+every run plays out the same way. Writes frame-time statistics and peak RSS
+to a JSON report and can compare against an earlier report.
+"""
+
+import os
+
+# Must be set before pygame is imported
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_FRAMES = 2000
+DEFAULT_WARMUP = 60
+FRAME_STEP_MS = 1000 / 60  # Game time per frame, whatever the real frame time is
+
+
+def default_script(key):
+    """
+    Built-in input timeline for a game
+    Events repeat every "length" frames. Each event can press ("down") or
+    release ("up") keys by pygame key name, move the mouse and set the
+    left mouse button.
+    """
+    if key == "Cycleforest":
+        events = [{"frame": 0, "down": ["right"]}, {"frame": 90, "up": ["right"], "down": ["left"]},
+                  {"frame": 180, "up": ["left"]}]
+        for frame in range(0, 240, 40):
+            events.append({"frame": frame + 5, "down": ["space"]})
+            events.append({"frame": frame + 10, "up": ["space"]})
+        for frame in range(0, 240, 15):
+            events.append({"frame": frame, "down": ["x"]})
+            events.append({"frame": frame + 1, "up": ["x"]})
+        return {"length": 240, "events": events}
+
+    if key == "GameShooter":
+        # Sweep the ship across the screen with the fire button held
+        events = [{"frame": 0, "mouse_down": True}]
+        for i in range(24):
+            x = 80 + (i if i < 12 else 23 - i) * 100
+            events.append({"frame": i * 10, "mouse": [x, 600 + (i % 3) * 40]})
+        return {"length": 240, "events": events}
+
+    if key == "TrafficDash":
+        moves = ["up", "right", "up", "left", "down", "right"]
+        events = []
+        for i, move in enumerate(moves):
+            events.append({"frame": i * 60, "down": [move]})
+            events.append({"frame": i * 60 + 50, "up": [move]})
+        return {"length": 60 * len(moves), "events": events}
+
+    return {"length": 1, "events": []}
+
+
+class KeyState:
+    """Stands in for pygame.key.get_pressed() - indexable by key constant"""
+
+    def __init__(self, pressed):
+        self.pressed = pressed
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+class ScriptedPygame:
+    """
+    Replays an input script through pygame and runs the games on a virtual clock
+    While active, pygame.time.Clock, get_ticks, set_timer and wait, plus the
+    keyboard/mouse state functions, are replaced. Each Clock.tick() call
+    ends a frame: its real duration is recorded, game time advances by a
+    fixed step, due timers fire and the next frame's input is posted.
+    """
+
+    def __init__(self, pygame, script, max_frames, step_ms=FRAME_STEP_MS):
+        self.pygame = pygame
+        self.length = max(1, script.get("length", 1))
+        self.events = {}
+        for event in script.get("events", []):
+            self.events.setdefault(event["frame"] % self.length, []).append(event)
+        self.max_frames = max_frames
+        self.step_ms = step_ms
+
+        self.frame = 0
+        self.now_ms = 0.0
+        self.frame_times = []
+        self.last_tick = None
+        self.timers = {}   # event type -> [interval_ms, next_due_ms]
+        self.pressed = set()
+        self.mouse_pos = (0, 0)
+        self.mouse_down = False
+        self.originals = {}
+
+    @property
+    def finished(self):
+        return self.frame >= self.max_frames
+
+    def install(self):
+        pygame = self.pygame
+        harness = self
+
+        class VirtualClock:
+            def tick(self, framerate=0):
+                return harness.tick()
+
+            def get_fps(self):
+                return 1000 / harness.step_ms
+
+        patches = {
+            (pygame.time, "Clock"): VirtualClock,
+            (pygame.time, "get_ticks"): lambda: int(self.now_ms),
+            (pygame.time, "set_timer"): self.set_timer,
+            (pygame.time, "wait"): lambda ms: 0,
+            (pygame.time, "delay"): lambda ms: 0,
+            (pygame.key, "get_pressed"): lambda: KeyState(self.pressed),
+            (pygame.mouse, "get_pos"): lambda: self.mouse_pos,
+            (pygame.mouse, "get_pressed"): lambda num_buttons=3: (self.mouse_down,) + (False,) * (num_buttons - 1),
+        }
+        for (module, name), value in patches.items():
+            self.originals[(module, name)] = getattr(module, name)
+            setattr(module, name, value)
+        self.apply_input()
+
+    def uninstall(self):
+        for (module, name), value in self.originals.items():
+            setattr(module, name, value)
+        self.originals = {}
+
+    def set_timer(self, event, millis, loops=0):
+        event_type = event if isinstance(event, int) else event.type
+        if millis <= 0:
+            self.timers.pop(event_type, None)
+        else:
+            self.timers[event_type] = [millis, self.now_ms + millis]
+
+    def tick(self):
+        now = time.perf_counter()
+        if self.last_tick is not None:
+            self.frame_times.append((now - self.last_tick) * 1000)
+        self.last_tick = now
+
+        self.frame += 1
+        self.now_ms += self.step_ms
+        for event_type, timer in self.timers.items():
+            while timer[1] <= self.now_ms:
+                self.pygame.event.post(self.pygame.event.Event(event_type))
+                timer[1] += timer[0]
+
+        if self.finished:
+            self.pygame.event.post(self.pygame.event.Event(self.pygame.QUIT))
+        else:
+            self.apply_input()
+        return self.step_ms
+
+    def apply_input(self):
+        pygame = self.pygame
+        for event in self.events.get(self.frame % self.length, []):
+            for name in event.get("up", []):
+                key = pygame.key.key_code(name)
+                self.pressed.discard(key)
+                pygame.event.post(pygame.event.Event(pygame.KEYUP, key=key, mod=0, scancode=0, unicode=""))
+            for name in event.get("down", []):
+                key = pygame.key.key_code(name)
+                self.pressed.add(key)
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, scancode=0, unicode=""))
+            if "mouse" in event:
+                self.mouse_pos = tuple(event["mouse"])
+                pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=self.mouse_pos, rel=(0, 0), buttons=(0, 0, 0)))
+            if "mouse_down" in event:
+                self.mouse_down = bool(event["mouse_down"])
+                event_type = pygame.MOUSEBUTTONDOWN if self.mouse_down else pygame.MOUSEBUTTONUP
+                pygame.event.post(pygame.event.Event(event_type, pos=self.mouse_pos, button=1))
+
+
+def frame_stats(values):
+    """Mean/p50/p95/p99/max of a list of millisecond frame times"""
+    if not values:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))]
+
+    return {
+        "mean": round(statistics.fmean(ordered), 3),
+        "p50": round(statistics.median(ordered), 3),
+        "p95": round(percentile(0.95), 3),
+        "p99": round(percentile(0.99), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def benchmark_game(key, frames=DEFAULT_FRAMES, warmup=DEFAULT_WARMUP, seed=1, script=None, render_scale=None,
+                   governor=False):
+    """
+    Play one game headless for a number of frames (in this process)
+    The game is restarted whenever it ends early (e.g. game over). The
+    quality governor is off unless asked for, so runs stay comparable.
+    Returns:
+        dict: Frame-time statistics, FPS, restarts and peak RSS
+    """
+    import pygame
+    import arcade_audio
+    from arcade_input import input_state
+    from arcade_supervisor import rss_mb
+    from game_host import find_game, load_game_module
+    from render_scale import open_display
+
+    game = find_game(key)
+    if game is None:
+        raise ValueError(f"unknown game: {key}")
+
+    random.seed(seed)
+    load_start = time.perf_counter()
+    module = load_game_module(game)
+    if hasattr(module, "governor"):
+        module.governor.enabled = governor
+    arcade_audio.pre_init()
+    pygame.init()
+    screen = open_display(module.WINDOW_SIZE, render_scale)
+    assets = module.load_assets()
+    if assets is None:
+        raise RuntimeError(f"{game['name']} assets are missing")
+    load_time = time.perf_counter() - load_start
+
+    harness = ScriptedPygame(pygame, script or default_script(game["key"]), frames + warmup)
+    results = []
+    harness.install()
+    try:
+        while not harness.finished:
+            # Each restart gets its own seed, derived from the run's
+            results.append(module.run(screen, assets, seed=seed + len(results)))
+        # Steady-state footprint while the game's assets are still loaded
+        rss = rss_mb(os.getpid())
+    finally:
+        harness.uninstall()
+        pygame.quit()
+
+    measured = harness.frame_times[warmup:]
+    total_ms = sum(measured)
+    return {
+        "game": game["key"],
+        "frames": len(measured),
+        "warmup_frames": warmup,
+        "seed": seed,
+        "render_scale": render_scale if render_scale is not None else float(os.environ.get("ARCADE_RENDER_SCALE", "1.0")),
+        "fps": round(len(measured) / (total_ms / 1000), 2) if total_ms else 0.0,
+        "frame_ms": frame_stats(measured),
+        "load_s": round(load_time, 3),
+        "restarts": len(results) - 1,
+        "game_over": sum(1 for result in results if result.get("reason") == "game_over"),
+        "scores": [result.get("score") for result in results],
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "rss_mb": round(rss, 1) if rss is not None else None,
+        # Per-phase timings over the profiler's rolling window (last frames)
+        "phases_ms": module.profiler.summary() if hasattr(module, "profiler") else {},
+        "input_latency_ms": input_state.latency_summary(),
+        "quality": module.governor.status() if governor and hasattr(module, "governor") else None,
+    }
+
+
+def run_in_subprocess(key, args):
+    """Benchmark one game in a fresh interpreter so RSS and caches aren't shared"""
+    command = [sys.executable, os.path.abspath(__file__), "--worker", key,
+               "--frames", str(args.frames), "--warmup", str(args.warmup), "--seed", str(args.seed)]
+    if args.script:
+        command += ["--script", args.script]
+    if args.render_scale is not None:
+        command += ["--render-scale", str(args.render_scale)]
+    if args.governor:
+        command.append("--governor")
+    process = subprocess.run(command, capture_output=True, text=True)
+    lines = process.stdout.strip().splitlines()
+    if process.returncode != 0 or not lines:
+        print(f"❌ {key} failed:\n{process.stderr.strip()[-2000:]}")
+        return None
+    return json.loads(lines[-1])
+
+
+def compare(baseline, report, threshold):
+    """
+    Print per-game changes against a baseline report
+    Returns:
+        bool: True if any game's FPS or p95 frame time regressed past threshold %
+    """
+    regressed = False
+    old_games = {game["game"]: game for game in baseline.get("games", [])}
+    print(f"\n{'Game':<14}{'FPS':>22}{'p95 ms':>22}{'RSS MB':>20}")
+    for game in report["games"]:
+        old = old_games.get(game["game"])
+        if old is None:
+            print(f"{game['game']:<14}  (not in baseline)")
+            continue
+
+        def change(before, after):
+            return (after - before) / before * 100 if before else 0.0
+
+        fps_change = change(old["fps"], game["fps"])
+        p95_change = change(old["frame_ms"]["p95"], game["frame_ms"]["p95"])
+        rss_change = change(old["peak_rss_mb"], game["peak_rss_mb"])
+        bad = fps_change < -threshold or p95_change > threshold
+        regressed = regressed or bad
+        print(f"{game['game']:<14}"
+              f"{old['fps']:>8.1f} → {game['fps']:>6.1f} ({fps_change:+5.1f}%)"
+              f"{old['frame_ms']['p95']:>7.2f} → {game['frame_ms']['p95']:>5.2f} ({p95_change:+5.1f}%)"
+              f"{old['peak_rss_mb']:>6.0f} → {game['peak_rss_mb']:>4.0f} ({rss_change:+5.1f}%)"
+              f"{'  ❌' if bad else ''}")
+    return regressed
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Headless benchmark for the arcade games")
+    parser.add_argument("--games", nargs="+", default=None,
+                        help="Games to run (default: all games in games.json)")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="Measured frames per game")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="Frames excluded from timings")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the games")
+    parser.add_argument("--script", default=None,
+                        help="JSON input scripts keyed by game (default: built-in scripts)")
+    parser.add_argument("--render-scale", type=float, default=None,
+                        help="Render at this fraction of the native resolution (default: ARCADE_RENDER_SCALE)")
+    parser.add_argument("--governor", action="store_true",
+                        help="Let the quality governor adjust the games while they run")
+    parser.add_argument("--report", default="game_benchmark.json", help="JSON report path")
+    parser.add_argument("--compare", default=None, help="Earlier report to compare against")
+    parser.add_argument("--threshold", type=float, default=5.0,
+                        help="Regression threshold in percent for --compare")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        script = None
+        if args.script:
+            with open(args.script) as f:
+                script = json.load(f).get(args.worker)
+        result = benchmark_game(args.worker, args.frames, args.warmup, args.seed, script, args.render_scale,
+                                args.governor)
+        print(json.dumps(result))
+        return
+
+    from game_registry import load_games
+    keys = args.games or [game["key"] for game in load_games()]
+
+    games = []
+    for key in keys:
+        print(f"Benchmarking {key} ({args.frames} frames)...")
+        result = run_in_subprocess(key, args)
+        if result is None:
+            sys.exit(1)
+        games.append(result)
+        stats = result["frame_ms"]
+        print(f"  {result['fps']} FPS | frame mean/p95/p99 {stats['mean']} / {stats['p95']} / {stats['p99']} ms | "
+              f"RSS {result['peak_rss_mb']} MB | restarts {result['restarts']}")
+
+    report = {
+        "games": games,
+        "frames": args.frames,
+        "seed": args.seed,
+        "platform": {
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "python": platform.python_version(),
+        },
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"✓ Report written to: {args.report}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, report, args.threshold):
+            print(f"❌ Regression of more than {args.threshold}% against {args.compare}")
+            sys.exit(1)
+        print(f"✓ No regression against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+In-process game host
+Keeps one pygame display and mixer alive and runs the arcade games in turn,
+so switching games doesn't pay interpreter start, pygame.init() or asset
+decoding again
+"""
+
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+import time
+
+import pygame
+
+import arcade_audio
+import render_scale
+import startup_profile
+from arcade_input import input_state
+from arcade_supervisor import is_supervised
+from game_registry import entry_path, find_game, game_dir, load_games, prewarm
+from game_startup import LoadingScreen, init_subsystems
+from hud_text import render_text
+from render_scale import ScaledSurface, open_display
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MENU_SIZE = (800, 480)
+MENU_TIMEOUT = 60  # Seconds of inactivity before returning to the start screen
+
+# Every game module provides WINDOW_SIZE, load_assets() and
+# run(screen, assets, **options) -> {"score": ..., "reason": ...}
+GAMES = load_games()
+
+
+def load_game_module(game):
+    """
+    Import a game's entry module under a unique name
+    The game directory is put first on sys.path while importing, so the
+    game's own helper modules (settings, player, assets_config...) resolve.
+    """
+    directory = game_dir(game)
+    spec = importlib.util.spec_from_file_location(f"arcade_game_{game['key'].lower()}", entry_path(game))
+    module = importlib.util.module_from_spec(spec)
+
+    sys.path.insert(0, directory)
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(directory)
+    sys.modules[spec.name] = module
+    return module
+
+
+class GameHost:
+    """One pygame display shared by all games, with modules and assets cached"""
+
+    def __init__(self, menu_timeout=MENU_TIMEOUT):
+        self.menu_timeout = menu_timeout
+        self.screen = None
+        self.font = None
+        self.small_font = None
+        self.modules = {}
+        self.assets = {}
+        self.results = []
+        self.menu_shown = False
+        self.window_closed = False
+
+    def start(self):
+        # The mixer opens with the first sound, controllers with the menu or a run
+        arcade_audio.pre_init()
+        init_subsystems()
+        self.screen = pygame.display.set_mode(MENU_SIZE)
+        pygame.display.set_caption("Recycle Arcade")
+        self.font = pygame.font.Font(None, 56)
+        self.small_font = pygame.font.Font(None, 28)
+        print("✓ Game host started")
+
+    def display(self, size, scaled=False):
+        """
+        Reuse the window, only reopening it when a game needs another size
+        Games get the render-scaled target (scaled=True), the menu draws natively.
+        """
+        scaled = scaled and render_scale.RENDER_SCALE < 1.0
+        if self.screen.get_size() != tuple(size) or isinstance(self.screen, ScaledSurface) != scaled:
+            self.screen = open_display(size, scale=None if scaled else 1.0)
+        return self.screen
+
+    def prepare(self, game, loading=False):
+        """
+        Import the game and decode its assets, once per host
+        loading=True shows a loading screen while the assets load.
+        """
+        key = game["key"]
+        if key not in self.modules:
+            start = time.perf_counter()
+            self.modules[key] = load_game_module(game)
+            startup_profile.mark("import")
+            print(f"✓ Imported {game['name']} in {time.perf_counter() - start:.2f} s")
+
+        module = self.modules[key]
+        if self.assets.get(key) is None:
+            # Decoding needs a display mode; convert() only depends on the
+            # pixel format, so the surfaces stay valid across resizes
+            screen = self.display(module.WINDOW_SIZE, scaled=True)
+            start = time.perf_counter()
+            if loading:
+                pygame.display.set_caption(game["name"])
+                progress = LoadingScreen(screen, game["name"], getattr(module, "LOAD_STEPS", None)).step
+                self.assets[key] = module.load_assets(progress=progress)
+            else:
+                self.assets[key] = module.load_assets()
+            print(f"✓ Loaded {game['name']} assets in {time.perf_counter() - start:.2f} s")
+        return module, self.assets[key]
+
+    def preload(self):
+        for game in GAMES:
+            try:
+                self.prepare(game)
+            except Exception as e:
+                print(f"⚠ Could not preload {game['name']}: {e}")
+
+    def play(self, game, **options):
+        """Run one game and return its result (None if it failed to start)"""
+        switch_start = time.perf_counter()
+        # A game started straight away is timed from process start, later ones from here
+        startup_profile.begin_trace(game["key"], "host start",
+                                    from_process_start=not (self.results or self.menu_shown))
+        try:
+            module, assets = self.prepare(game, loading=True)
+        except Exception as e:
+            print(f"❌ Failed to load {game['name']}: {e}")
+            return None
+        if assets is None:
+            print(f"❌ {game['name']} assets are missing")
+            return None
+
+        screen = self.display(module.WINDOW_SIZE, scaled=True)
+        pygame.display.set_caption(game["name"])
+        pygame.event.clear()
+        print(f"Starting {game['name']} ({(time.perf_counter() - switch_start) * 1000:.0f} ms)")
+
+        try:
+            result = module.run(screen, assets, **options)
+        except Exception as e:
+            # A crashing game shouldn't take the host (and the other games) down
+            print(f"❌ {game['name']} crashed: {e}")
+            result = {"game": game["key"], "score": None, "reason": "crash"}
+
+        if pygame.mixer.get_init():
+            pygame.mixer.stop()
+        arcade_audio.stop_music()
+        pygame.event.clear()
+        # The quality governor may have reopened the display at another scale
+        self.screen = render_scale.current_surface()
+        self.results.append(result)
+        print(f"{game['name']} finished: {result.get('reason')} (score {result.get('score')})")
+        return result
+
+    def menu(self, last_result=None):
+        """
+        Let the player pick the next game
+        Returns:
+            dict: Selected game, or None to leave (ESC, timeout or window closed)
+        """
+        self.menu_shown = True
+        self.screen = self.display(MENU_SIZE)
+        pygame.display.set_caption("Recycle Arcade")
+        clock = pygame.time.Clock()
+        selected = 0
+        last_input = time.monotonic()
+        input_state.reset()
+
+        while True:
+            # Start reading the highlighted game's assets before it is picked
+            prewarm(GAMES[selected])
+            for event in pygame.event.get():
+                if input_state.handle_event(event):
+                    continue
+                if event.type == pygame.QUIT:
+                    self.window_closed = True
+                    return None
+                if event.type in (pygame.KEYDOWN, pygame.JOYBUTTONDOWN, pygame.JOYHATMOTION):
+                    last_input = time.monotonic()
+
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        return None
+                    if event.key in (pygame.K_UP, pygame.K_w):
+                        selected = (selected - 1) % len(GAMES)
+                    elif event.key in (pygame.K_DOWN, pygame.K_s):
+                        selected = (selected + 1) % len(GAMES)
+                    elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+                        return GAMES[selected]
+                    elif pygame.K_1 <= event.key < pygame.K_1 + len(GAMES):
+                        return GAMES[event.key - pygame.K_1]
+                elif event.type == pygame.JOYHATMOTION and event.value[1]:
+                    selected = (selected - event.value[1]) % len(GAMES)
+                elif event.type == pygame.JOYBUTTONDOWN and event.button == 0:
+                    return GAMES[selected]
+
+            if self.menu_timeout and time.monotonic() - last_input > self.menu_timeout:
+                print("Menu idle - returning to start screen")
+                return None
+
+            self.draw_menu(selected, last_result)
+            clock.tick(30)
+
+    def draw_menu(self, selected, last_result):
+        screen = self.screen
+        width, height = screen.get_size()
+        screen.fill((26, 26, 46))
+
+        title = render_text(self.font, "Recycle Arcade", (78, 204, 163))
+        screen.blit(title, title.get_rect(midtop=(width // 2, 40)))
+
+        for i, game in enumerate(GAMES):
+            color = (255, 255, 255) if i == selected else (120, 130, 160)
+            label = render_text(self.font, f"{i + 1}. {game['name']}", color)
+            rect = label.get_rect(center=(width // 2, 170 + i * 80))
+            if i == selected:
+                pygame.draw.rect(screen, (15, 52, 96), rect.inflate(40, 20), border_radius=10)
+            screen.blit(label, rect)
+
+        if last_result and last_result.get("score") is not None:
+            text = f"Last score: {last_result['score']}"
+            score = render_text(self.small_font, text, (200, 200, 200))
+            screen.blit(score, score.get_rect(midbottom=(width // 2, height - 50)))
+
+        hint = render_text(self.small_font, "Enter / A to play - Esc to leave", (120, 130, 160))
+        screen.blit(hint, hint.get_rect(midbottom=(width // 2, height - 15)))
+        pygame.display.update()
+
+    def run(self, first_game=None, use_menu=True):
+        """Play games until the player leaves; returns True if the window was closed"""
+        self.window_closed = False
+        game = first_game
+        result = None
+
+        while True:
+            if game is None:
+                if not use_menu:
+                    break
+                game = self.menu(result)
+                if game is None:
+                    break
+
+            result = self.play(game)
+            game = None
+            if result and result.get("reason") == "quit":
+                self.window_closed = True
+                break
+
+        return self.window_closed
+
+    def close(self):
+        pygame.quit()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Run the arcade games in one process")
+    parser.add_argument("--game", default=None,
+                        help="Start straight into this game (" + ", ".join(g["key"] for g in GAMES) + ")")
+    parser.add_argument("--no-menu", action="store_true",
+                        help="Leave after the first game instead of showing the game menu")
+    parser.add_argument("--preload", action="store_true",
+                        help="Decode every game's assets at startup")
+    parser.add_argument("--menu-timeout", type=float, default=MENU_TIMEOUT,
+                        help="Seconds of menu inactivity before returning to the start screen (0 = never)")
+    args = parser.parse_args()
+
+    first_game = None
+    if args.game:
+        first_game = find_game(args.game)
+        if not first_game:
+            print(f"❌ Unknown game: {args.game}")
+            sys.exit(1)
+
+    host = GameHost(menu_timeout=args.menu_timeout)
+    host.start()
+    if args.preload:
+        host.preload()
+
+    try:
+        window_closed = host.run(first_game, use_menu=not args.no_menu)
+    except KeyboardInterrupt:
+        window_closed = True
+    finally:
+        host.close()
+
+    if not window_closed and not is_supervised():
+        # Return to the start screen, like the games do when run on their own
+        subprocess.Popen([sys.executable, os.path.join(BASE_DIR, "app.py")])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Game registry
+Reads the game list from games.json (entry point, asset list and content
+hashes) for every launcher, and validates installs with a result cache
+keyed by file mtimes so an unchanged install isn't re-checked on each start
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST_FILE = os.path.join(BASE_DIR, "games.json")
+CACHE_FILE = os.environ.get("ARCADE_REGISTRY_CACHE", "/tmp/arcade_registry_cache.json")
+
+PREWARM_CHUNK = 1 << 20
+
+_manifest = None  # (mtime_ns, games)
+_prewarmed = set()
+_prewarm_lock = threading.Lock()
+
+
+def load_games():
+    """
+    Games from the manifest, in menu order
+    Returns:
+        list: Dicts with key, name, entry, icon, color, description and assets
+    """
+    global _manifest
+    mtime = os.stat(MANIFEST_FILE).st_mtime_ns
+    if _manifest is None or _manifest[0] != mtime:
+        with open(MANIFEST_FILE, encoding="utf-8") as f:
+            _manifest = (mtime, json.load(f)["games"])
+    return _manifest[1]
+
+
+def find_game(key):
+    for game in load_games():
+        if game["key"].lower() == str(key).lower():
+            return game
+    return None
+
+
+def game_dir(game):
+    return os.path.join(BASE_DIR, game["key"])
+
+
+def entry_path(game):
+    return os.path.join(game_dir(game), game["entry"])
+
+
+def asset_paths(game):
+    return [os.path.join(game_dir(game), name) for name in game.get("assets", {})]
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(PREWARM_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _load_cache():
+    try:
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache):
+    tmp = f"{CACHE_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp, CACHE_FILE)
+    except OSError as e:
+        print(f"⚠ Could not write registry cache: {e}")
+
+
+def validate_files(name, paths, hashes=None, full=False):
+    """
+    Check that files exist (and match their hashes), reusing the cached result
+    Each file is stat'ed once: if the manifest and every file's size and
+    mtime are unchanged, the cached result is returned without hashing.
+    Otherwise only files whose size or mtime changed since the last check
+    are hashed again. full=True ignores the cache.
+    Returns:
+        dict: ok, missing and mismatched file lists
+    """
+    hashes = hashes or {}
+    stamps = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamps[path] = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            stamps[path] = None
+    quick_key = [_mtime(MANIFEST_FILE)] + [stamps[path] for path in sorted(paths)]
+
+    cache = _load_cache()
+    entry = cache.get(name, {})
+    if not full and entry.get("key") == quick_key and entry.get("paths") == sorted(paths):
+        return entry["result"]
+
+    known = {} if full else entry.get("files", {})
+    files = {}
+    missing = []
+    mismatched = []
+    for path in paths:
+        stamp = stamps[path]
+        if stamp is None:
+            missing.append(os.path.relpath(path, BASE_DIR))
+            continue
+
+        expected = hashes.get(path)
+        record = known.get(path)
+        if record and record["stamp"] == stamp:
+            digest = record["hash"]
+        elif expected:
+            digest = file_hash(path)
+        else:
+            digest = None
+        files[path] = {"stamp": stamp, "hash": digest}
+        if expected and digest != expected:
+            mismatched.append(os.path.relpath(path, BASE_DIR))
+
+    result = {"ok": not missing and not mismatched, "missing": missing,
+              "mismatched": mismatched, "checked_at": time.time()}
+    cache[name] = {"key": quick_key, "paths": sorted(paths), "files": files, "result": result}
+    _save_cache(cache)
+    return result
+
+
+def validate(game, full=False):
+    """Validate a game's entry point and manifest assets"""
+    root = game_dir(game)
+    hashes = {os.path.join(root, name): digest for name, digest in game.get("assets", {}).items()}
+    return validate_files(game["key"], [entry_path(game)] + list(hashes), hashes, full)
+
+
+def prewarm(game):
+    """
+    Read a game's assets into the OS page cache in the background
+    Meant for when the game is highlighted in a menu, so the load on
+    launch doesn't wait on the SD card. Images are loaded from their
+    arcade_assets cache entries, so those are read instead of the source
+    file when there are any. Each game is prewarmed once.
+    """
+    with _prewarm_lock:
+        if game["key"] in _prewarmed:
+            return
+        _prewarmed.add(game["key"])
+
+    def read_assets():
+        # Imported here: arcade_assets pulls in pygame, which the registry doesn't need
+        import arcade_assets
+
+        for path in asset_paths(game):
+            entries = []
+            if os.path.splitext(path)[1].lower() in arcade_assets.IMAGE_EXTENSIONS:
+                entries = arcade_assets.cache_entries(path)
+            for name in entries or [path]:
+                read_file(name)
+
+    def read_file(path):
+        try:
+            with open(path, "rb") as f:
+                while f.read(PREWARM_CHUNK):
+                    pass
+        except OSError:
+            pass
+
+    threading.Thread(target=read_assets, daemon=True).start()
+
+
+def update_hashes():
+    """Re-hash every listed asset and write the hashes back to the manifest"""
+    with open(MANIFEST_FILE, encoding="utf-8") as f:
+        manifest = json.load(f)
+    for game in manifest["games"]:
+        root = game_dir(game)
+        for name in game.get("assets", {}):
+            path = os.path.join(root, name)
+            game["assets"][name] = file_hash(path) if os.path.exists(path) else None
+    with open(MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="List and validate the arcade games")
+    parser.add_argument("--full", action="store_true", help="Ignore the cache and re-hash every asset")
+    parser.add_argument("--update-hashes", action="store_true",
+                        help="Write the current asset hashes into games.json")
+    args = parser.parse_args()
+
+    if args.update_hashes:
+        update_hashes()
+        print(f"✓ Updated hashes in {MANIFEST_FILE}")
+
+    failed = False
+    for game in load_games():
+        start = time.perf_counter()
+        result = validate(game, full=args.full)
+        elapsed = (time.perf_counter() - start) * 1000
+        if result["ok"]:
+            print(f"✓ {game['name']}: {len(game.get('assets', {}))} assets OK ({elapsed:.1f} ms)")
+            continue
+        failed = True
+        print(f"❌ {game['name']}:")
+        for path in result["missing"]:
+            print(f"- Missing: {path}")
+        for path in result["mismatched"]:
+            print(f"- Changed: {path}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
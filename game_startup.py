@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Fast game start-up for the arcade games
+Only the display and font subsystems are started up front: the mixer opens
+with the first sound (arcade_audio) and controllers when a run starts
+(arcade_input). A loading screen is presented right after the window
+opens and redrawn between asset-loading steps, so the cabinet shows
+something immediately after a coin-in and the window keeps answering
+while the rest loads. Steps are marked on the startup trace
+(startup_profile, ARCADE_STARTUP_TRACE).
+"""
+
+import pygame
+
+import startup_profile
+from hud_text import render_text
+from render_scale import draw_rect, present
+
+BACKGROUND = (12, 16, 28)
+BAR_COLOR = (90, 200, 120)
+BAR_BACK = (50, 56, 72)
+TEXT_COLOR = (230, 230, 230)
+
+
+def init_subsystems():
+    """Start the display and fonts - instead of pygame.init(), which opens every subsystem"""
+    pygame.display.init()
+    pygame.font.init()
+    startup_profile.mark("pygame")
+
+
+def no_progress(label):
+    """Default for load_assets(progress=...)"""
+
+
+class LoadingScreen:
+    """Progress bar drawn on the game's display between load steps"""
+
+    def __init__(self, screen, title, steps=None):
+        self.screen = screen
+        self.title = title
+        self.steps = steps
+        self.done = 0
+        self.font = pygame.font.Font(None, 56)
+        self.small_font = pygame.font.Font(None, 28)
+        self.draw("")
+        startup_profile.mark("first frame")
+
+    def step(self, label):
+        """Mark a finished load step and redraw; use as load_assets(progress=...)"""
+        self.done += 1
+        startup_profile.mark(f"load {label}")
+        # Keeps the window responsive (and the OS from flagging it) while loading
+        pygame.event.pump()
+        self.draw(label)
+
+    def draw(self, label):
+        screen = self.screen
+        width, height = screen.get_size()
+        screen.fill(BACKGROUND)
+        title = render_text(self.font, self.title, TEXT_COLOR)
+        screen.blit(title, (width // 2 - title.get_width() // 2, height // 2 - 80))
+
+        bar = pygame.Rect(width // 4, height // 2, width // 2, 24)
+        draw_rect(screen, BAR_BACK, bar)
+        if self.steps:
+            filled = bar.copy()
+            filled.width = bar.width * min(self.done, self.steps) // self.steps
+            draw_rect(screen, BAR_COLOR, filled)
+
+        if label:
+            text = render_text(self.small_font, f"Loaded {label}", TEXT_COLOR)
+            screen.blit(text, (width // 2 - text.get_width() // 2, height // 2 + 40))
+        present(screen)
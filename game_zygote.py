@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Prefork zygote for the arcade games
+Imports pygame and the game modules and maps every game image's decoded
+pixels from the asset cache (decoding the images that aren't cached yet),
+then forks a child per launch request. The child only opens the display and
+enters the game loop; the pixels are shared through the page cache or
+copy-on-write.
+"""
+
+import argparse
+import gc
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from arcade_events import ZYGOTE_SOCKET, acquire_instance_lock, request, service_available
+from arcade_supervisor import is_supervised, notify_supervisor
+from game_registry import asset_paths
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOCK_FILE = os.environ.get("ARCADE_ZYGOTE_LOCK", "/tmp/arcade_zygote.lock")
+
+EXIT_CODES_KEPT = 32
+
+
+def ensure_zygote_running():
+    """Start the zygote in the background unless one is already listening"""
+    if service_available(ZYGOTE_SOCKET):
+        return False
+    subprocess.Popen([sys.executable, os.path.join(BASE_DIR, "game_zygote.py")],
+                     start_new_session=True)
+    return True
+
+
+def launch_game(key):
+    """
+    Start a game, forked from the zygote if it is running
+    Falls back to a fresh game host process otherwise. Under the supervisor
+    the request goes to the supervisor, which owns the game process.
+    Returns:
+        int: PID of the game process (None if the supervisor started it)
+    """
+    if is_supervised():
+        reply = notify_supervisor("launch", game=key)
+        if reply and reply.get("ok"):
+            return None
+        print("⚠ Supervisor did not answer, launching directly")
+
+    if service_available(ZYGOTE_SOCKET):
+        reply = request(ZYGOTE_SOCKET, {"cmd": "launch", "game": key})
+        if reply and reply.get("ok"):
+            return reply["pid"]
+        print(f"⚠ Zygote launch failed: {reply.get('error') if reply else 'no reply'}")
+
+    process = subprocess.Popen([sys.executable, os.path.join(BASE_DIR, "game_host.py"), "--game", key])
+    return process.pid
+
+
+class Zygote:
+    """Warm parent process that forks one child per game launch"""
+
+    def __init__(self, socket_path=ZYGOTE_SOCKET):
+        self.socket_path = socket_path
+        self.server = None
+        self.running = False
+        self.games = {}      # key -> (game, module)
+        self.images = {}     # absolute path -> decoded (unconverted) Surface, if not cached
+        self.mapped = 0      # Asset cache entries mapped
+        self.children = {}   # pid -> game key
+        self.exit_codes = {}  # pid -> exit code of recently finished children
+        self.launches = 0
+        self.preload_time = 0.0
+
+    def preload(self):
+        """Import everything and map or decode images - without opening a display"""
+        start = time.perf_counter()
+        import pygame
+        import arcade_assets
+        import game_startup  # noqa: F401 - imported so children don't pay for it
+        try:
+            import numpy  # noqa: F401 - imported so children don't pay for it
+        except ImportError:
+            pass
+        import game_host
+
+        for game in game_host.GAMES:
+            try:
+                self.games[game["key"]] = (game, game_host.load_game_module(game))
+            except Exception as e:
+                print(f"⚠ Could not import {game['name']}: {e}")
+                continue
+
+            # Cached pixels are only mapped here; pygame.image.load needs no
+            # video mode either, and convert() happens in the child once its
+            # display is open
+            for path in asset_paths(game):
+                if os.path.splitext(path)[1].lower() in arcade_assets.IMAGE_EXTENSIONS:
+                    mapped = arcade_assets.preload(path)
+                    self.mapped += mapped
+                    if mapped:
+                        continue
+                    try:
+                        self.images[path] = pygame.image.load(path)
+                    except (pygame.error, FileNotFoundError) as e:
+                        print(f"⚠ Could not decode {path}: {e}")
+
+        # Keep the garbage collector from touching (and un-sharing) these pages
+        gc.collect()
+        gc.freeze()
+
+        self.preload_time = time.perf_counter() - start
+        print(f"✓ Preloaded {len(self.games)} games, {self.mapped} cached and "
+              f"{len(self.images)} decoded images in {self.preload_time:.2f} s")
+
+    def start(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.socket_path)
+        self.server.listen(8)
+        self.server.settimeout(1.0)
+        self.running = True
+        print(f"✓ Zygote listening on {self.socket_path}")
+
+    def serve(self):
+        """Handle one request per connection, reaping finished children in between"""
+        while self.running:
+            self.reap()
+            try:
+                client, _ = self.server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                if self.running:
+                    continue
+                break
+
+            with client:
+                client.settimeout(2.0)
+                try:
+                    message = json.loads(self.read_line(client))
+                    reply = self.handle(message)
+                except (OSError, ValueError) as e:
+                    reply = {"ok": False, "error": str(e)}
+                try:
+                    client.sendall((json.dumps({"type": "reply", **reply}) + "\n").encode())
+                except OSError:
+                    pass
+
+    def read_line(self, client):
+        data = b""
+        while b"\n" not in data:
+            chunk = client.recv(4096)
+            if not chunk:
+                break
+            data += chunk
+        return data.split(b"\n", 1)[0]
+
+    def handle(self, message):
+        cmd = message.get("cmd")
+        if cmd == "launch":
+            return self.launch(message.get("game"), message.get("supervised", False))
+        if cmd == "status":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "games": list(self.games),
+                "images": len(self.images),
+                "mapped": self.mapped,
+                "children": {str(pid): key for pid, key in self.children.items()},
+                "exited": {str(pid): code for pid, code in self.exit_codes.items()},
+                "launches": self.launches,
+                "preload_s": round(self.preload_time, 3),
+            }
+        return {"ok": False, "error": f"unknown command: {cmd}"}
+
+    def launch(self, key, supervised=False):
+        entry = None
+        for name, value in self.games.items():
+            if name.lower() == str(key).lower():
+                entry = value
+        if entry is None:
+            return {"ok": False, "error": f"unknown game: {key}"}
+
+        pid = os.fork()
+        if pid == 0:
+            self.run_child(*entry, supervised=supervised)  # Never returns
+
+        self.children[pid] = entry[0]["key"]
+        self.launches += 1
+        print(f"Launched {entry[0]['name']} (pid {pid})")
+        return {"ok": True, "pid": pid, "game": entry[0]["key"]}
+
+    def run_child(self, game, module, supervised=False):
+        """Open the display and play the game in the forked child"""
+        status = 0
+        try:
+            self.server.close()
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+            import pygame
+            self.use_preloaded_images(pygame)
+
+            import arcade_audio
+            import startup_profile
+            from game_startup import LoadingScreen, init_subsystems
+            from render_scale import open_display
+            # Timed from the fork
+            startup_profile.begin_trace(game["key"], "fork")
+            arcade_audio.pre_init()
+            init_subsystems()
+            screen = open_display(module.WINDOW_SIZE)
+            pygame.display.set_caption(game["name"])
+            loading = LoadingScreen(screen, game["name"], getattr(module, "LOAD_STEPS", None))
+            assets = module.load_assets(progress=loading.step)
+            if assets is None:
+                status = 1
+            else:
+                result = module.run(screen, assets)
+                print(f"{game['name']} finished: {result.get('reason')} (score {result.get('score')})")
+                if result.get("reason") != "quit" and not supervised:
+                    # Return to the start screen, like the standalone games
+                    subprocess.Popen([sys.executable, os.path.join(BASE_DIR, "app.py")])
+            pygame.quit()
+        except Exception as e:
+            print(f"❌ {game['name']} crashed: {e}")
+            status = 1
+        finally:
+            sys.stdout.flush()
+            os._exit(status)
+
+    def use_preloaded_images(self, pygame):
+        """Serve pygame.image.load() from the images decoded before the fork"""
+        images = self.images
+        load = pygame.image.load
+
+        def preloaded_load(file, namehint=""):
+            if isinstance(file, str):
+                surface = images.get(os.path.abspath(file))
+                if surface is not None:
+                    return surface
+            return load(file, namehint)
+
+        pygame.image.load = preloaded_load
+
+    def reap(self):
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.children.clear()
+                return
+            if pid == 0:
+                return
+            key = self.children.pop(pid, None)
+            code = os.waitstatus_to_exitcode(status)
+            self.exit_codes[pid] = code
+            while len(self.exit_codes) > EXIT_CODES_KEPT:
+                self.exit_codes.pop(next(iter(self.exit_codes)))
+            if key:
+                print(f"{key} (pid {pid}) exited with status {code}")
+
+    def stop(self, *args):
+        self.running = False
+
+    def close(self):
+        if self.server:
+            self.server.close()
+            self.server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Prefork zygote for fast game launches")
+    parser.add_argument("--launch", default=None,
+                        help="Ask the running zygote to launch this game and exit")
+    parser.add_argument("--status", action="store_true", help="Print the running zygote's status")
+    args = parser.parse_args()
+
+    if args.launch:
+        print(f"✓ Launched {args.launch} (pid {launch_game(args.launch)})")
+        return
+    if args.status:
+        reply = request(ZYGOTE_SOCKET, {"cmd": "status"})
+        print(json.dumps(reply, indent=2) if reply else "❌ Zygote is not running")
+        return
+
+    lock = acquire_instance_lock(LOCK_FILE)
+    if lock is None:
+        print("Game zygote already running")
+        return
+
+    zygote = Zygote()
+    signal.signal(signal.SIGTERM, zygote.stop)
+    signal.signal(signal.SIGINT, zygote.stop)
+
+    try:
+        zygote.preload()
+        zygote.start()
+        zygote.serve()
+    finally:
+        zygote.close()
+        lock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Sensor backends for the HC-SR04 ultrasonic detector
+The real RPi.GPIO implementation plus a simulated sensor that replays
+distance traces on a virtual clock, so the detection loop can be run
+and benchmarked off-device
+"""
+
+import csv
+import random
+import threading
+import time
+
+SPEED_OF_SOUND_CM_PER_NS = 0.0000343  # 343 m/s
+
+
+class SensorBackend:
+    """
+    Interface the detection loop talks to
+
+    ping() fires one trigger pulse and returns the echo pulse width in
+    nanoseconds (None if no echo arrived within the timeout). monotonic()
+    and sleep() are the clock the loop runs on, so a simulated backend
+    can run it faster than real time.
+    """
+
+    name = "backend"
+
+    def setup(self, trig_pin, echo_pin):
+        pass
+
+    def ping(self, timeout):
+        raise NotImplementedError
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def cleanup(self):
+        pass
+
+
+class EchoTimer:
+    """
+    Captures echo pulse edges with GPIO interrupts
+    Each ping waits on an event with a timeout instead of spinning on
+    GPIO.input(), so a missed echo costs at most the timeout and no CPU.
+    Only a rising edge followed by a falling one is timed: clone modules
+    hold echo high for ~150 ms without an echo, and the end of that pulse
+    must not be taken for the start of the next one.
+    """
+
+    def __init__(self, gpio, pin):
+        self.gpio = gpio
+        self.pin = pin
+        self.edges = []  # [rise] or [rise, fall]
+        self.done = threading.Event()
+        self.interrupts = False
+
+    def start(self):
+        """Register the edge callback; falls back to bounded polling if unavailable"""
+        try:
+            self.gpio.add_event_detect(self.pin, self.gpio.BOTH, callback=self._on_edge)
+            self.interrupts = True
+        except RuntimeError as e:
+            print(f"Edge detection unavailable, polling echo instead: {e}")
+            self.interrupts = False
+
+    def _on_edge(self, channel):
+        # Timestamp first - the callback thread adds latency to everything after
+        now = time.perf_counter_ns()
+        # RPi.GPIO doesn't pass the edge direction - read the level instead.
+        # A pulse already over when its rise is handled (under ~2 cm) is missed.
+        high = self.gpio.input(self.pin) == 1
+        if not self.edges:
+            if high:
+                self.edges.append(now)
+        elif len(self.edges) == 1 and not high:
+            self.edges.append(now)
+            self.done.set()
+
+    def arm(self):
+        """
+        Reset before sending a trigger pulse
+        Returns:
+            bool: False if echo is still high from the previous ping - skip this one
+        """
+        self.edges = []
+        self.done.clear()
+        return self.gpio.input(self.pin) == 0
+
+    def wait_for_pulse(self, timeout):
+        """Return the echo pulse width in nanoseconds, or None on timeout"""
+        if self.interrupts:
+            if not self.done.wait(timeout):
+                return None
+            rise, fall = self.edges[:2]
+            return fall - rise
+        return self._poll_pulse(timeout)
+
+    def _poll_pulse(self, timeout):
+        """Polling fallback - still bounded by the timeout"""
+        deadline = time.perf_counter_ns() + int(timeout * 1e9)
+
+        # Wait for echo to start - timed from a low-to-high transition only,
+        # so an echo still high from the previous ping isn't timed from its middle
+        while self.gpio.input(self.pin) == 1:
+            if time.perf_counter_ns() > deadline:
+                return None
+        while self.gpio.input(self.pin) == 0:
+            if time.perf_counter_ns() > deadline:
+                return None
+        pulse_start = time.perf_counter_ns()
+
+        # Wait for echo to end
+        while self.gpio.input(self.pin) == 1:
+            if time.perf_counter_ns() > deadline:
+                return None
+        return time.perf_counter_ns() - pulse_start
+
+
+class RPiGPIOBackend(SensorBackend):
+    """HC-SR04 wired to the Raspberry Pi GPIO header"""
+
+    name = "rpi"
+
+    def __init__(self):
+        self.gpio = None
+        self.trig_pin = None
+        self.echo_timer = None
+
+    def setup(self, trig_pin, echo_pin):
+        # Imported here so the detector can be imported on machines without GPIO
+        import RPi.GPIO as GPIO
+        self.gpio = GPIO
+        self.trig_pin = trig_pin
+
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(trig_pin, GPIO.OUT)
+        GPIO.setup(echo_pin, GPIO.IN)
+
+        self.echo_timer = EchoTimer(GPIO, echo_pin)
+        self.echo_timer.start()
+
+    def ping(self, timeout):
+        if not self.echo_timer.arm():
+            return None  # Previous echo still high: reported as a missed reading
+
+        # Send trigger pulse
+        self.gpio.output(self.trig_pin, True)
+        time.sleep(0.00001)  # 10 microseconds
+        self.gpio.output(self.trig_pin, False)
+
+        return self.echo_timer.wait_for_pulse(timeout)
+
+    def cleanup(self):
+        if self.gpio:
+            self.gpio.cleanup()
+
+
+def load_trace(path):
+    """Load a distance trace from a CSV file with time_s,distance_cm rows"""
+    trace = []
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            if not row or row[0].startswith("#"):
+                continue
+            try:
+                trace.append((float(row[0]), float(row[1])))
+            except ValueError:
+                continue  # Header line
+    trace.sort()
+    return trace
+
+
+def synthetic_trace(duration=300.0, background=120.0, approach_every=20.0,
+                    approach_distance=15.0, hold=3.0, ramp=1.0, step=0.01):
+    """
+    Build a trace of an empty deposit slot with periodic approaches
+    Each approach ramps from background to approach_distance over `ramp`
+    seconds, holds for `hold` seconds and ramps back out.
+    """
+    trace = []
+    t = 0.0
+    while t <= duration:
+        phase = t % approach_every
+        start = approach_every / 2
+        if phase < start or phase > start + 2 * ramp + hold:
+            distance = background
+        elif phase < start + ramp:
+            distance = background - (background - approach_distance) * (phase - start) / ramp
+        elif phase < start + ramp + hold:
+            distance = approach_distance
+        else:
+            distance = approach_distance + (background - approach_distance) * (phase - start - ramp - hold) / ramp
+        trace.append((round(t, 4), distance))
+        t += step
+    return trace
+
+
+class SimulatedHCSR04Backend(SensorBackend):
+    """
+    Simulated HC-SR04 replaying a distance trace on a virtual clock
+
+    Pings sample the trace at the current virtual time with Gaussian noise,
+    a fixed echo latency and random dropouts (no echo). sleep() only
+    advances the virtual clock, scaled down by `speed` in real time
+    (speed=0 runs as fast as possible).
+    """
+
+    name = "simulated"
+
+    def __init__(self, trace, echo_latency=0.0005, noise_cm=1.0, dropout_rate=0.02,
+                 max_range_cm=400.0, speed=0, seed=None):
+        self.trace = trace
+        self.echo_latency = echo_latency
+        self.noise_cm = noise_cm
+        self.dropout_rate = dropout_rate
+        self.max_range_cm = max_range_cm
+        self.speed = speed
+        self.rng = random.Random(seed)
+        self.now = trace[0][0] if trace else 0.0
+        self.index = 0
+        self.pings = 0
+        self.dropouts = 0
+
+    @property
+    def finished(self):
+        return not self.trace or self.now > self.trace[-1][0]
+
+    def true_distance(self, t=None):
+        """Ground-truth distance from the trace at time t (step interpolation)"""
+        t = self.now if t is None else t
+        if t < self.trace[self.index][0]:
+            self.index = 0
+        while self.index + 1 < len(self.trace) and self.trace[self.index + 1][0] <= t:
+            self.index += 1
+        return self.trace[self.index][1]
+
+    def ping(self, timeout):
+        self.pings += 1
+        self._advance(self.echo_latency)
+
+        distance = self.true_distance()
+        if self.noise_cm:
+            distance += self.rng.gauss(0.0, self.noise_cm)
+
+        if self.rng.random() < self.dropout_rate or not 2.0 <= distance <= self.max_range_cm:
+            self.dropouts += 1
+            self._advance(timeout)
+            return None
+
+        pulse_ns = int(2 * distance / SPEED_OF_SOUND_CM_PER_NS)
+        if pulse_ns / 1e9 > timeout:
+            self._advance(timeout)
+            return None
+
+        self._advance(pulse_ns / 1e9)
+        return pulse_ns
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self._advance(seconds)
+
+    def _advance(self, seconds):
+        self.now += seconds
+        if self.speed:
+            time.sleep(seconds / self.speed)
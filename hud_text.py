@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Cached HUD rendering shared by the arcade games
+Rendered text is kept in an LRU keyed by (font, text, colour), so a score
+is only rasterized again when its value changes, and panel backgrounds are
+built once per size and colour
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+MAX_TEXT_ENTRIES = 256
+
+
+class TextCache:
+    """LRU of rendered text surfaces"""
+
+    def __init__(self, max_entries=MAX_TEXT_ENTRIES):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.panels = {}
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """Same as font.render(text, antialias, color), but cached"""
+        key = (font, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        if pygame.display.get_surface() is not None:
+            # Display-format surfaces blit faster every frame
+            surface = surface.convert_alpha()
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def panel(self, size, color, alpha=255):
+        """Solid (optionally semi-transparent) background surface, built once"""
+        key = (tuple(size), color, alpha)
+        surface = self.panels.get(key)
+        if surface is None:
+            surface = pygame.Surface(key[0])
+            surface.fill(color)
+            if alpha < 255:
+                surface.set_alpha(alpha)
+            self.panels[key] = surface
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+        self.panels.clear()
+
+    def stats(self):
+        return {"entries": len(self.surfaces), "panels": len(self.panels),
+                "hits": self.hits, "misses": self.misses}
+
+
+# Shared by every game running in the process
+text_cache = TextCache()
+
+
+def render_text(font, text, color, antialias=True):
+    return text_cache.render(font, text, color, antialias)
+
+
+def panel(size, color, alpha=255):
+    return text_cache.panel(size, color, alpha)
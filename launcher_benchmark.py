@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the launchers
+Starts a launcher repeatedly on the offscreen Qt platform, collects its
+startup timeline (imports, app init, first paint, ready) and fails when
+first paint is slower than the allowed threshold
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Seconds from process creation to the first painted frame
+DEFAULT_MAX_FIRST_PAINT = 2.5
+
+
+def run_once(launcher, timeout=60):
+    """
+    Start the launcher once and read back its startup report
+    Returns:
+        dict: Seconds since process start for each phase, or None on failure
+    """
+    fd, report_path = tempfile.mkstemp(suffix=".json", prefix="arcade_startup_")
+    os.close(fd)
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    try:
+        subprocess.run([sys.executable, launcher, "--exit-after-startup", "--startup-report", report_path],
+                       env=env, timeout=timeout, stdout=subprocess.DEVNULL, check=True)
+        with open(report_path) as f:
+            report = json.load(f)
+    except (subprocess.SubprocessError, OSError, ValueError) as e:
+        print(f"❌ {os.path.basename(launcher)} failed to start: {e}")
+        return None
+    finally:
+        os.unlink(report_path)
+    return {phase["phase"]: phase["at_s"] for phase in report["phases"]}
+
+
+def summarize(runs):
+    """Median/min/max per phase over all successful runs"""
+    summary = {}
+    for phase in runs[0]:
+        values = [run[phase] for run in runs if phase in run]
+        summary[phase] = {
+            "median": round(statistics.median(values), 4),
+            "min": round(min(values), 4),
+            "max": round(max(values), 4),
+        }
+    return summary
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Launcher cold-start benchmark")
+    parser.add_argument("--launcher", default="main.py", help="Launcher script (main.py or main_simple.py)")
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold starts")
+    parser.add_argument("--max-first-paint", type=float, default=DEFAULT_MAX_FIRST_PAINT,
+                        help="Fail if the median first paint is slower than this (seconds)")
+    parser.add_argument("--report", default=None, help="Write the JSON report to this path")
+    args = parser.parse_args()
+
+    launcher = os.path.join(BASE_DIR, args.launcher)
+    runs = []
+    for i in range(args.runs):
+        result = run_once(launcher)
+        if result is None:
+            sys.exit(1)
+        runs.append(result)
+        print(f"Run {i + 1}: " + " | ".join(f"{phase} {at:.2f} s" for phase, at in result.items()))
+
+    summary = summarize(runs)
+    print(f"\n{args.launcher} over {len(runs)} runs (median / min / max):")
+    for phase, stats in summary.items():
+        print(f"  {phase:<12} {stats['median']:.3f} / {stats['min']:.3f} / {stats['max']:.3f} s")
+
+    first_paint = summary.get("first_paint", {}).get("median")
+    regression = first_paint is not None and first_paint > args.max_first_paint
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({
+                "launcher": args.launcher,
+                "runs": runs,
+                "summary": summary,
+                "max_first_paint_s": args.max_first_paint,
+                "regression": regression,
+            }, f, indent=2)
+        print(f"✓ Report written to: {args.report}")
+
+    if regression:
+        print(f"❌ First paint {first_paint:.2f} s exceeds {args.max_first_paint:.2f} s")
+        sys.exit(1)
+    print(f"✓ First paint within {args.max_first_paint:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
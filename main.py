@@ -5,296 +5,307 @@ A PySide6 application for launching games from the Arcade Thesis project
 """
 
 import sys
+
+# Started before the Qt imports so the timeline includes them
+from startup_profile import StartupTimeline
+timeline = StartupTimeline("main")
+
+import argparse
 import os
-import subprocess
-import platform
-from pathlib import Path
-from typing import Optional
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QFrame, QScrollArea, QGridLayout,
-    QMessageBox, QProgressBar, QSpacerItem, QSizePolicy
+    QPushButton, QLabel, QFrame, QGridLayout
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont
 
+from game_registry import load_games, validate
+
+timeline.mark("imports")
+
+# Games from the shared games.json manifest
+GAMES = load_games()
+
+def darken_color(color: str, factor: float = 0.2) -> str:
+    """Darken a hex color by a factor"""
+    # Remove # if present
+    color = color.lstrip('#')
+
+    # Convert to RGB
+    r = int(color[0:2], 16)
+    g = int(color[2:4], 16)
+    b = int(color[4:6], 16)
+
+    # Darken
+    r = max(0, int(r * (1 - factor)))
+    g = max(0, int(g * (1 - factor)))
+    b = max(0, int(b * (1 - factor)))
+
+    # Convert back to hex
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+def build_stylesheet(games: list) -> str:
+    """
+    One application-wide stylesheet for the whole launcher
+    Widgets are styled through object names and a "game" property instead
+    of per-widget setStyleSheet() calls, so Qt parses the rules only once.
+    """
+    sheet = """
+        QMainWindow {
+            background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+                stop:0 #ecf0f1, stop:1 #bdc3c7);
+        }
+        QWidget {
+            font-family: 'Segoe UI', Arial, sans-serif;
+        }
+        QLabel#title {
+            color: #2c3e50;
+            margin-bottom: 10px;
+        }
+        QLabel#subtitle {
+            color: #7f8c8d;
+            margin-bottom: 20px;
+        }
+        QFrame#game_card {
+            background-color: white;
+            border-radius: 15px;
+            padding: 20px;
+        }
+        QFrame#game_card:hover {
+            background-color: #f8f9fa;
+        }
+        QLabel#game_description {
+            color: #2c3e50;
+            font-size: 12px;
+        }
+        QPushButton#launch_button {
+            color: white;
+            border: none;
+            border-radius: 8px;
+            padding: 12px;
+            font-size: 14px;
+            font-weight: bold;
+        }
+        QLabel#footer_info {
+            color: #7f8c8d;
+            font-size: 10px;
+        }
+    """
+    for game in games:
+        key = game["key"]
+        color = game["color"]
+        sheet += f"""
+        QFrame#game_card[game="{key}"] {{
+            border: 2px solid {color};
+        }}
+        QLabel#game_icon[game="{key}"], QLabel#game_title[game="{key}"] {{
+            color: {color};
+        }}
+        QPushButton#launch_button[game="{key}"] {{
+            background-color: {color};
+        }}
+        QPushButton#launch_button[game="{key}"]:hover {{
+            background-color: {darken_color(color)};
+        }}
+        QPushButton#launch_button[game="{key}"]:pressed {{
+            background-color: {darken_color(color, 0.3)};
+        }}
+        """
+    return sheet
+
 class GameLauncher(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Arcade Thesis - Game Launcher")
         self.setMinimumSize(800, 600)
         self.setup_ui()
-        self.setup_styles()
-        
+
     def setup_ui(self):
-        """Setup the main user interface"""
+        """Setup the window frame; the game cards are added by build_deferred()"""
         # Central widget
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
-        
+
         # Main layout
-        main_layout = QVBoxLayout(central_widget)
-        main_layout.setContentsMargins(20, 20, 20, 20)
-        main_layout.setSpacing(20)
-        
+        self.main_layout = QVBoxLayout(central_widget)
+        self.main_layout.setContentsMargins(20, 20, 20, 20)
+        self.main_layout.setSpacing(20)
+
         # Header
         header = self.create_header()
-        main_layout.addWidget(header)
-        
+        self.main_layout.addWidget(header)
+        self.main_layout.addStretch()
+
+    def build_deferred(self, warm_zygote: bool = True):
+        """Build the rest of the window after the first frame is on screen"""
+        # Replace the placeholder stretch with the games and footer
+        self.main_layout.takeAt(self.main_layout.count() - 1)
+
         # Games section
         games_section = self.create_games_section()
-        main_layout.addWidget(games_section)
-        
+        self.main_layout.addWidget(games_section)
+
         # Footer
         footer = self.create_footer()
-        main_layout.addWidget(footer)
-        
+        self.main_layout.addWidget(footer)
+
+        if warm_zygote:
+            # Warm up the game zygote while the player is choosing
+            from game_zygote import ensure_zygote_running
+            ensure_zygote_running()
+
     def create_header(self) -> QWidget:
         """Create the header section"""
         header_widget = QWidget()
         header_layout = QVBoxLayout(header_widget)
         header_layout.setContentsMargins(0, 0, 0, 0)
-        
+
         # Title
         title_label = QLabel("🎮 Arcade Thesis")
+        title_label.setObjectName("title")
         title_label.setAlignment(Qt.AlignCenter)
         title_font = QFont()
         title_font.setPointSize(24)
         title_font.setBold(True)
         title_label.setFont(title_font)
-        title_label.setStyleSheet("color: #2c3e50; margin-bottom: 10px;")
-        
+
         # Subtitle
         subtitle_label = QLabel("Choose your adventure from our collection of games")
+        subtitle_label.setObjectName("subtitle")
         subtitle_label.setAlignment(Qt.AlignCenter)
         subtitle_font = QFont()
         subtitle_font.setPointSize(12)
         subtitle_label.setFont(subtitle_font)
-        subtitle_label.setStyleSheet("color: #7f8c8d; margin-bottom: 20px;")
-        
+
         header_layout.addWidget(title_label)
         header_layout.addWidget(subtitle_label)
-        
+
         return header_widget
-    
+
     def create_games_section(self) -> QWidget:
         """Create the games selection section"""
         games_widget = QWidget()
         games_layout = QVBoxLayout(games_widget)
         games_layout.setContentsMargins(0, 0, 0, 0)
         games_layout.setSpacing(20)
-        
+
         # Games grid
         games_grid = QGridLayout()
         games_grid.setSpacing(20)
-        
-        # Define games
-        games = [
-            {
-                "name": "Traffic Dash",
-                "description": "Navigate through traffic and collect water bottles in this exciting driving game",
-                "folder": "TrafficDash",
-                "main_file": "main.py",
-                "icon": "🚗",
-                "color": "#3498db"
-            },
-            {
-                "name": "Cycle Forest",
-                "description": "Adventure through a mystical forest on your bicycle in this action-packed game",
-                "folder": "Cycleforest",
-                "main_file": "main.py",
-                "icon": "🌲",
-                "color": "#27ae60"
-            },
-            {
-                "name": "Asteroid Shooter",
-                "description": "Defend against asteroids in this classic space shooter game",
-                "folder": "GameShooter",
-                "main_file": "asteriodShooter.py",
-                "icon": "🚀",
-                "color": "#e74c3c"
-            }
-        ]
-        
+
         # Create game cards
-        for i, game in enumerate(games):
+        for i, game in enumerate(GAMES):
             game_card = self.create_game_card(game)
             row = i // 2
             col = i % 2
             games_grid.addWidget(game_card, row, col)
-        
+
         games_layout.addLayout(games_grid)
-        
+
         return games_widget
-    
+
     def create_game_card(self, game_info: dict) -> QWidget:
         """Create a game card widget"""
         card = QFrame()
+        card.setObjectName("game_card")
+        card.setProperty("game", game_info["key"])
         card.setFrameStyle(QFrame.Box)
         card.setLineWidth(2)
-        card.setStyleSheet(f"""
-            QFrame {{
-                background-color: white;
-                border: 2px solid {game_info['color']};
-                border-radius: 15px;
-                padding: 20px;
-            }}
-            QFrame:hover {{
-                background-color: #f8f9fa;
-                border-color: {game_info['color']};
-            }}
-        """)
-        
+
         card_layout = QVBoxLayout(card)
         card_layout.setSpacing(15)
-        
+
         # Game icon and title
         header_layout = QHBoxLayout()
-        
+
         icon_label = QLabel(game_info["icon"])
+        icon_label.setObjectName("game_icon")
+        icon_label.setProperty("game", game_info["key"])
         icon_label.setFont(QFont("Arial", 32))
         icon_label.setAlignment(Qt.AlignCenter)
-        icon_label.setStyleSheet(f"color: {game_info['color']};")
-        
+
         title_label = QLabel(game_info["name"])
+        title_label.setObjectName("game_title")
+        title_label.setProperty("game", game_info["key"])
         title_font = QFont()
         title_font.setPointSize(16)
         title_font.setBold(True)
         title_label.setFont(title_font)
-        title_label.setStyleSheet(f"color: {game_info['color']};")
-        
+
         header_layout.addWidget(icon_label)
         header_layout.addWidget(title_label)
         header_layout.addStretch()
-        
+
         # Description
         desc_label = QLabel(game_info["description"])
+        desc_label.setObjectName("game_description")
         desc_label.setWordWrap(True)
-        desc_label.setStyleSheet("color: #2c3e50; font-size: 12px;")
-        
+
         # Launch button
         launch_btn = QPushButton("🎮 Launch Game")
-        launch_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {game_info['color']};
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 12px;
-                font-size: 14px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {self.darken_color(game_info['color'])};
-            }}
-            QPushButton:pressed {{
-                background-color: {self.darken_color(game_info['color'], 0.3)};
-            }}
-        """)
-        
+        launch_btn.setObjectName("launch_button")
+        launch_btn.setProperty("game", game_info["key"])
+
         # Connect button to launch function
         launch_btn.clicked.connect(lambda: self.launch_game(game_info))
-        
+
         card_layout.addLayout(header_layout)
         card_layout.addWidget(desc_label)
         card_layout.addWidget(launch_btn)
-        
+
         return card
-    
+
     def create_footer(self) -> QWidget:
         """Create the footer section"""
+        import platform
+
         footer_widget = QWidget()
         footer_layout = QHBoxLayout(footer_widget)
         footer_layout.setContentsMargins(0, 0, 0, 0)
-        
+
         # System info
         system_info = QLabel(f"System: {platform.system()} {platform.release()}")
-        system_info.setStyleSheet("color: #7f8c8d; font-size: 10px;")
-        
+        system_info.setObjectName("footer_info")
+
         # Version info
         version_info = QLabel("Arcade Thesis v1.0")
-        version_info.setStyleSheet("color: #7f8c8d; font-size: 10px;")
-        
+        version_info.setObjectName("footer_info")
+
         footer_layout.addWidget(system_info)
         footer_layout.addStretch()
         footer_layout.addWidget(version_info)
-        
+
         return footer_widget
-    
-    def setup_styles(self):
-        """Setup application-wide styles"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 #ecf0f1, stop:1 #bdc3c7);
-            }
-            QWidget {
-                font-family: 'Segoe UI', Arial, sans-serif;
-            }
-        """)
-    
-    def darken_color(self, color: str, factor: float = 0.2) -> str:
-        """Darken a hex color by a factor"""
-        # Remove # if present
-        color = color.lstrip('#')
-        
-        # Convert to RGB
-        r = int(color[0:2], 16)
-        g = int(color[2:4], 16)
-        b = int(color[4:6], 16)
-        
-        # Darken
-        r = max(0, int(r * (1 - factor)))
-        g = max(0, int(g * (1 - factor)))
-        b = max(0, int(b * (1 - factor)))
-        
-        # Convert back to hex
-        return f"#{r:02x}{g:02x}{b:02x}"
-    
+
     def launch_game(self, game_info: dict):
         """Launch the selected game"""
+        # Only needed once a game is picked
+        from PySide6.QtWidgets import QMessageBox
+        from game_zygote import launch_game
+
         try:
-            # Get the game directory
-            current_dir = Path(__file__).parent
-            game_dir = current_dir / game_info["folder"]
-            main_file = game_dir / game_info["main_file"]
-            
-            # Check if game directory and main file exist
-            if not game_dir.exists():
-                QMessageBox.critical(
-                    self,
-                    "Game Not Found",
-                    f"Game directory not found: {game_dir}"
-                )
-                return
-            
-            if not main_file.exists():
+            # Cached preflight check - unchanged installs aren't re-verified
+            result = validate(game_info)
+            if not result["ok"]:
+                problems = [f"Missing: {path}" for path in result["missing"]]
+                problems += [f"Changed: {path}" for path in result["mismatched"]]
                 QMessageBox.critical(
                     self,
                     "Game Not Found",
-                    f"Main file not found: {main_file}"
+                    f"{game_info['name']} is not installed correctly:\n" + "\n".join(problems)
                 )
                 return
-            
-            # Launch the game
-            print(f"Launching {game_info['name']} from {main_file}")
-            
-            # Change to game directory and launch
-            if platform.system() == "Windows":
-                subprocess.Popen([
-                    sys.executable, str(main_file)
-                ], cwd=str(game_dir))
-            else:
-                subprocess.Popen([
-                    sys.executable, str(main_file)
-                ], cwd=str(game_dir))
-            
+
+            # Fork the game from the warm zygote (falls back to a new game host process)
+            print(f"Launching {game_info['name']}")
+            launch_game(game_info["key"])
+
             # Show success message and exit
             # Exit the main application to avoid interference with pygame
             self.close()
             sys.exit(0)
-            
+
         except Exception as e:
             QMessageBox.critical(
                 self,
@@ -309,16 +320,41 @@ class GameLauncherApp(QApplication):
         self.setApplicationVersion("1.0")
         self.setOrganizationName("Arcade Thesis Project")
 
+        # Set before any widget exists so nothing is polished twice
+        self.setStyleSheet(build_stylesheet(GAMES))
+
 def main():
     """Main application entry point"""
-    app = GameLauncherApp(sys.argv)
-    
-    # Create and show the main window
+    parser = argparse.ArgumentParser(description="Arcade Thesis game launcher")
+    parser.add_argument("--startup-report", default=os.environ.get("ARCADE_STARTUP_REPORT"),
+                        help="Write the startup timeline to this JSON file")
+    parser.add_argument("--exit-after-startup", action="store_true",
+                        help="Quit once the window is fully built (for benchmarks)")
+    args, qt_args = parser.parse_known_args()
+
+    app = GameLauncherApp(sys.argv[:1] + qt_args)
+    timeline.mark("app_init")
+
+    # Create and show the main window - only the header is built at this point
     window = GameLauncher()
     window.show()
-    
+    app.processEvents()
+    timeline.mark("first_paint")
+
+    def finish_startup():
+        window.build_deferred(warm_zygote=not args.exit_after_startup)
+        app.processEvents()
+        timeline.mark("ready")
+        print(f"Startup: {timeline.summary()}")
+        if args.startup_report:
+            timeline.write(args.startup_report)
+        if args.exit_after_startup:
+            app.quit()
+
+    QTimer.singleShot(0, finish_startup)
+
     # Start the application event loop
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
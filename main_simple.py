@@ -4,56 +4,93 @@ Simple Game Launcher for Arcade Thesis
 A clean PyQt6 application for launching games
 """
 
-from PyQt6.QtWidgets import QApplication, QWidget, QPushButton, QVBoxLayout, QLabel, QFrame
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont, QPalette, QColor
+# Started before the Qt imports so the timeline includes them
+from startup_profile import StartupTimeline
+timeline = StartupTimeline("main_simple")
+
+from PyQt6.QtWidgets import QApplication, QWidget, QPushButton, QVBoxLayout, QLabel
+from PyQt6.QtCore import Qt, QObject, QTimer, pyqtSignal
+import argparse
 import subprocess
 import sys
 import os
 
+from arcade_events import DEPOSIT_SOCKET, EventSubscriber, service_available
+from game_zygote import ensure_zygote_running, launch_game
+from arcade_supervisor import is_supervised
+from game_registry import load_games
+
+timeline.mark("imports")
+
+# Applied once to the application instead of per window
+STYLESHEET = """
+    QWidget {
+        background-color: #1a1a2e;
+        color: #ffffff;
+    }
+    QLabel#welcome {
+        font-size: 32px;
+        color: #4ecca3;
+        padding: 20px;
+        border-radius: 10px;
+        background-color: #16213e;
+        margin: 20px;
+        text-align: center;
+        font-weight: bold;
+        font-family: 'Segoe UI', Arial, sans-serif;
+    }
+    QPushButton {
+        font-size: 18px;
+        color: #ffffff;
+        border: none;
+        padding: 15px;
+        border-radius: 8px;
+        background-color: #0f3460;
+        margin: 10px 20px;
+        text-align: center;
+        font-weight: bold;
+        font-family: 'Segoe UI', Arial, sans-serif;
+    }
+    QPushButton:hover {
+        background-color: #4ecca3;
+        color: #1a1a2e;
+    }
+    QPushButton:pressed {
+        background-color: #2a9d8f;
+    }
+    QLabel#deposit_status {
+        font-size: 16px;
+        color: #4ecca3;
+        text-align: center;
+    }
+"""
+
+class EventListener(QObject):
+    """Forwards one type of arcade event from a detector socket to the Qt thread"""
+    received = pyqtSignal(dict)
+    
+    def __init__(self, socket_path, event_type):
+        super().__init__()
+        self.event_type = event_type
+        self.subscriber = EventSubscriber(socket_path, self.on_event)
+    
+    def on_event(self, event):
+        if event.get("type") == self.event_type:
+            self.received.emit(event)
+    
+    def start(self):
+        self.subscriber.start()
+    
+    def stop(self):
+        self.subscriber.stop()
+
 class MainWindow(QWidget):
     def __init__(self):
         super().__init__()
         self.is_launching_game = False
+        self.credits = 0
         self.setWindowTitle("Recycle Arcade")
         self.setMinimumSize(800, 480)
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #1a1a2e;
-                color: #ffffff;
-            }
-            QLabel#welcome {
-                font-size: 32px;
-                color: #4ecca3;
-                padding: 20px;
-                border-radius: 10px;
-                background-color: #16213e;
-                margin: 20px;
-                text-align: center;
-                font-weight: bold;
-                font-family: 'Segoe UI', Arial, sans-serif;
-            }
-            QPushButton {
-                font-size: 18px;
-                color: #ffffff;
-                border: none;
-                padding: 15px;
-                border-radius: 8px;
-                background-color: #0f3460;
-                margin: 10px 20px;
-                text-align: center;
-                font-weight: bold;
-                font-family: 'Segoe UI', Arial, sans-serif;
-            }
-            QPushButton:hover {
-                background-color: #4ecca3;
-                color: #1a1a2e;
-                transition: all 0.3s;
-            }
-            QPushButton:pressed {
-                background-color: #2a9d8f;
-            }
-        """)
 
         # Create main layout with spacing
         layout = QVBoxLayout()
@@ -65,68 +102,100 @@ class MainWindow(QWidget):
         self.label.setObjectName('welcome')
         self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        # Create buttons with modern styling
-        self.play_button = QPushButton("🚀 Play Asteroid Game")
-        self.play_button.clicked.connect(self.launch_game)
-        self.play_button.setCursor(Qt.CursorShape.PointingHandCursor)
-
-        self.play_button2 = QPushButton("🌲 Play Cycle Forest")
-        self.play_button2.clicked.connect(self.launch_game2)
-        self.play_button2.setCursor(Qt.CursorShape.PointingHandCursor)
+        # Deposit status from the YOLO service
+        self.deposit_status = QLabel("")
+        self.deposit_status.setObjectName('deposit_status')
+        self.deposit_status.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        self.play_button3 = QPushButton("🚗 Play Traffic Dash")
-        self.play_button3.clicked.connect(self.launch_game3)
-        self.play_button3.setCursor(Qt.CursorShape.PointingHandCursor)
+        # One button per game in the games.json manifest
+        self.play_buttons = []
+        for game in load_games():
+            button = QPushButton(f"{game['icon']} Play {game['name']}")
+            button.clicked.connect(lambda checked=False, key=game["key"]: self.start_game(key))
+            button.setCursor(Qt.CursorShape.PointingHandCursor)
+            self.play_buttons.append(button)
 
         # Add widgets to layout
         layout.addWidget(self.label)
+        layout.addWidget(self.deposit_status)
         layout.addStretch(1)
-        layout.addWidget(self.play_button)
-        layout.addWidget(self.play_button2)
-        layout.addWidget(self.play_button3)
+        for button in self.play_buttons:
+            layout.addWidget(button)
         layout.addStretch(1)
 
         self.setLayout(layout)
 
-    def launch_game(self):
-        """Launch Asteroid Game and exit"""
-        self.is_launching_game = True
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        subprocess.Popen([sys.executable, os.path.join(current_dir, "GameShooter", "asteriodShooter.py")])
-        self.close()
-        sys.exit(0)  # Complete exit to avoid interference
+        # Subscribe to bottle deposits instead of relying on the ultrasonic detector
+        self.deposit_listener = EventListener(DEPOSIT_SOCKET, "deposit")
+        self.deposit_listener.received.connect(self.on_bottle_deposited)
 
-    def launch_game2(self):
-        """Launch Cycle Forest and exit"""
-        self.is_launching_game = True
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        subprocess.Popen([sys.executable, os.path.join(current_dir, "Cycleforest", "main.py")])
-        self.close()
-        sys.exit(0)  # Complete exit to avoid interference
+    def start_services(self, warm_zygote=True):
+        """Start the background work once the first frame is on screen"""
+        self.deposit_listener.start()
+
+        if warm_zygote:
+            # Warm up the game zygote while the player is choosing
+            ensure_zygote_running()
 
-    def launch_game3(self):
-        """Launch Traffic Dash and exit"""
+    def on_bottle_deposited(self, event):
+        """Show the deposit reported by the YOLO service"""
+        self.credits += 1
+        self.deposit_status.setText(f"♻ Bottle received! Credits: {self.credits}")
+
+    def start_game(self, key):
+        """Launch a game and exit"""
         self.is_launching_game = True
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        subprocess.Popen([sys.executable, os.path.join(current_dir, "TrafficDash", "main.py")])
+        launch_game(key)
         self.close()
         sys.exit(0)  # Complete exit to avoid interference
 
     def closeEvent(self, event):
         """Handle window close event"""
-        if not self.is_launching_game:
-            # If not launching a game, restart the ultrasonic detector
+        self.deposit_listener.stop()
+        if not self.is_launching_game and not service_available(DEPOSIT_SOCKET) and not is_supervised():
+            # If not launching a game, make sure the ultrasonic daemon is up and
+            # return to the start screen, which subscribes to its presence events
+            # (not needed while the headless deposit service is running, and
+            # the supervisor brings the start screen back itself)
             try:
-                subprocess.Popen([sys.executable, "ultrasonic_detector.py"])
+                from ultrasonic_detector import ensure_daemon_running
+                ensure_daemon_running()
+                current_dir = os.path.dirname(os.path.abspath(__file__))
+                subprocess.Popen([sys.executable, os.path.join(current_dir, "app.py")])
             except:
                 pass
         event.accept()
 
 def main():
     """Main application entry point"""
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Recycle Arcade launcher")
+    parser.add_argument("--startup-report", default=os.environ.get("ARCADE_STARTUP_REPORT"),
+                        help="Write the startup timeline to this JSON file")
+    parser.add_argument("--exit-after-startup", action="store_true",
+                        help="Quit once startup has finished (for benchmarks)")
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    app.setStyleSheet(STYLESHEET)
+    timeline.mark("app_init")
+
     window = MainWindow()
     window.show()
+    app.processEvents()
+    timeline.mark("first_paint")
+
+    def finish_startup():
+        window.start_services(warm_zygote=not args.exit_after_startup)
+        timeline.mark("ready")
+        print(f"Startup: {timeline.summary()}")
+        if args.startup_report:
+            timeline.write(args.startup_report)
+        if args.exit_after_startup:
+            window.is_launching_game = True  # Don't bring the start screen back
+            window.close()
+            app.quit()
+
+    QTimer.singleShot(0, finish_startup)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
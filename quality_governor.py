@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Dynamic quality governor shared by the arcade games
+Watches the busy part of each frame (frame time minus the clock wait) from
+a game's FrameProfiler, and optionally the SoC temperature, and steps the
+quality levers the game registered down when frames run over budget or the
+Pi gets hot, and back up once there is headroom again. Steps are spaced out
+(hysteresis), so the game settles on a steady frame rate instead of
+oscillating between levels.
+"""
+
+import os
+import time
+
+import pygame
+
+import arcade_replay
+from frame_profiler import PhaseStats
+
+ENABLED = os.environ.get("ARCADE_GOVERNOR", "1") != "0"
+THERMAL_PATH = os.environ.get("ARCADE_THERMAL_PATH", "/sys/class/thermal/thermal_zone0/temp")
+EVALUATE_FRAMES = 60       # Frames between decisions
+DOWN_RATIO = 1.0           # p95 busy time above this share of the budget is over budget
+UP_RATIO = 0.6             # ... and below this share there is room to step back up
+DOWN_AFTER = 2             # Consecutive bad evaluations before stepping down
+UP_AFTER = 5               # Consecutive good evaluations before stepping up
+HOT_C = 75.0               # Step down above this temperature (the Pi throttles at 80-85)
+COOL_C = 65.0              # Only step back up below this one
+THERMAL_INTERVAL = 2.0     # Seconds between temperature reads
+
+
+class Lever:
+    """One quality setting: its levels from best to cheapest and how to apply them"""
+
+    def __init__(self, name, levels, apply):
+        self.name = name
+        self.levels = list(levels)
+        self.apply = apply
+        self.level = 0
+
+    @property
+    def value(self):
+        return self.levels[self.level]
+
+
+class QualityGovernor:
+    """Steps one game's levers to keep its frames within budget"""
+
+    def __init__(self, profiler, target_fps=60, enabled=ENABLED, thermal_path=THERMAL_PATH):
+        self.profiler = profiler
+        self.target_fps = target_fps
+        self.enabled = enabled
+        self.thermal_path = thermal_path
+        self.levers = {}
+        self.levels = {}   # Lever name -> level, kept across runs (the Pi stays hot)
+        self.history = []  # Names of the levers stepped down, most recent last
+        self.busy = PhaseStats(EVALUATE_FRAMES)
+        self.seen_frame = 0
+        self.bad = 0
+        self.good = 0
+        self.up_after = UP_AFTER
+        self.last_step = None
+        self.temperature = None
+        self.thermal_read = 0.0
+
+    def reset(self):
+        """Forget the previous run's levers (their levels are kept)"""
+        self.levers = {}
+        self.busy = PhaseStats(EVALUATE_FRAMES)
+        self.seen_frame = self.profiler.frame
+        self.bad = self.good = 0
+
+    def register(self, name, levels, apply):
+        """
+        Add a quality lever for the current run
+        Args:
+            name: Lever name, e.g. "render_scale"
+            levels: Values from best quality to cheapest
+            apply: Called with a value whenever the lever changes (and once now)
+        """
+        lever = Lever(name, levels, apply)
+        lever.level = arcade_replay.sync_level(name, min(self.levels.get(name, 0), len(lever.levels) - 1))
+        self.levers[name] = lever
+        apply(lever.value)
+        return lever
+
+    def value(self, name, default=None):
+        lever = self.levers.get(name)
+        return lever.value if lever is not None else default
+
+    @property
+    def budget_ms(self):
+        return 1000 / self.target_fps
+
+    def read_temperature(self):
+        """SoC temperature in °C, re-read every few seconds (None if unavailable)"""
+        now = time.monotonic()
+        if self.thermal_path and now - self.thermal_read >= THERMAL_INTERVAL:
+            self.thermal_read = now
+            try:
+                with open(self.thermal_path) as f:
+                    self.temperature = int(f.read().strip()) / 1000
+            except (OSError, ValueError):
+                self.thermal_path = None
+                self.temperature = None
+        return self.temperature
+
+    def update(self):
+        """Call once per frame, after profiler.start_frame()"""
+        if not self.levers:
+            return
+        session = arcade_replay.active
+        if session is not None and session.replaying:
+            # Repeat the recorded run's changes instead of measuring this machine
+            for name, level in session.pending_levels():
+                lever = self.levers.get(name)
+                if lever is not None:
+                    self.set_level(lever, level)
+            return
+        if not self.enabled:
+            return
+        trace = self.profiler.trace
+        if self.profiler.frame == self.seen_frame or not trace:
+            return
+        self.seen_frame = self.profiler.frame
+        _, frame_ms, phases = trace[-1]
+        self.busy.add(frame_ms - phases.get("wait", 0.0))
+        if self.seen_frame % EVALUATE_FRAMES == 0:
+            self.evaluate()
+
+    def evaluate(self):
+        if len(self.busy.samples) < EVALUATE_FRAMES // 2:
+            return  # Just after a change
+        p95 = self.busy.percentile(0.95)
+        temperature = self.read_temperature()
+        hot = temperature is not None and temperature >= HOT_C
+        cool = temperature is None or temperature < COOL_C
+
+        if hot or p95 > self.budget_ms * DOWN_RATIO:
+            self.bad += 1
+            self.good = 0
+        elif cool and p95 < self.budget_ms * UP_RATIO:
+            self.good += 1
+            self.bad = 0
+        else:
+            self.bad = self.good = 0
+
+        if self.bad >= DOWN_AFTER:
+            self.bad = 0
+            self.step_down(p95, temperature)
+        elif self.good >= self.up_after:
+            self.good = 0
+            self.step_up(p95, temperature)
+
+    def step_down(self, p95, temperature):
+        """Lower the least-degraded lever (earlier registrations go first on ties)"""
+        candidates = [lever for lever in self.levers.values() if lever.level < len(lever.levels) - 1]
+        if not candidates:
+            return False
+        lever = min(candidates, key=lambda lever: lever.level)
+        if self.last_step == "up":
+            # Stepping back up didn't hold: wait longer before trying again
+            self.up_after = min(self.up_after * 2, UP_AFTER * 8)
+        self.set_level(lever, lever.level + 1)
+        self.history.append(lever.name)
+        self.last_step = "down"
+        self.report("down", lever, p95, temperature)
+        return True
+
+    def step_up(self, p95, temperature):
+        """Undo the most recent step down that still applies to this run"""
+        for index in range(len(self.history) - 1, -1, -1):
+            lever = self.levers.get(self.history[index])
+            if lever is not None and lever.level > 0:
+                del self.history[index]
+                self.set_level(lever, lever.level - 1)
+                self.last_step = "up"
+                self.report("up", lever, p95, temperature)
+                return True
+        return False
+
+    def set_level(self, lever, level):
+        lever.level = level
+        self.levels[lever.name] = level
+        lever.apply(lever.value)
+        session = arcade_replay.active
+        if session is not None and not session.replaying:
+            session.level(lever.name, level)
+        # Frames around a change aren't representative of the new level
+        self.busy = PhaseStats(EVALUATE_FRAMES)
+
+    def report(self, direction, lever, p95, temperature):
+        heat = f", {temperature:.0f}°C" if temperature is not None else ""
+        print(f"⚠ {self.profiler.name}: quality {direction} - {lever.name} = {lever.value} "
+              f"(p95 {p95:.1f} ms of {self.budget_ms:.1f} ms{heat})")
+
+    def status(self):
+        return {name: lever.value for name, lever in self.levers.items()}
+
+
+def music_lever(governor):
+    """Register pausing the streamed music as a lever (saves the decoder's CPU time)"""
+    def apply(enabled):
+        if pygame.mixer.get_init():
+            if enabled:
+                pygame.mixer.music.unpause()
+            else:
+                pygame.mixer.music.pause()
+
+    return governor.register("music", (True, False), apply)
+
+
+def fps_lever(governor, levels, apply):
+    """Register a frame-rate cap as a lever; the frame budget follows the cap"""
+    def set_fps(fps):
+        governor.target_fps = fps
+        apply(fps)
+
+    return governor.register("fps", levels, set_fps)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Render-resolution scaling for the arcade games
+Games keep drawing in their own (logical) coordinates onto the surface
+returned by open_display(). With a render scale below 1 that surface is a
+smaller offscreen target: blits are scaled (scaled copies of the sources
+are cached) and the frame is upscaled to the window once in present().
+"""
+
+import os
+import weakref
+
+import pygame
+
+# Fraction of the logical resolution to render at (1.0 = native, no proxy)
+RENDER_SCALE = float(os.environ.get("ARCADE_RENDER_SCALE", "1.0"))
+# "blit": one scale blit into a full-size window; "scaled": window opened at
+# the render size with pygame.SCALED so SDL's renderer does the upscale
+UPSCALE_MODE = os.environ.get("ARCADE_RENDER_UPSCALE", "blit")
+MIN_SCALE = 0.25
+# Scales the quality governor steps through. The software upscale of the
+# "blit" mode costs more than 0.75 saves, so it goes straight to 0.5.
+GOVERNOR_STEPS = {"blit": (0.5,), "scaled": (0.75, 0.5)}
+
+_target = None
+
+
+class ScaledSurface(pygame.Surface):
+    """Offscreen render target that maps logical coordinates to its smaller size"""
+
+    def __init__(self, logical_size, scale, window):
+        self.logical_size = tuple(logical_size)
+        self.scale = scale
+        self.window = window
+        self.scaled_sources = weakref.WeakKeyDictionary()
+        size = (max(1, round(logical_size[0] * scale)), max(1, round(logical_size[1] * scale)))
+        super().__init__(size, 0, window)
+
+    def scaled(self, source):
+        """Scaled copy of a source surface, made once per surface object"""
+        copy = self.scaled_sources.get(source)
+        if copy is None:
+            width, height = source.get_size()
+            size = (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+            try:
+                copy = pygame.transform.smoothscale(source, size)
+            except ValueError:  # smoothscale needs 24/32-bit surfaces
+                copy = pygame.transform.scale(source, size)
+            if source.get_colorkey() is not None:
+                copy.set_colorkey(source.get_colorkey())
+            self.scaled_sources[source] = copy
+        return copy
+
+    def to_target(self, rect):
+        scale = self.scale
+        rect = pygame.Rect(rect)
+        return pygame.Rect(round(rect.x * scale), round(rect.y * scale),
+                           round(rect.width * scale), round(rect.height * scale))
+
+    def to_logical(self, rect):
+        scale = self.scale
+        return pygame.Rect(round(rect.x / scale), round(rect.y / scale),
+                           round(rect.width / scale), round(rect.height / scale))
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        if not isinstance(source, ScaledSurface):
+            source = self.scaled(source)
+        dest = (round(dest[0] * self.scale), round(dest[1] * self.scale))
+        if area is not None:
+            area = self.to_target(area)
+        return self.to_logical(super().blit(source, dest, area, special_flags))
+
+    def blits(self, blit_sequence, doreturn=1):
+        rects = [self.blit(*item) for item in blit_sequence]
+        return rects if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0):
+        if rect is not None:
+            rect = self.to_target(rect)
+        return self.to_logical(super().fill(color, rect, special_flags))
+
+    def get_size(self):
+        return self.logical_size
+
+    def get_width(self):
+        return self.logical_size[0]
+
+    def get_height(self):
+        return self.logical_size[1]
+
+    def get_rect(self, **kwargs):
+        rect = pygame.Rect((0, 0), self.logical_size)
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    def present(self):
+        """Upscale the finished frame to the window"""
+        if self.window.get_size() == pygame.Surface.get_size(self):
+            self.window.blit(self, (0, 0))  # SDL's renderer scales it (pygame.SCALED)
+        else:
+            pygame.transform.scale(self, self.window.get_size(), self.window)
+
+
+def open_display(logical_size, scale=None, flags=0):
+    """
+    Open the window for a game and return the surface it should draw on
+    Returns the display surface itself at scale 1.0, otherwise a ScaledSurface.
+    """
+    global _target
+    scale = RENDER_SCALE if scale is None else scale
+    scale = max(MIN_SCALE, min(1.0, scale))
+    if scale >= 1.0:
+        _target = None
+        return pygame.display.set_mode(logical_size, flags)
+
+    if UPSCALE_MODE == "scaled":
+        size = (round(logical_size[0] * scale), round(logical_size[1] * scale))
+        window = pygame.display.set_mode(size, flags | pygame.SCALED)
+    else:
+        window = pygame.display.set_mode(logical_size, flags)
+    _target = ScaledSurface(logical_size, scale, window)
+    return _target
+
+
+def present(surface=None):
+    """Replacement for pygame.display.update() in the game loops"""
+    if _target is not None and (surface is None or surface is _target):
+        _target.present()
+    pygame.display.update()
+
+
+def mouse_pos(pos=None):
+    """A window mouse position (default: pygame.mouse.get_pos()) in logical coordinates"""
+    x, y = pygame.mouse.get_pos() if pos is None else pos
+    if _target is not None and _target.window.get_size() != _target.logical_size:
+        window_width, window_height = _target.window.get_size()
+        x = x * _target.logical_size[0] / window_width
+        y = y * _target.logical_size[1] / window_height
+        return int(x), int(y)
+    return x, y
+
+
+def draw_rect(surface, color, rect, **kwargs):
+    """pygame.draw.rect() that also works on a ScaledSurface"""
+    if isinstance(surface, ScaledSurface):
+        if "width" in kwargs and kwargs["width"] > 0:
+            kwargs["width"] = max(1, round(kwargs["width"] * surface.scale))
+        if "border_radius" in kwargs:
+            kwargs["border_radius"] = round(kwargs["border_radius"] * surface.scale)
+        return surface.to_logical(pygame.draw.rect(surface, color, surface.to_target(rect), **kwargs))
+    return pygame.draw.rect(surface, color, rect, **kwargs)
+
+
+def scale_levels():
+    """Render scales for the quality governor, starting from the configured one"""
+    steps = GOVERNOR_STEPS.get(UPSCALE_MODE, GOVERNOR_STEPS["blit"])
+    return [RENDER_SCALE] + [scale for scale in steps if scale < RENDER_SCALE]
+
+
+def current_surface():
+    """The surface games should draw on for the window as it is now"""
+    return _target if _target is not None else pygame.display.get_surface()
+
+
+def rescale(surface, scale):
+    """
+    Switch a game's draw surface to another render scale
+    Returns the surface unchanged if it already renders at that scale,
+    otherwise reopens the display and returns the new target.
+    """
+    current = surface.scale if isinstance(surface, ScaledSurface) else 1.0
+    if current == scale and surface is current_surface():
+        return surface
+    logical_size = surface.get_size()
+    flags = surface.window.get_flags() if isinstance(surface, ScaledSurface) else surface.get_flags()
+    return open_display(logical_size, scale, flags & pygame.FULLSCREEN)
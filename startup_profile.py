@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Startup timeline for the launchers and games
+Records when each startup phase finished, measured from process creation
+so interpreter start-up is included, and writes it as a JSON report.
+Games record a trace of their init and load steps up to the first frame
+when ARCADE_STARTUP_TRACE is set (a file, or a directory for one file per start).
+"""
+
+import json
+import os
+import sys
+import time
+
+TRACE_PATH = os.environ.get("ARCADE_STARTUP_TRACE")
+
+_trace = None
+
+
+def process_age():
+    """Seconds since this process was created (Linux), or 0 if unknown"""
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+class StartupTimeline:
+    """Named startup phases with their time since process start"""
+
+    def __init__(self, name, from_process_start=True, phase="interpreter"):
+        self.name = name
+        self.marks = []
+        if from_process_start:
+            self.origin = time.perf_counter() - process_age()
+            self.mark(phase)
+        else:
+            self.origin = time.perf_counter()
+
+    def mark(self, phase):
+        self.marks.append((phase, time.perf_counter() - self.origin))
+
+    def elapsed(self, phase):
+        for name, at in self.marks:
+            if name == phase:
+                return at
+        return None
+
+    def report(self):
+        phases = []
+        previous = 0.0
+        for name, at in self.marks:
+            phases.append({"phase": name, "at_s": round(at, 4), "delta_s": round(at - previous, 4)})
+            previous = at
+        return {
+            "name": self.name,
+            "python": sys.version.split()[0],
+            "phases": phases,
+            "total_s": round(previous, 4),
+        }
+
+    def summary(self):
+        return " | ".join(f"{name} {at:.2f} s" for name, at in self.marks)
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+
+def begin_trace(name, phase="imports", from_process_start=True):
+    """
+    Start tracing a game's startup if ARCADE_STARTUP_TRACE is set
+    The first mark (phase) covers process start up to this call.
+    from_process_start=False times from now instead, e.g. for a game
+    started by a long-running host.
+    """
+    global _trace
+    _trace = StartupTimeline(name, from_process_start, phase) if TRACE_PATH else None
+    return _trace
+
+
+def mark(phase):
+    """Mark a startup phase of the traced game (no-op unless tracing)"""
+    if _trace is not None:
+        _trace.mark(phase)
+
+
+def finish_trace(phase="first game frame"):
+    """Mark the last phase and write the trace file"""
+    global _trace
+    if _trace is None:
+        return None
+    trace, _trace = _trace, None
+    trace.mark(phase)
+    path = TRACE_PATH
+    if os.path.isdir(path):
+        path = os.path.join(path, f"startup_{trace.name}_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.json")
+    try:
+        trace.write(path)
+    except OSError as e:
+        print(f"❌ Could not write startup trace: {e}")
+        return None
+    print(f"✓ Startup {trace.summary()}")
+    print(f"✓ Startup trace written to: {path}")
+    return path
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Off-device benchmark for the ultrasonic trigger logic
+Runs the real detection loop against a simulated HC-SR04 at accelerated
+time and reports detection latency and false-trigger rates for the
+DETECTION_DISTANCE / LAUNCH_COOLDOWN settings
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+import ultrasonic_detector
+from gpio_backends import SimulatedHCSR04Backend, load_trace, synthetic_trace
+
+# Triggers this long after an object leaves still count as that approach
+EPISODE_TOLERANCE = 0.2
+
+
+def presence_episodes(trace, threshold):
+    """Ground-truth (start, end) intervals where the trace is within threshold"""
+    episodes = []
+    start = None
+    for t, distance in trace:
+        if distance <= threshold and start is None:
+            start = t
+        elif distance > threshold and start is not None:
+            episodes.append((start, t))
+            start = None
+    if start is not None:
+        episodes.append((start, trace[-1][0]))
+    return episodes
+
+
+def run_simulation(trace, echo_latency=0.0005, noise_cm=1.0, dropout_rate=0.02, seed=None):
+    """
+    Run the detection loop over a trace on a simulated sensor
+    Returns:
+        dict: Latency, miss and false-trigger statistics
+    """
+    backend = SimulatedHCSR04Backend(trace, echo_latency=echo_latency, noise_cm=noise_cm,
+                                     dropout_rate=dropout_rate, seed=seed)
+    ultrasonic_detector.init_sensor(backend)
+
+    triggers = []
+    wall_start = time.perf_counter()
+    ultrasonic_detector.detection_loop(
+        lambda: triggers.append(backend.monotonic()),
+        should_stop=lambda: backend.finished,
+        verbose=False
+    )
+    wall_time = time.perf_counter() - wall_start
+
+    episodes = presence_episodes(trace, ultrasonic_detector.DETECTION_DISTANCE)
+    latencies = []
+    matched = set()
+    for start, end in episodes:
+        for i, t in enumerate(triggers):
+            if start <= t <= end + EPISODE_TOLERANCE and i not in matched:
+                latencies.append(t - start)
+                matched.add(i)
+                break
+
+    false_triggers = len(triggers) - len(matched)
+    duration = trace[-1][0] - trace[0][0] if trace else 0.0
+    ordered = sorted(latencies)
+
+    return {
+        "duration_s": round(duration, 2),
+        "wall_time_s": round(wall_time, 3),
+        "speedup": round(duration / wall_time, 1) if wall_time else 0.0,
+        "detection_distance_cm": ultrasonic_detector.DETECTION_DISTANCE,
+        "launch_cooldown_s": ultrasonic_detector.LAUNCH_COOLDOWN,
+        "pings": backend.pings,
+        "pings_per_second": round(backend.pings / duration, 2) if duration else 0.0,
+        "dropouts": backend.dropouts,
+        "episodes": len(episodes),
+        "detected": len(latencies),
+        "missed": len(episodes) - len(latencies),
+        "false_triggers": false_triggers,
+        "false_triggers_per_hour": round(false_triggers * 3600 / duration, 2) if duration else 0.0,
+        "latency_s": {
+            "mean": round(statistics.fmean(ordered), 4) if ordered else None,
+            "p95": round(ordered[int(0.95 * (len(ordered) - 1))], 4) if ordered else None,
+            "max": round(ordered[-1], 4) if ordered else None,
+        },
+        "sensor": {
+            "echo_latency_s": echo_latency,
+            "noise_cm": noise_cm,
+            "dropout_rate": dropout_rate,
+            "seed": seed,
+        },
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Simulated ultrasonic trigger benchmark")
+    parser.add_argument("trace", nargs="?", default=None,
+                        help="CSV trace of time_s,distance_cm (default: synthetic approaches)")
+    parser.add_argument("--duration", type=float, default=600.0, help="Synthetic trace length in seconds")
+    parser.add_argument("--noise", type=float, default=1.0, help="Gaussian noise in cm")
+    parser.add_argument("--dropout", type=float, default=0.02, help="Probability of a missed echo")
+    parser.add_argument("--latency", type=float, default=0.0005, help="Echo latency in seconds")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for noise and dropouts")
+    parser.add_argument("--distance", type=float, default=None, help="Override DETECTION_DISTANCE")
+    parser.add_argument("--cooldown", type=float, default=None, help="Override LAUNCH_COOLDOWN")
+    parser.add_argument("--report", default=None, help="Write the JSON report to this path")
+    args = parser.parse_args()
+
+    if args.distance is not None:
+        ultrasonic_detector.DETECTION_DISTANCE = args.distance
+    if args.cooldown is not None:
+        ultrasonic_detector.LAUNCH_COOLDOWN = args.cooldown
+
+    trace = load_trace(args.trace) if args.trace else synthetic_trace(duration=args.duration)
+    if not trace:
+        print("❌ Trace is empty")
+        return
+
+    report = run_simulation(trace, args.latency, args.noise, args.dropout, args.seed)
+
+    print(f"Simulated {report['duration_s']} s in {report['wall_time_s']} s ({report['speedup']}x)")
+    print(f"Approaches: {report['episodes']} | Detected: {report['detected']} | "
+          f"Missed: {report['missed']} | False triggers: {report['false_triggers']}")
+    print(f"Latency mean/p95/max: {report['latency_s']['mean']} / "
+          f"{report['latency_s']['p95']} / {report['latency_s']['max']} s")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✓ Report written to: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,17 @@ Ultrasonic Sensor Obstacle Detection for Raspberry Pi
 Replaces camera-based YOLO detection with HC-SR04 ultrasonic sensor
 """
 
-import RPi.GPIO as GPIO
+import argparse
+import json
 import time
 import subprocess
 import sys
 import os
 import signal
+import threading
+
+from gpio_backends import RPiGPIOBackend, SPEED_OF_SOUND_CM_PER_NS
+from arcade_events import PRESENCE_SOCKET, EventPublisher, acquire_instance_lock, service_available
 
 # GPIO pin configuration for HC-SR04 ultrasonic sensor
 TRIG_PIN = 18  # GPIO pin for trigger
@@ -19,18 +24,247 @@ ECHO_PIN = 24  # GPIO pin for echo
 DETECTION_DISTANCE = 30  # Distance in cm to trigger detection
 OBSTACLE_DETECTED = False
 LAST_LAUNCH_TIME = 0
+LAST_DISTANCE = None  # Latest filtered (median) distance
 LAUNCH_COOLDOWN = 5  # Minimum seconds between launches
+RELEASE_HYSTERESIS = 5  # cm beyond DETECTION_DISTANCE before an obstacle counts as gone
+FILTER_WINDOW = 5  # Readings in the median filter window
+
+# Adaptive sampling
+IDLE_INTERVAL = 0.25  # Seconds between readings while nothing is near
+BURST_INTERVAL = 0.03  # Seconds between readings while something approaches
+BURST_FACTOR = 3  # Burst whenever something is within DETECTION_DISTANCE * BURST_FACTOR
+APPROACH_RATE = 20  # cm/s closing speed that counts as an approach
+BURST_HOLD = 1.0  # Seconds to keep bursting after the last approach
+
+# Echo timing
+ECHO_TIMEOUT = 0.03  # Seconds to wait for an echo (~5 m round trip, past the sensor's range)
+
+# Daemon mode: one long-lived detector owns the GPIO pins
+LOCK_FILE = os.environ.get("ARCADE_ULTRASONIC_LOCK", "/tmp/arcade_ultrasonic.lock")
+
+# Telemetry: readings are kept in memory and summarized instead of printed
+TELEMETRY_SIZE = 4096  # Readings kept in the ring buffer (several minutes)
+TELEMETRY_EVENTS = 256  # Trigger/release events kept
+SUMMARY_INTERVAL = 60  # Seconds between summary lines
+TELEMETRY_DUMP = os.environ.get("ARCADE_ULTRASONIC_TELEMETRY", "/tmp/arcade_ultrasonic_telemetry.json")
+
+# Sensor backend (real GPIO by default, or a simulated sensor)
+sensor = None
+
+class RingBuffer:
+    """Fixed-size ring buffer of readings - no allocation per sample"""
+    
+    def __init__(self, size):
+        self.data = [0.0] * size
+        self.size = size
+        self.count = 0
+        self.index = 0
+    
+    def append(self, value):
+        self.data[self.index] = value
+        self.index = (self.index + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+    
+    def clear(self):
+        self.count = 0
+        self.index = 0
+    
+    def values(self):
+        """Stored values, oldest first"""
+        if self.count < self.size:
+            return self.data[:self.count]
+        return self.data[self.index:] + self.data[:self.index]
+    
+    def __len__(self):
+        return self.count
+
+class Telemetry:
+    """
+    In-memory record of readings and trigger events
+    Readings go into fixed-size ring buffers; a one-line summary
+    (min/median/max, errors, triggers) is printed at most once per
+    SUMMARY_INTERVAL, and the full buffer is exported on demand.
+    The sampling loop writes while the event publisher thread exports,
+    so both go through the lock to keep times and distances paired.
+    """
+    
+    def __init__(self, size=TELEMETRY_SIZE, summary_interval=SUMMARY_INTERVAL):
+        self.lock = threading.Lock()
+        self.times = RingBuffer(size)
+        self.distances = RingBuffer(size)
+        self.events = RingBuffer(TELEMETRY_EVENTS)
+        self.summary_interval = summary_interval
+        self.total_readings = 0
+        self.total_triggers = 0
+        self.window_readings = 0
+        self.window_errors = 0
+        self.window_triggers = 0
+        self.window_start = None
+        self.last_summary = None
+    
+    def record_reading(self, now, distance):
+        """Store a reading; -1 marks a missed echo"""
+        with self.lock:
+            self.times.append(now)
+            self.distances.append(distance)
+        self.total_readings += 1
+        self.window_readings += 1
+        if distance <= 0:
+            self.window_errors += 1
+        if self.window_start is None:
+            self.window_start = now
+    
+    def record_event(self, now, kind, distance=None):
+        with self.lock:
+            self.events.append((now, kind, distance))
+        if kind == "trigger":
+            self.total_triggers += 1
+            self.window_triggers += 1
+    
+    def maybe_summarize(self, now):
+        """Print and return a summary if the interval has elapsed, else None"""
+        if self.window_start is None or now - self.window_start < self.summary_interval:
+            return None
+        
+        summary = self.summary(now)
+        print(f"Readings: {summary['readings']} (errors {summary['errors']}) | "
+              f"min/median/max: {summary['min']}/{summary['median']}/{summary['max']} cm | "
+              f"triggers: {summary['triggers']}", flush=True)
+        
+        self.last_summary = summary
+        self.window_readings = 0
+        self.window_errors = 0
+        self.window_triggers = 0
+        self.window_start = now
+        return summary
+    
+    def summary(self, now):
+        """Statistics for the readings since the last summary"""
+        count = min(self.window_readings, len(self.distances))
+        recent = sorted(d for d in self.distances.values()[len(self.distances) - count:] if d > 0)
+        return {
+            "time": now,
+            "readings": self.window_readings,
+            "errors": self.window_errors,
+            "triggers": self.window_triggers,
+            "min": recent[0] if recent else None,
+            "median": recent[len(recent) // 2] if recent else None,
+            "max": recent[-1] if recent else None,
+        }
+    
+    def snapshot(self):
+        """Everything in the buffers, for export over the socket or to a file"""
+        now = sensor.monotonic() if sensor else time.monotonic()
+        with self.lock:
+            readings = list(zip(self.times.values(), self.distances.values()))
+            events = [list(event) for event in self.events.values()]
+        return {
+            "monotonic": now,
+            "wall_time": time.time(),
+            "total_readings": self.total_readings,
+            "total_triggers": self.total_triggers,
+            "last_summary": self.last_summary,
+            "readings": readings,
+            "events": events,
+        }
+    
+    def dump(self, path=TELEMETRY_DUMP):
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f)
+        print(f"Telemetry written to {path}", flush=True)
+
+telemetry = Telemetry()
+
+class PresenceFilter:
+    """
+    Median filter with hysteresis over a sliding window of readings
+    A single noisy echo cannot flip the state: the median has to cross
+    DETECTION_DISTANCE to enter, and DETECTION_DISTANCE + RELEASE_HYSTERESIS
+    to release.
+    """
+    
+    def __init__(self, window=FILTER_WINDOW, enter_distance=None, release_distance=None):
+        self.readings = RingBuffer(window)
+        self.enter_distance = enter_distance
+        self.release_distance = release_distance
+        self.present = False
+        self.median = None
+    
+    def update(self, distance):
+        """Add a reading; returns True when an obstacle has just arrived"""
+        self.readings.append(distance)
+        ordered = sorted(self.readings.values())
+        self.median = ordered[len(ordered) // 2]
+        
+        enter = DETECTION_DISTANCE if self.enter_distance is None else self.enter_distance
+        release = (DETECTION_DISTANCE + RELEASE_HYSTERESIS
+                   if self.release_distance is None else self.release_distance)
+        
+        if not self.present and self.median <= enter:
+            self.present = True
+            return True
+        if self.present and self.median > release:
+            self.present = False
+        return False
+    
+    def reset(self):
+        self.readings.clear()
+        self.present = False
+        self.median = None
+
+class AdaptiveSampler:
+    """
+    Picks the delay before the next reading
+    Idles at IDLE_INTERVAL and bursts to BURST_INTERVAL while something is
+    near or the filtered distance is closing in on the threshold.
+    """
+    
+    def __init__(self):
+        self.last_median = None
+        self.last_time = None
+        self.burst_until = float("-inf")
+    
+    def next_interval(self, median, now):
+        if median is not None:
+            if median <= DETECTION_DISTANCE * BURST_FACTOR:
+                self.burst_until = now + BURST_HOLD
+            elif self.last_median is not None and now > self.last_time:
+                closing_speed = (self.last_median - median) / (now - self.last_time)
+                if closing_speed >= APPROACH_RATE:
+                    self.burst_until = now + BURST_HOLD
+            self.last_median = median
+            self.last_time = now
+        
+        return BURST_INTERVAL if now < self.burst_until else IDLE_INTERVAL
 
-# GPIO setup
-GPIO.setmode(GPIO.BCM)
-GPIO.setup(TRIG_PIN, GPIO.OUT)
-GPIO.setup(ECHO_PIN, GPIO.IN)
+def init_sensor(backend=None):
+    """Set up the sensor backend - RPi.GPIO unless another backend is given"""
+    global sensor
+    sensor = backend or RPiGPIOBackend()
+    sensor.setup(TRIG_PIN, ECHO_PIN)
+    return sensor
 
 def cleanup_gpio():
     """Clean up GPIO pins on exit"""
-    GPIO.cleanup()
+    if sensor:
+        sensor.cleanup()
     print("GPIO cleanup completed")
 
+DUMP_REQUESTED = False
+
+def request_dump(sig, frame):
+    """SIGUSR1: export the telemetry buffer on the next loop iteration"""
+    global DUMP_REQUESTED
+    DUMP_REQUESTED = True
+
+def dump_telemetry():
+    global DUMP_REQUESTED
+    DUMP_REQUESTED = False
+    try:
+        telemetry.dump()
+    except OSError as e:
+        print(f"Failed to write telemetry: {e}")
+
 def signal_handler(sig, frame):
     """Handle Ctrl+C gracefully"""
     print("\nStopping ultrasonic detection...")
@@ -40,25 +274,16 @@ def signal_handler(sig, frame):
 def measure_distance():
     """
     Measure distance using HC-SR04 ultrasonic sensor
-    Returns distance in centimeters
+    Returns distance in centimeters, or -1 if no echo arrived in time
     """
     try:
-        # Send trigger pulse
-        GPIO.output(TRIG_PIN, True)
-        time.sleep(0.00001)  # 10 microseconds
-        GPIO.output(TRIG_PIN, False)
-        
-        # Wait for echo to start
-        while GPIO.input(ECHO_PIN) == 0:
-            pulse_start = time.time()
-        
-        # Wait for echo to end
-        while GPIO.input(ECHO_PIN) == 1:
-            pulse_end = time.time()
+        # Send a trigger pulse and wait for the echo (bounded by ECHO_TIMEOUT)
+        pulse_ns = sensor.ping(ECHO_TIMEOUT)
+        if pulse_ns is None:
+            return -1
         
-        # Calculate distance
-        pulse_duration = pulse_end - pulse_start
-        distance = pulse_duration * 17150  # Speed of sound = 343 m/s, convert to cm
+        # Calculate distance - the pulse covers the round trip
+        distance = pulse_ns * SPEED_OF_SOUND_CM_PER_NS / 2
         distance = round(distance, 2)
         
         return distance
@@ -79,12 +304,135 @@ def launch_main():
     else:
         print(f"Error: {main_script} not found!")
 
+def detection_loop(on_trigger, should_stop=None, verbose=True, on_release=None):
+    """
+    Sample the sensor and call on_trigger() when an obstacle arrives
+    Runs on the sensor backend's clock, so a simulated sensor can drive
+    it faster than real time. Stops when should_stop() returns True.
+    on_release() is called when the obstacle has left again.
+    Readings go to the telemetry ring buffer; with verbose set, only the
+    periodic summaries are printed.
+    """
+    global OBSTACLE_DETECTED, LAST_LAUNCH_TIME, LAST_DISTANCE
+    
+    OBSTACLE_DETECTED = False
+    LAST_LAUNCH_TIME = float("-inf")
+    presence = PresenceFilter()
+    sampler = AdaptiveSampler()
+    
+    while not (should_stop and should_stop()):
+        distance = measure_distance()
+        current_time = sensor.monotonic()
+        telemetry.record_reading(current_time, distance)
+        
+        if distance > 0:
+            was_present = presence.present
+            arrived = presence.update(distance)
+            LAST_DISTANCE = presence.median
+            
+            # Check if obstacle is detected
+            if presence.present:
+                if arrived and (current_time - LAST_LAUNCH_TIME) > LAUNCH_COOLDOWN:
+                    OBSTACLE_DETECTED = True
+                    LAST_LAUNCH_TIME = current_time
+                    telemetry.record_event(current_time, "trigger", presence.median)
+                    on_trigger()
+            else:
+                OBSTACLE_DETECTED = False
+                if was_present:
+                    telemetry.record_event(current_time, "release", presence.median)
+                    if on_release:
+                        on_release()
+        
+        if verbose:
+            telemetry.maybe_summarize(current_time)
+        
+        # Export the buffer when asked (SIGUSR1), outside the signal handler
+        if DUMP_REQUESTED:
+            dump_telemetry()
+        
+        # Sample slowly while idle, quickly while something approaches
+        sensor.sleep(sampler.next_interval(presence.median, current_time))
+
+def ensure_daemon_running():
+    """Start the detector daemon unless one is already publishing
+    
+    Used by the launchers instead of spawning a fresh detector each time.
+    The lock file makes a duplicate start exit straight away.
+    """
+    if service_available(PRESENCE_SOCKET):
+        return False
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    subprocess.Popen([sys.executable, os.path.join(current_dir, "ultrasonic_detector.py"), "--daemon"],
+                     start_new_session=True)
+    return True
+
+def run_daemon():
+    """Long-lived detector that publishes presence events instead of launching apps"""
+    lock = acquire_instance_lock(LOCK_FILE)
+    if lock is None:
+        print("Ultrasonic detector daemon already running")
+        return
+    
+    stopping = False
+    triggers = 0
+    
+    def stop(sig, frame):
+        nonlocal stopping
+        stopping = True
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGUSR1, request_dump)
+    
+    def status(request):
+        if request.get("cmd") == "telemetry":
+            return telemetry.snapshot()
+        return {
+            "pid": os.getpid(),
+            "present": OBSTACLE_DETECTED,
+            "distance": LAST_DISTANCE,
+            "triggers": triggers,
+            "last_summary": telemetry.last_summary
+        }
+    
+    publisher = EventPublisher(PRESENCE_SOCKET, on_request=status)
+    
+    def on_trigger():
+        nonlocal triggers
+        triggers += 1
+        publisher.publish("presence", distance=LAST_DISTANCE, count=triggers)
+    
+    def on_release():
+        publisher.publish("clear", distance=LAST_DISTANCE)
+    
+    print("Starting ultrasonic detector daemon...")
+    print(f"Detection distance: {DETECTION_DISTANCE} cm")
+    
+    try:
+        init_sensor()
+        publisher.start()
+        detection_loop(on_trigger, should_stop=lambda: stopping, on_release=on_release)
+    except Exception as e:
+        print(f"Unexpected error: {e}")
+    finally:
+        publisher.close()
+        cleanup_gpio()
+        lock.close()
+
 def main():
     """Main detection loop"""
-    global OBSTACLE_DETECTED, LAST_LAUNCH_TIME
+    parser = argparse.ArgumentParser(description="Ultrasonic obstacle detection")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Run as a single long-lived daemon publishing presence events")
+    args = parser.parse_args()
+    
+    if args.daemon:
+        run_daemon()
+        return
     
     # Set up signal handler for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGUSR1, request_dump)
     
     print("Starting ultrasonic obstacle detection...")
     print(f"Detection distance: {DETECTION_DISTANCE} cm")
@@ -92,31 +440,8 @@ def main():
     print("-" * 50)
     
     try:
-        while True:
-            distance = measure_distance()
-            
-            if distance > 0:
-                print(f"Distance: {distance} cm", end="")
-                
-                # Check if obstacle is detected
-                if distance <= DETECTION_DISTANCE:
-                    current_time = time.time()
-                    
-                    if not OBSTACLE_DETECTED and (current_time - LAST_LAUNCH_TIME) > LAUNCH_COOLDOWN:
-                        OBSTACLE_DETECTED = True
-                        LAST_LAUNCH_TIME = current_time
-                        print(" - OBSTACLE DETECTED!")
-                        launch_main()
-                    else:
-                        print(" - Obstacle detected (cooldown active)")
-                else:
-                    OBSTACLE_DETECTED = False
-                    print(" - No obstacle")
-            else:
-                print("Error reading sensor")
-            
-            # Small delay to prevent excessive readings
-            time.sleep(0.1)
+        init_sensor()
+        detection_loop(launch_main)
     
     except KeyboardInterrupt:
         print("\nStopping detection...")
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Headless YOLO detector benchmark
+Runs batched inference over a video file or image folder (no camera or
+display needed) and writes per-stage timings, FPS and detection counts
+to a JSON report
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+
+from yolo_raspberry_pi import SimpleYOLODetector, YOLO_AVAILABLE
+from yolo_roi import RegionOfInterest, parse_roi
+
+
+def summarize(values):
+    """Mean/median/p95/max of a list of millisecond timings"""
+    if not values:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(values)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "mean": round(statistics.fmean(ordered), 3),
+        "p50": round(statistics.median(ordered), 3),
+        "p95": round(ordered[p95_index], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def run_benchmark(source, model_path=None, batch_size=1, max_frames=None, warmup_batches=1, roi=None):
+    """
+    Run the detector over a file-based source in batches
+    Args:
+        source: Video file or image folder
+        model_path: Optional model to benchmark (defaults to the detector's lookup)
+        batch_size: Frames per inference call
+        max_frames: Stop after this many measured frames
+        warmup_batches: Batches run before timing starts (model warm-up)
+        roi: Deposit area (parse_roi format) - measures the cropped, letterboxed path
+    Returns:
+        dict: The benchmark report, or None if the detector could not start
+    """
+    detector = SimpleYOLODetector(source=source, model_path=model_path)
+    if not detector.model or not detector.camera:
+        print("❌ Detector failed to initialize")
+        detector.cleanup()
+        return None
+    if roi:
+        detector.roi = RegionOfInterest(parse_roi(roi), imgsz=detector.imgsz)
+
+    stages = {"capture": [], "preprocess": [], "inference": [], "postprocess": [], "batch": []}
+    detections_per_frame = []
+    class_counts = {}
+    measured_frames = 0
+    measured_time = 0.0
+    batch_index = 0
+
+    try:
+        while max_frames is None or measured_frames < max_frames:
+            # Capture a batch through the same path as the headless service:
+            # the downscaled inference frame, or the full frame with an ROI
+            frames = []
+            capture_times = []
+            while len(frames) < batch_size:
+                start = time.perf_counter()
+                frame, _ = detector.capture_frames(need_main=False)
+                elapsed = time.perf_counter() - start
+                if frame is None:
+                    break
+                # The inference frame is a reused buffer - batches keep copies
+                frames.append(frame.copy() if batch_size > 1 else frame)
+                capture_times.append(elapsed * 1000)
+            if not frames:
+                break
+
+            # Run inference on the whole batch
+            start = time.perf_counter()
+            detections, speeds = detector.detect_objects_batch(frames, detector.inference_scale)
+            batch_time = time.perf_counter() - start
+
+            batch_index += 1
+            if batch_index <= warmup_batches:
+                continue
+
+            measured_frames += len(frames)
+            measured_time += batch_time + sum(capture_times) / 1000
+            stages["capture"].extend(capture_times)
+            stages["batch"].append(batch_time * 1000)
+            for speed in speeds:
+                for stage in ("preprocess", "inference", "postprocess"):
+                    stages[stage].append(speed.get(stage, 0.0))
+
+            for frame_detections in detections:
+                detections_per_frame.append(len(frame_detections))
+                for det in frame_detections:
+                    class_counts[det['class_name']] = class_counts.get(det['class_name'], 0) + 1
+
+    except KeyboardInterrupt:
+        print("\n⏹ Benchmark interrupted")
+    finally:
+        detector.cleanup()
+
+    inference_time = sum(stages["batch"]) / 1000
+    return {
+        "source": str(source),
+        "model": model_path or "default",
+        "batch_size": batch_size,
+        "roi": roi,
+        "frames": measured_frames,
+        "warmup_batches": warmup_batches,
+        "fps": round(measured_frames / measured_time, 2) if measured_time else 0.0,
+        "inference_fps": round(measured_frames / inference_time, 2) if inference_time else 0.0,
+        "stages_ms": {name: summarize(values) for name, values in stages.items()},
+        "detections_per_frame": round(statistics.fmean(detections_per_frame), 3) if detections_per_frame else 0.0,
+        "class_counts": class_counts,
+        "platform": {
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "python": platform.python_version(),
+        },
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Headless YOLO detector benchmark")
+    parser.add_argument("source", help="Video file or folder of images")
+    parser.add_argument("--model", default=None, help="Path to the YOLO model")
+    parser.add_argument("--batch-size", type=int, default=1, help="Frames per inference call")
+    parser.add_argument("--frames", type=int, default=None, help="Maximum frames to measure")
+    parser.add_argument("--warmup", type=int, default=1, help="Warm-up batches excluded from timings")
+    parser.add_argument("--roi", default=None,
+                        help='Deposit area: "x1,y1,x2,y2" or polygon "x,y;x,y;x,y" (default: full frame)')
+    parser.add_argument("--report", default="yolo_benchmark.json", help="JSON report path")
+    args = parser.parse_args()
+
+    if not YOLO_AVAILABLE:
+        print("❌ Please install ultralytics: pip install ultralytics")
+        sys.exit(1)
+
+    report = run_benchmark(args.source, args.model, max(1, args.batch_size),
+                           args.frames, max(0, args.warmup), args.roi)
+    if report is None:
+        sys.exit(1)
+
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+
+    stages = report["stages_ms"]
+    print(f"Path: {'ROI ' + args.roi if args.roi else 'full frame'}")
+    print(f"Frames: {report['frames']} | FPS: {report['fps']} | "
+          f"Inference FPS: {report['inference_fps']} | "
+          f"Detections/frame: {report['detections_per_frame']}")
+    print(f"Capture {stages['capture']['mean']} ms | Preprocess {stages['preprocess']['mean']} ms | "
+          f"Inference {stages['inference']['mean']} ms | Postprocess {stages['postprocess']['mean']} ms")
+    print(f"✓ Report written to: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,20 +4,20 @@ Simple YOLO11n Detection for Raspberry Pi
 Optimized for performance and ease of use
 """
 
+import argparse
 import cv2
 import numpy as np
 import time
 import os
+import signal
 import sys
 from pathlib import Path
 
-# Try to import picamera2 for Pi Camera Module v2
-try:
-    from picamera2 import Picamera2
-    PICAMERA2_AVAILABLE = True
+from frame_sources import PICAMERA2_AVAILABLE, open_frame_source
+
+if PICAMERA2_AVAILABLE:
     print("✓ PiCamera2 available - using optimized camera interface")
-except ImportError:
-    PICAMERA2_AVAILABLE = False
+else:
     print("⚠ PiCamera2 not available - using OpenCV camera")
 
 # Try to import YOLO
@@ -29,12 +29,64 @@ except ImportError:
     YOLO_AVAILABLE = False
     print("❌ YOLO not available - please install: pip install ultralytics")
 
+from yolo_tracker import SortTracker
+from yolo_roi import RegionOfInterest, parse_roi
+from arcade_events import DEPOSIT_SOCKET, EventPublisher
+
+BOTTLE_CLASS_ID = 39  # COCO class for bottle
+
+class DepositDebouncer:
+    """Turn per-frame bottle detections into single "bottle deposited" events
+    
+    Fed once per inference frame. Boxes the tracker only predicted don't
+    count, so a bottle has to be detected by the model on min_frames
+    consecutive inference frames - one carried past the camera is not.
+    """
+    
+    def __init__(self, class_id=BOTTLE_CLASS_ID, min_frames=3, cooldown=3.0):
+        self.class_id = class_id
+        self.min_frames = min_frames  # Consecutive inference frames a bottle must be detected
+        self.cooldown = cooldown      # Minimum seconds between deposit events
+        self.seen_frames = {}
+        self.reported = set()
+        self.last_event_time = 0
+    
+    def update(self, detections, now=None):
+        """Feed one inference frame of detections; returns the detection that completed a deposit, or None"""
+        now = time.time() if now is None else now
+        current = {}
+        event = None
+        
+        for det in detections:
+            if det['class_id'] != self.class_id or det.get('predicted'):
+                continue
+            
+            # Tracked bottles debounce per track; untracked ones share one key
+            key = det.get('track_id', 0)
+            current[key] = self.seen_frames.get(key, 0) + 1
+            
+            if (event is None and current[key] >= self.min_frames
+                    and key not in self.reported
+                    and now - self.last_event_time >= self.cooldown):
+                self.reported.add(key)
+                self.last_event_time = now
+                event = det
+        
+        # A bottle that leaves the view can be reported again when it returns
+        self.seen_frames = current
+        self.reported &= set(current)
+        return event
+
 class SimpleYOLODetector:
-    def __init__(self):
+    def __init__(self, source=None, model_path=None):
         self.camera = None
         self.model = None
         self.running = False
         
+        # Frame source spec: None for the camera, or a video file / image folder
+        self.source_spec = source
+        self.model_path = model_path
+        
         # Detection settings
         self.confidence_threshold = 0.5
         self.class_names = {
@@ -50,6 +102,24 @@ class SimpleYOLODetector:
         self.frame_count = 0
         self.resolution = (640, 480)
         
+        # The model sees a small stream; boxes are scaled back to resolution.
+        # Width should stay a multiple of 64 for the Pi Camera lores stream.
+        self.inference_size = (320, 240)
+        self.imgsz = 320  # Model input size - avoids upscaling back to 640
+        
+        # Deposit area (rect or polygon, full-resolution coordinates) and the
+        # COCO classes to detect - both applied at predict time
+        self.roi = None
+        self.classes = None
+        
+        # Tracking between inference frames - boxes are predicted on skipped
+        # frames, so frame_skip can be raised without losing the overlay
+        self.use_tracker = True
+        self.tracker = SortTracker(iou_threshold=0.3, max_age=self.frame_skip * 5, min_hits=2)
+        
+        self.headless = False
+        self.deposit_count = 0
+        
         self.initialize()
     
     def initialize(self):
@@ -70,12 +140,18 @@ class SimpleYOLODetector:
             ]
             
             model_found = False
-            for path in model_paths:
-                if os.path.exists(path):
-                    print(f"✓ Loading YOLO model from: {path}")
-                    self.model = YOLO(path)
-                    model_found = True
-                    break
+            if self.model_path:
+                # Explicit model (e.g. an exported NCNN/ONNX model for comparison)
+                print(f"✓ Loading YOLO model from: {self.model_path}")
+                self.model = YOLO(self.model_path)
+                model_found = True
+            else:
+                for path in model_paths:
+                    if os.path.exists(path):
+                        print(f"✓ Loading YOLO model from: {path}")
+                        self.model = YOLO(path)
+                        model_found = True
+                        break
             
             if not model_found:
                 print("⚠ Model not found locally, downloading YOLOv8n...")
@@ -94,105 +170,62 @@ class SimpleYOLODetector:
         return True
     
     def initialize_camera(self):
-        """Initialize camera (PiCamera2 or OpenCV)"""
-        if PICAMERA2_AVAILABLE:
-            return self.initialize_picamera2()
-        else:
-            return self.initialize_opencv_camera()
-    
-    def initialize_picamera2(self):
-        """Initialize PiCamera2 for Camera Module v2"""
-        try:
-            self.camera = Picamera2()
-            
-            # Configure for optimal performance
-            config = self.camera.create_preview_configuration(
-                main={"size": self.resolution, "format": "RGB888"},
-                controls={"FrameDurationLimits": (33333, 33333)}  # 30 FPS
-            )
-            self.camera.configure(config)
-            self.camera.start()
-            
-            print("✓ PiCamera2 initialized")
-            return True
-            
-        except Exception as e:
-            print(f"❌ PiCamera2 error: {e}")
-            print("Falling back to OpenCV...")
-            return self.initialize_opencv_camera()
-    
-    def initialize_opencv_camera(self):
-        """Initialize OpenCV camera"""
-        try:
-            self.camera = cv2.VideoCapture(0)
-            
-            # Set camera properties
-            self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.resolution[0])
-            self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.resolution[1])
-            self.camera.set(cv2.CAP_PROP_FPS, 30)
-            
-            if not self.camera.isOpened():
-                raise Exception("Failed to open camera")
-            
-            print("✓ OpenCV camera initialized")
-            return True
-            
-        except Exception as e:
-            print(f"❌ OpenCV camera error: {e}")
-            return False
+        """Open the frame source (PiCamera2, OpenCV camera, video or image folder)"""
+        self.camera = open_frame_source(self.source_spec, self.resolution,
+                                        inference_size=self.inference_size)
+        return self.camera is not None
     
     def capture_frame(self):
-        """Capture a frame from camera"""
-        if PICAMERA2_AVAILABLE and self.camera:
-            try:
-                frame = self.camera.capture_array()
-                return frame
-            except Exception as e:
-                print(f"PiCamera2 capture error: {e}")
-                return None
-        elif self.camera:
-            try:
-                ret, frame = self.camera.read()
-                if ret:
-                    return frame
-                else:
-                    return None
-            except Exception as e:
-                print(f"OpenCV capture error: {e}")
-                return None
+        """Capture a frame from the frame source"""
+        if self.camera:
+            return self.camera.read()
         return None
     
-    def detect_objects(self, frame):
-        """Run YOLO detection on frame"""
+    def capture_frames(self, need_main=True):
+        """Capture (inference_frame, main_frame); main_frame is None unless needed
+        
+        With an ROI the deposit area is cropped from the full-resolution
+        frame (the lores stream would leave it a few dozen pixels across),
+        so both are the main frame.
+        """
+        if not self.camera:
+            return None, None
+        if self.roi:
+            frame = self.camera.read()
+            return frame, frame
+        return self.camera.read_pair(need_main)
+    
+    @property
+    def inference_scale(self):
+        """Maps inference-frame boxes back to the full frame (see capture_frames)"""
+        return (1.0, 1.0) if self.roi else self.camera.scale
+    
+    def detect_objects(self, frame, scale=(1.0, 1.0)):
+        """Run YOLO detection on frame
+        
+        scale maps boxes from the (downscaled) inference frame back to
+        full-resolution coordinates.
+        """
         if not self.model or frame is None:
             return []
         
         try:
+            # Only the letterboxed deposit area goes through the model
+            if self.roi:
+                frame = self.roi.prepare(frame, scale)
+            
             # Run YOLO inference
             results = self.model.predict(
                 source=frame,
                 conf=self.confidence_threshold,
+                imgsz=self.roi.input_size if self.roi else self.imgsz,
+                classes=self.classes,
                 verbose=False
             )
             
             detections = []
             for result in results:
-                if result.boxes is not None:
-                    for box in result.boxes:
-                        # Get detection info
-                        x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                        confidence = box.conf[0].cpu().numpy()
-                        class_id = int(box.cls[0].cpu().numpy())
-                        
-                        # Get class name
-                        class_name = self.class_names.get(class_id, f"class_{class_id}")
-                        
-                        detections.append({
-                            'bbox': [int(x1), int(y1), int(x2), int(y2)],
-                            'confidence': float(confidence),
-                            'class_id': class_id,
-                            'class_name': class_name
-                        })
+                detections.extend(self.parse_result(result, scale, self.roi))
             
             return detections
             
@@ -200,18 +233,82 @@ class SimpleYOLODetector:
             print(f"Detection error: {e}")
             return []
     
+    def detect_objects_batch(self, frames, scale=(1.0, 1.0)):
+        """Run YOLO detection on a list of frames in one inference call
+        
+        Frames go through the same ROI crop and letterbox as detect_objects().
+        Returns a list of detection lists (one per frame) and the ultralytics
+        per-stage timings (preprocess/inference/postprocess, ms per image)
+        """
+        if not self.model or not frames:
+            return [[] for _ in frames], []
+        
+        frames = list(frames)
+        transforms = [None] * len(frames)
+        if self.roi:
+            # prepare() reuses one buffer, so each batched frame is copied
+            for i, frame in enumerate(frames):
+                frames[i] = self.roi.prepare(frame, scale).copy()
+                transforms[i] = self.roi.transform
+        
+        results = self.model.predict(
+            source=frames,
+            conf=self.confidence_threshold,
+            imgsz=self.roi.input_size if self.roi else self.imgsz,
+            classes=self.classes,
+            verbose=False
+        )
+        
+        detections = [self.parse_result(result, scale, self.roi, transform)
+                      for result, transform in zip(results, transforms)]
+        speeds = [dict(result.speed) for result in results]
+        return detections, speeds
+    
+    def parse_result(self, result, scale=(1.0, 1.0), roi=None, transform=None):
+        """Convert one ultralytics result into detection dicts"""
+        detections = []
+        if result.boxes is None:
+            return detections
+        
+        scale_x, scale_y = scale
+        for box in result.boxes:
+            # Get detection info, in full-resolution coordinates
+            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
+            if roi:
+                x1, y1, x2, y2 = roi.to_frame((x1, y1, x2, y2), transform)
+            else:
+                x1, x2 = x1 * scale_x, x2 * scale_x
+                y1, y2 = y1 * scale_y, y2 * scale_y
+            confidence = box.conf[0].cpu().numpy()
+            class_id = int(box.cls[0].cpu().numpy())
+            
+            # Get class name
+            class_name = self.class_names.get(class_id, f"class_{class_id}")
+            
+            detections.append({
+                'bbox': [int(x1), int(y1), int(x2), int(y2)],
+                'confidence': float(confidence),
+                'class_id': class_id,
+                'class_name': class_name
+            })
+        
+        return detections
+    
     def draw_detections(self, frame, detections):
         """Draw detection boxes on frame"""
         for det in detections:
             x1, y1, x2, y2 = det['bbox']
             confidence = det['confidence']
             class_name = det['class_name']
+            track_id = det.get('track_id')
             
             # Draw bounding box
             cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
             
             # Draw label
             label = f"{class_name}: {confidence:.2f}"
+            if track_id is not None:
+                label = f"#{track_id} {label}"
             label_size = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)[0]
             
             # Background for text
@@ -224,45 +321,81 @@ class SimpleYOLODetector:
         
         return frame
     
-    def run_detection(self):
-        """Main detection loop"""
+    def run_detection(self, headless=False, publisher=None):
+        """Main detection loop
+        
+        In headless mode nothing is drawn or shown; with a publisher, debounced
+        bottle deposits are broadcast as "deposit" events.
+        """
         if not self.camera:
             print("❌ No camera available")
             return
         
+        self.headless = headless
+        debouncer = DepositDebouncer() if publisher else None
+        
         print("🎯 Starting YOLO detection...")
-        print("Press 'q' to quit, 's' to save frame")
+        if not headless:
+            print("Press 'q' to quit, 's' to save frame")
         
         self.running = True
         fps_counter = 0
+        fps_interval = 300 if headless else 30
         fps_start_time = time.time()
         
         try:
             while self.running:
-                # Capture frame
-                frame = self.capture_frame()
-                if frame is None:
+                # Capture frame - the full-resolution frame is only needed for display
+                inference_frame, frame = self.capture_frames(need_main=not headless)
+                if inference_frame is None:
+                    if not self.camera.live:
+                        break  # Video file or image folder is exhausted
                     continue
                 
                 # Skip frames for performance
                 self.frame_count += 1
-                if self.frame_count % self.frame_skip != 0:
+                run_inference = self.frame_count % self.frame_skip == 0
+                if not run_inference and not self.use_tracker:
                     continue
                 
-                # Run detection
-                detections = self.detect_objects(frame)
+                # Run detection, or propagate tracked boxes on skipped frames
+                if run_inference:
+                    detections = self.detect_objects(inference_frame, self.inference_scale)
+                    if self.use_tracker:
+                        detections = self.tracker.update(detections)
+                else:
+                    detections = self.tracker.predict()
                 
-                # Draw detections
-                frame = self.draw_detections(frame, detections)
+                # Publish debounced bottle deposits (model detections only)
+                if debouncer and run_inference:
+                    deposit = debouncer.update(detections)
+                    if deposit:
+                        self.deposit_count += 1
+                        publisher.publish(
+                            "deposit",
+                            class_id=deposit['class_id'],
+                            track_id=deposit.get('track_id'),
+                            confidence=deposit['confidence'],
+                            count=self.deposit_count
+                        )
+                        print(f"♻ Bottle deposited (total: {self.deposit_count})")
                 
                 # Calculate FPS
                 fps_counter += 1
-                if fps_counter % 30 == 0:
+                if fps_counter % fps_interval == 0:
                     current_time = time.time()
-                    fps = 30 / (current_time - fps_start_time)
+                    fps = fps_interval / (current_time - fps_start_time)
                     fps_start_time = current_time
                     print(f"FPS: {fps:.1f} | Detections: {len(detections)}")
                 
+                if headless:
+                    continue
+                
+                # Draw detections
+                if self.roi:
+                    self.roi.draw(frame)
+                frame = self.draw_detections(frame, detections)
+                
                 # Show frame
                 cv2.imshow("YOLO Detection", frame)
                 
@@ -289,23 +422,37 @@ class SimpleYOLODetector:
         self.running = False
         
         if self.camera:
-            if PICAMERA2_AVAILABLE:
-                try:
-                    self.camera.stop()
-                    self.camera.close()
-                except:
-                    pass
-            else:
-                try:
-                    self.camera.release()
-                except:
-                    pass
+            self.camera.close()
+            self.camera = None
         
-        cv2.destroyAllWindows()
+        if not self.headless:
+            cv2.destroyAllWindows()
         print("✓ Cleanup completed")
+    
+    def status(self, request=None):
+        """Status reply for subscribers of the deposit service"""
+        return {
+            'running': self.running,
+            'frames': self.frame_count,
+            'deposits': self.deposit_count
+        }
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="YOLO detection for Raspberry Pi")
+    parser.add_argument("--source", default=None,
+                        help="Camera index, video file or image folder (default: Pi/USB camera)")
+    parser.add_argument("--model", default=None, help="Path to the YOLO model")
+    parser.add_argument("--roi", default=None,
+                        help='Deposit area: "x1,y1,x2,y2" or polygon "x,y;x,y;x,y"')
+    parser.add_argument("--classes", default=None,
+                        help="Comma-separated COCO class IDs to detect (headless default: 39)")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run as a service without any window and publish deposit events")
+    parser.add_argument("--socket", default=DEPOSIT_SOCKET,
+                        help="Unix socket for deposit events (headless mode)")
+    args = parser.parse_args()
+    
     print("=" * 50)
     print("🎯 Simple YOLO11n Detection for Raspberry Pi")
     print("=" * 50)
@@ -316,8 +463,29 @@ def main():
         return
     
     # Create and run detector
-    detector = SimpleYOLODetector()
-    detector.run_detection()
+    detector = SimpleYOLODetector(source=args.source, model_path=args.model)
+    if args.roi:
+        detector.roi = RegionOfInterest(parse_roi(args.roi), imgsz=detector.imgsz)
+    if args.classes:
+        detector.classes = [int(c) for c in args.classes.split(",")]
+    elif args.headless:
+        detector.classes = [BOTTLE_CLASS_ID]  # The service only reports bottles
+    
+    if not args.headless:
+        detector.run_detection()
+        return
+    
+    # Headless service: stop cleanly on SIGTERM from systemd/the launchers
+    def stop_service(sig, frame):
+        detector.running = False
+    signal.signal(signal.SIGTERM, stop_service)
+    
+    publisher = EventPublisher(args.socket, on_request=detector.status)
+    publisher.start()
+    try:
+        detector.run_detection(headless=True, publisher=publisher)
+    finally:
+        publisher.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Region-of-interest preprocessing for the YOLO detector
+Crops the deposit area out of the full-resolution frame and letterboxes
+it into a reused buffer sized to the crop (stride-32 sides, at most imgsz),
+so inference only pays for the pixels that matter
+"""
+
+import cv2
+import numpy as np
+
+PAD_VALUE = 114  # Same grey ultralytics pads with
+STRIDE = 32  # Model input sides must be multiples of the largest stride
+
+
+def parse_roi(text):
+    """
+    Parse an ROI from the command line
+    "x1,y1,x2,y2" is a rectangle, "x,y;x,y;x,y;..." is a polygon
+    """
+    if ";" in text:
+        return [tuple(int(v) for v in point.split(",")) for point in text.split(";") if point]
+    values = [int(v) for v in text.split(",")]
+    if len(values) != 4:
+        raise ValueError(f"Invalid ROI: {text}")
+    return values
+
+
+class RegionOfInterest:
+    """Deposit area as a rectangle or polygon in full-resolution coordinates"""
+
+    def __init__(self, roi, imgsz=320):
+        if len(roi) == 4 and all(isinstance(v, (int, float)) for v in roi):
+            x1, y1, x2, y2 = roi
+            self.polygon = None
+            self.outline_points = np.array([(x1, y1), (x2, y1), (x2, y2), (x1, y2)], dtype=np.int32)
+        else:
+            self.polygon = np.array(roi, dtype=np.float32)
+            self.outline_points = self.polygon.astype(np.int32)
+            x1, y1 = self.polygon.min(axis=0)
+            x2, y2 = self.polygon.max(axis=0)
+
+        self.rect = (int(x1), int(y1), int(x2), int(y2))
+        self.imgsz = imgsz
+
+        # Buffers reused across frames - only rebuilt when the geometry changes
+        self.letterbox = None
+        self.input_size = (imgsz, imgsz)  # (height, width) of the model input
+        self.resized = None
+        self.outside_mask = None
+        self.geometry = None
+        self.transform = (0, 0, 1.0, 0, 0, 1.0, 1.0)
+
+    def prepare(self, frame, scale=(1.0, 1.0)):
+        """
+        Crop and letterbox the ROI from a frame
+        The crop is scaled down to fit imgsz but never up, and padded to
+        the nearest stride-32 rectangle rather than a fixed square.
+        Args:
+            frame: Full-resolution frame (or a downscaled one, with scale)
+            scale: Factor from frame coordinates to full-resolution coordinates
+        Returns:
+            numpy.ndarray: input_size model input (a reused buffer)
+        """
+        scale_x, scale_y = scale
+        frame_h, frame_w = frame.shape[:2]
+
+        # ROI in inference-frame coordinates, clamped to the frame
+        x1 = min(max(int(self.rect[0] / scale_x), 0), frame_w - 1)
+        y1 = min(max(int(self.rect[1] / scale_y), 0), frame_h - 1)
+        x2 = min(max(int(np.ceil(self.rect[2] / scale_x)), x1 + 1), frame_w)
+        y2 = min(max(int(np.ceil(self.rect[3] / scale_y)), y1 + 1), frame_h)
+        crop = frame[y1:y2, x1:x2]
+
+        crop_h, crop_w = crop.shape[:2]
+        ratio = min(self.imgsz / crop_w, self.imgsz / crop_h, 1.0)
+        new_w = max(1, int(round(crop_w * ratio)))
+        new_h = max(1, int(round(crop_h * ratio)))
+        input_w = -(-new_w // STRIDE) * STRIDE
+        input_h = -(-new_h // STRIDE) * STRIDE
+        pad_x = (input_w - new_w) // 2
+        pad_y = (input_h - new_h) // 2
+
+        geometry = (x1, y1, x2, y2, scale_x, scale_y)
+        if geometry != self.geometry:
+            self._rebuild(geometry, new_w, new_h, ratio, (input_h, input_w))
+        self.transform = (x1, y1, ratio, pad_x, pad_y, scale_x, scale_y)
+
+        cv2.resize(crop, (new_w, new_h), dst=self.resized, interpolation=cv2.INTER_AREA)
+        if self.outside_mask is not None:
+            self.resized[self.outside_mask] = PAD_VALUE
+        self.letterbox[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = self.resized
+        return self.letterbox
+
+    def _rebuild(self, geometry, new_w, new_h, ratio, input_size):
+        x1, y1, _, _, scale_x, scale_y = geometry
+        self.geometry = geometry
+        self.input_size = input_size
+        self.letterbox = np.full(input_size + (3,), PAD_VALUE, dtype=np.uint8)
+        self.resized = np.empty((new_h, new_w, 3), dtype=np.uint8)
+
+        self.outside_mask = None
+        if self.polygon is not None:
+            # Polygon in resized-crop coordinates; everything outside is padded
+            points = self.polygon.copy()
+            points[:, 0] = (points[:, 0] / scale_x - x1) * ratio
+            points[:, 1] = (points[:, 1] / scale_y - y1) * ratio
+            mask = np.zeros((new_h, new_w), dtype=np.uint8)
+            cv2.fillPoly(mask, [np.round(points).astype(np.int32)], 1)
+            self.outside_mask = mask == 0
+
+    def to_frame(self, bbox, transform=None):
+        """
+        Map a box from the letterboxed ROI back to full-resolution coordinates
+        transform defaults to the last prepare(); batches pass each frame's own.
+        """
+        x1, y1, ratio, pad_x, pad_y, scale_x, scale_y = transform or self.transform
+        bx1, by1, bx2, by2 = bbox
+        return [
+            ((bx1 - pad_x) / ratio + x1) * scale_x,
+            ((by1 - pad_y) / ratio + y1) * scale_y,
+            ((bx2 - pad_x) / ratio + x1) * scale_x,
+            ((by2 - pad_y) / ratio + y1) * scale_y,
+        ]
+
+    def draw(self, frame, color=(255, 0, 0)):
+        """Outline the ROI on a full-resolution frame"""
+        cv2.polylines(frame, [self.outline_points], True, color, 1)
+        return frame
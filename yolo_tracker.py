@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Lightweight multi-object tracker for the YOLO detector
+SORT-style IoU association with a constant-velocity Kalman filter per box,
+so boxes can be propagated on frames where inference is skipped
+"""
+
+import numpy as np
+
+
+def iou_matrix(boxes_a, boxes_b):
+    """Pairwise IoU between two lists of [x1, y1, x2, y2] boxes"""
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return np.zeros((len(boxes_a), len(boxes_b)), dtype=np.float32)
+
+    a = np.asarray(boxes_a, dtype=np.float32)[:, None, :]
+    b = np.asarray(boxes_b, dtype=np.float32)[None, :, :]
+
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = inter_w * inter_h
+
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    union = area_a + area_b - inter
+
+    return np.where(union > 0, inter / np.maximum(union, 1e-6), 0.0)
+
+
+def bbox_to_z(bbox):
+    """Convert [x1, y1, x2, y2] to the measurement vector [cx, cy, area, aspect]"""
+    x1, y1, x2, y2 = bbox
+    w = max(x2 - x1, 1.0)
+    h = max(y2 - y1, 1.0)
+    return np.array([x1 + w / 2.0, y1 + h / 2.0, w * h, w / h], dtype=np.float64)
+
+
+def x_to_bbox(x):
+    """Convert a Kalman state back to [x1, y1, x2, y2]"""
+    area = max(x[2], 1.0)
+    aspect = max(x[3], 1e-3)
+    w = np.sqrt(area * aspect)
+    h = area / w
+    return [x[0] - w / 2.0, x[1] - h / 2.0, x[0] + w / 2.0, x[1] + h / 2.0]
+
+
+class KalmanBoxTrack:
+    """A single tracked box with a constant-velocity Kalman filter"""
+
+    # State: [cx, cy, area, aspect, vx, vy, varea] - aspect is assumed constant
+    F = np.eye(7)
+    F[0, 4] = F[1, 5] = F[2, 6] = 1.0
+    H = np.eye(4, 7)
+
+    def __init__(self, detection, track_id):
+        self.track_id = track_id
+        self.class_id = detection['class_id']
+        self.class_name = detection['class_name']
+        self.confidence = detection['confidence']
+
+        self.x = np.zeros(7)
+        self.x[:4] = bbox_to_z(detection['bbox'])
+
+        # High uncertainty for the unobserved velocities
+        self.P = np.diag([10.0, 10.0, 10.0, 10.0, 1000.0, 1000.0, 1000.0])
+        self.Q = np.diag([1.0, 1.0, 1.0, 0.01, 0.01, 0.01, 0.0001])
+        self.R = np.diag([1.0, 1.0, 10.0, 0.01])
+
+        self.hits = 1
+        self.age = 0
+        self.time_since_update = 0
+
+    def predict(self):
+        """Advance the state by one frame"""
+        # Keep the area from going negative on shrinking boxes
+        if self.x[2] + self.x[6] <= 0:
+            self.x[6] = 0.0
+
+        self.x = self.F @ self.x
+        self.P = self.F @ self.P @ self.F.T + self.Q
+        self.age += 1
+        self.time_since_update += 1
+        return self.bbox
+
+    def update(self, detection):
+        """Correct the state with a matched detection"""
+        z = bbox_to_z(detection['bbox'])
+        y = z - self.H @ self.x
+        S = self.H @ self.P @ self.H.T + self.R
+        K = self.P @ self.H.T @ np.linalg.inv(S)
+        self.x = self.x + K @ y
+        self.P = (np.eye(7) - K @ self.H) @ self.P
+
+        self.confidence = detection['confidence']
+        self.hits += 1
+        self.time_since_update = 0
+
+    @property
+    def bbox(self):
+        return x_to_bbox(self.x)
+
+    def as_detection(self):
+        """Return the track in the same dict format as detect_objects()"""
+        x1, y1, x2, y2 = self.bbox
+        return {
+            'bbox': [int(x1), int(y1), int(x2), int(y2)],
+            'confidence': float(self.confidence),
+            'class_id': self.class_id,
+            'class_name': self.class_name,
+            'track_id': self.track_id,
+            'predicted': self.time_since_update > 0
+        }
+
+
+class SortTracker:
+    """
+    IoU/Kalman tracker that keeps stable IDs across frames
+
+    Call update() with fresh detections on inference frames and predict()
+    on every other frame to propagate the existing boxes.
+    """
+
+    def __init__(self, iou_threshold=0.3, max_age=30, min_hits=2):
+        self.iou_threshold = iou_threshold
+        self.max_age = max_age      # Frames a track survives without a detection
+        self.min_hits = min_hits    # Detections needed before a track is reported
+        self.tracks = []
+        self.next_id = 1
+
+    def reset(self):
+        """Drop all tracks"""
+        self.tracks = []
+
+    def predict(self):
+        """Propagate all tracks by one frame without new detections"""
+        for track in self.tracks:
+            track.predict()
+        self._prune()
+        return self.active_tracks()
+
+    def update(self, detections):
+        """Predict, associate detections to tracks and return the active tracks"""
+        for track in self.tracks:
+            track.predict()
+
+        unmatched_dets = self._associate(detections)
+
+        for det_index in unmatched_dets:
+            self.tracks.append(KalmanBoxTrack(detections[det_index], self.next_id))
+            self.next_id += 1
+
+        self._prune()
+        return self.active_tracks()
+
+    def active_tracks(self):
+        """Tracks confirmed by enough detections, as detection dicts"""
+        return [
+            track.as_detection() for track in self.tracks
+            if track.hits >= self.min_hits
+        ]
+
+    def _associate(self, detections):
+        """Greedy IoU matching per class; returns indices of unmatched detections"""
+        if not detections:
+            return []
+        if not self.tracks:
+            return list(range(len(detections)))
+
+        ious = iou_matrix([t.bbox for t in self.tracks], [d['bbox'] for d in detections])
+
+        # Never match across classes
+        track_classes = np.array([t.class_id for t in self.tracks])[:, None]
+        det_classes = np.array([d['class_id'] for d in detections])[None, :]
+        ious[track_classes != det_classes] = 0.0
+
+        matched_tracks = set()
+        matched_dets = set()
+
+        # Greedy assignment from the best overlap down - good enough for a
+        # handful of objects and avoids a scipy dependency on the Pi
+        order = np.argsort(-ious, axis=None)
+        for flat_index in order:
+            t, d = np.unravel_index(flat_index, ious.shape)
+            if ious[t, d] < self.iou_threshold:
+                break
+            if t in matched_tracks or d in matched_dets:
+                continue
+            self.tracks[t].update(detections[d])
+            matched_tracks.add(t)
+            matched_dets.add(d)
+
+        return [d for d in range(len(detections)) if d not in matched_dets]
+
+    def _prune(self):
+        self.tracks = [t for t in self.tracks if t.time_since_update <= self.max_age]